@@ -10,11 +10,14 @@ Survival Realm - 主遊戲程式
 雖然本大爺很不想承認，但這次重構確實讓程式碼更乾淨了... (ˋ・ω・ˊ)
 """
 
+import argparse
+import os
+import random
 import pygame
 import sys
 import time
 import math
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 
 # 導入遊戲模組
 from src.core.config import (
@@ -24,25 +27,44 @@ from src.core.config import (
     UI_CONFIG,
     CAVE_CONFIG,
     PLAYER_CONFIG,
+    SIMULATION_CONFIG,
+    SAVE_CONFIG,
 )
+from src.systems.crafting import recipe_registry
+from src.systems.game_clock import game_clock
 from src.systems.inventory import item_database
+from src.systems.save_manager import SaveError, SaveManager
+from src.ui.text_cache import text_cache
 
 
 class Game:
     """主遊戲類 - 遊戲核心邏輯管理"""
 
-    def __init__(self):
-        """初始化遊戲"""
+    def __init__(self, headless: bool = False):
+        """
+        初始化遊戲
+
+        Args:
+            headless (bool): 無頭模式 - 不開啟視窗也不繪製畫面，以 step() 推進遊戲
+        """
         print("正在初始化 Survival Realm...")
 
+        # 無頭模式使用 SDL 的虛擬驅動，沒有螢幕與音效卡的機器也能執行
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = SIMULATION_CONFIG["video_driver"]
+            os.environ["SDL_AUDIODRIVER"] = SIMULATION_CONFIG["audio_driver"]
+
         # 初始化 pygame
         pygame.init()
         pygame.mixer.init()
 
         # 遊戲基本設定
         self.running = True
+        self._closed = False  # close() 只執行一次
         self._state = GameState.PLAYING  # 使用私有變量
         self.clock = pygame.time.Clock()
+        game_clock.reset()
 
         # 載入草地材質
         try:
@@ -57,10 +79,12 @@ class Game:
             self.grass_texture = pygame.Surface((16, 16))
             self.grass_texture.fill((34, 139, 34))  # 森林綠
             self.grass_size = 16
+        self.grass_layer: Optional[pygame.Surface] = None  # 預先鋪好的草地背景
+        self.grass_layer_screen_size = (0, 0)
 
         # 創建遊戲視窗
         # 初始化全螢幕模式
-        if WINDOW_CONFIG.get("fullscreen", False):
+        if WINDOW_CONFIG.get("fullscreen", False) and not headless:
             self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
             # 更新實際的螢幕尺寸
             WINDOW_CONFIG["width"] = self.screen.get_width()
@@ -73,16 +97,11 @@ class Game:
         pygame.display.set_caption(WINDOW_CONFIG["title"])
 
         # 初始化遊戲系統
-        from src.world.world_manager import WorldManager
-        from src.systems.time_manager import TimeManager
         from src.systems.music_manager import MusicManager
         from src.systems.sound_manager import sound_manager
         from src.world.cave_system import cave_system
         from src.systems.camera import camera  # 導入相機系統
 
-        self.world_manager = WorldManager()
-        print("世界: 世界管理器初始化完成")
-
         self.music_manager = MusicManager()
         print("音樂: 音樂管理器初始化完成！")
 
@@ -93,6 +112,9 @@ class Game:
         # 洞穴系統
         self.cave_system = cave_system
         self.pending_cave_entry = None  # 待進入的洞穴信息
+        if headless:
+            # 無頭模擬同步生成房間，固定種子時每次模擬結果都相同
+            self.cave_system.prefetch_enabled = False
         print("洞穴探險系統初始化完成！")
 
         # 相機系統
@@ -105,6 +127,46 @@ class Game:
         self.ui = UI()
         print("UI系統初始化完成！")
 
+        # 訊息系統
+        self.messages: List[Tuple[str, float]] = []
+        self.message_duration = 5.0  # 訊息顯示時間（秒）
+
+        # 存檔系統 - 無頭模擬不自動存檔，避免代理環境寫入大量檔案
+        self.save_manager = SaveManager()
+        self.save_manager.autosave_enabled = not headless
+
+        # 建立世界與玩家
+        self.world_manager = None
+        self.reset()
+
+        # 初始化背景音樂
+        self.music_manager.load_music("main_theme")
+        self.music_manager.play_music("main_theme")
+
+        print("遊戲初始化完成！")
+        self._print_controls()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        開始新的一局 - 重新建立世界、玩家與洞穴進度
+
+        Args:
+            seed (Optional[int]): 世界與亂數種子，指定時整局遊戲可重現
+        """
+        from src.world.world_manager import WorldManager
+
+        if seed is not None:
+            random.seed(seed)
+        game_clock.reset()
+        self.pending_cave_entry = None
+        self.messages.clear()
+        self._state = GameState.PLAYING
+
+        # 無頭模擬的世界只存在記憶體，不寫區域檔
+        self._close_world()
+        self.world_manager = WorldManager(seed, use_region_store=not self.headless)
+        self.cave_system.reset(self.world_manager.seed)
+
         # 初始化玩家
         from src.entities.player import Player
 
@@ -114,8 +176,6 @@ class Game:
         self.player = Player(spawn_x, spawn_y)
 
         # 🐱 硬漢貓咪調試：給玩家一些測試材料
-        from src.systems.inventory import item_database
-
         # 給玩家初始資源（調試用）
         wood_item = item_database.get_item("wood")
         stone_item = item_database.get_item("stone")
@@ -131,21 +191,222 @@ class Game:
             print(f"調試: 調試：給玩家添加了 5 個煤炭")
 
         # 初始化時間管理器
+        from src.systems.time_manager import TimeManager
+
         self.time_manager = TimeManager()
 
         # 生成初始世界
-        self.world_manager.generate_world()
+        self.world_manager.generate_world(spawn_x, spawn_y)
+        self.camera.update(*self.player.get_world_center(), 0.0)
 
-        # 初始化背景音樂
-        self.music_manager.load_music("main_theme")
-        self.music_manager.play_music("main_theme")
+        # 在背景預先生成第一個洞穴房間，進入洞穴時不會卡頓
+        self.cave_system.schedule_prefetch()
 
-        # 訊息系統
-        self.messages: List[Tuple[str, float]] = []
-        self.message_duration = 5.0  # 訊息顯示時間（秒）
+    def snapshot(self) -> tuple:
+        """
+        取得整局遊戲的快照，供搜尋型代理反覆分支同一個狀態
 
-        print("遊戲初始化完成！")
-        self._print_controls()
+        只記錄物件參考與可變欄位（不使用 deepcopy，不複製 Rect 與圖像），
+        同一個快照可以還原任意多次，但只能還原到建立它的同一個遊戲實例
+
+        Returns:
+            tuple: 不透明的遊戲快照
+        """
+        return (
+            self._state,
+            self.pending_cave_entry,
+            tuple(self.messages),
+            self.world_manager,
+            self.world_manager.snapshot(),
+            self.player,
+            self.player.snapshot(),
+            self.time_manager,
+            self.time_manager.snapshot(),
+            self.cave_system.snapshot(),
+            (self.camera.world_x, self.camera.world_y),
+            game_clock.elapsed,
+            random.getstate(),
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的遊戲狀態（在 reset 之後也可以還原）
+
+        Args:
+            snapshot (tuple): 遊戲快照
+        """
+        # 還原到另一個世界時先關閉目前的世界，避免留下它的區域檔
+        if snapshot[3] is not self.world_manager:
+            self._close_world()
+        (
+            self._state,
+            self.pending_cave_entry,
+            messages,
+            self.world_manager,
+            world_state,
+            self.player,
+            player_state,
+            self.time_manager,
+            time_state,
+            cave_state,
+            (self.camera.world_x, self.camera.world_y),
+            game_clock.elapsed,
+            random_state,
+        ) = snapshot
+        self.messages = list(messages)
+        self.world_manager.restore(world_state)
+        self.player.restore(player_state)
+        self.time_manager.restore(time_state)
+        self.cave_system.restore(cave_state)
+        random.setstate(random_state)
+
+    def save_data(self, include_regions: bool = True) -> dict:
+        """
+        收集存檔資料（只包含內建型別，可以交給背景執行緒編碼）
+
+        Args:
+            include_regions (bool): 是否讀取區域檔記錄；背景存檔改由 deferred_save_data 讀取
+
+        Returns:
+            dict: 世界種子與區塊變化、玩家、洞穴進度、時間
+        """
+        return {
+            "world": {
+                "seed": self.world_manager.seed,
+                "spawn_timer": self.world_manager.spawn_timer,
+                "chunks": self.world_manager.export_changes(),
+                "regions": (
+                    self.world_manager.export_region_records()
+                    if include_regions
+                    else []
+                ),
+            },
+            "player": self.player.export_state(),
+            "cave": self.cave_system.export_state(),
+            "time": self.time_manager.export_state(),
+            "clock": game_clock.elapsed,
+        }
+
+    def deferred_save_data(self) -> Callable[[], dict]:
+        """
+        收集背景存檔的資料 - 主執行緒只收集記憶體中的狀態，
+        區域檔記錄（大型世界有上萬筆）留給存檔執行緒讀取
+
+        Returns:
+            Callable[[], dict]: 在存檔執行緒呼叫、回傳完整存檔資料的函式
+        """
+        data = self.save_data(include_regions=False)
+        read_regions = self.world_manager.begin_region_export()
+
+        def collect() -> dict:
+            data["world"]["regions"] = read_regions()
+            return data
+
+        return collect
+
+    def save_game(self, slot: Optional[str] = None, background: bool = False) -> bool:
+        """
+        存檔
+
+        Args:
+            slot (str): 存檔欄位，預設為快速存檔
+            background (bool): 是否在背景執行緒編碼與寫檔
+
+        Returns:
+            bool: 是否成功（背景存檔只代表已送出）
+        """
+        slot = slot or SAVE_CONFIG["quicksave_slot"]
+        if background:
+            self.save_manager.save_async(self.deferred_save_data(), slot)
+            return True
+
+        data = self.save_data()
+        try:
+            path = self.save_manager.save(data, slot)
+        except OSError as e:
+            self.add_message(f"存檔失敗: {e}")
+            return False
+        self.add_message(f"💾 已存檔到 {path}")
+        return True
+
+    def load_game(self, slot: Optional[str] = None) -> bool:
+        """
+        讀檔 - 由種子重新生成世界並套用存檔中的變化
+
+        Args:
+            slot (str): 存檔欄位，預設為快速存檔
+
+        Returns:
+            bool: 是否成功
+        """
+        slot = slot or SAVE_CONFIG["quicksave_slot"]
+        start = time.perf_counter()
+        try:
+            data = self.save_manager.load(slot)
+            self._apply_save_data(data)
+        except FileNotFoundError:
+            self.add_message(f"找不到存檔: {slot}")
+            return False
+        except (OSError, SaveError, KeyError, TypeError, ValueError) as e:
+            self.add_message(f"讀檔失敗: {e}")
+            return False
+
+        elapsed = time.perf_counter() - start
+        decode_ms = self.save_manager.last_load_time * 1000
+        print(f"⏱️ 讀檔耗時 {elapsed * 1000:.1f} ms（解碼 {decode_ms:.1f} ms）")
+        if elapsed > SAVE_CONFIG["load_time_target"]:
+            print(
+                f"⚠️ 讀檔時間超過目標 {SAVE_CONFIG['load_time_target'] * 1000:.0f} ms"
+            )
+        self.add_message(
+            f"📂 已讀取存檔: {slot}（第 {self.time_manager.current_day} 天）"
+        )
+        return True
+
+    def _apply_save_data(self, data: dict) -> None:
+        """
+        依存檔資料重新建立世界、玩家與時間
+
+        Args:
+            data (dict): save_data 收集的存檔資料
+        """
+        from src.world.world_manager import WorldManager
+        from src.entities.player import Player
+        from src.systems.time_manager import TimeManager
+
+        world = data["world"]
+        world_manager = WorldManager(world["seed"], use_region_store=not self.headless)
+        try:
+            world_manager.spawn_timer = world["spawn_timer"]
+            world_manager.import_changes(world["chunks"], world.get("regions", ()))
+            player = Player(0, 0)
+            player.import_state(data["player"])
+            time_manager = TimeManager()
+            time_manager.import_state(data["time"])
+            cave, clock = data["cave"], data["clock"]
+        except Exception:
+            world_manager.close()
+            raise
+
+        # 資料都解析成功後才取代目前的遊戲，讀檔失敗時遊戲維持原狀
+        self._close_world()
+        self.world_manager = world_manager
+        self.player = player
+        self.time_manager = time_manager
+        self.cave_system.import_state(cave, world["seed"])
+        game_clock.elapsed = clock
+        self.pending_cave_entry = None
+        self.messages.clear()
+        self._state = GameState.PLAYING
+
+        self.world_manager.generate_world(*self.player.get_world_center())
+        self.camera.update(*self.player.get_world_center(), 0.0)
+        self.cave_system.schedule_prefetch()
+
+    def _close_world(self) -> None:
+        """關閉目前的世界（停止區域檔的背景寫入並刪除暫存區域檔）"""
+        if self.world_manager is not None:
+            self.world_manager.close()
 
     @property
     def state(self):
@@ -182,6 +443,8 @@ class Game:
         print(
             "   1-8 - 裝備物品 (1=斧頭 2=稿子 3=水桶 4=火把 5-6=建築物 7=鐵劍 8=鐵甲)"
         )
+        print("   F5 - 快速存檔")
+        print("   F9 - 快速讀檔")
         print("   ESC - 暫停/繼續遊戲")
         print("   Q - 退出遊戲")
         print("提示: 製作和裝備使用統一的 1-8 按鍵映射！")
@@ -237,6 +500,13 @@ class Game:
         elif key == pygame.K_q:
             self.running = False
 
+        # F5 快速存檔（遊戲結束後不能存檔）/ F9 快速讀檔
+        elif key == pygame.K_F5:
+            if self.state != GameState.GAME_OVER:
+                self.save_game()
+        elif key == pygame.K_F9:
+            self.load_game()
+
         # 遊戲進行中的按鍵 (包括製作和燒製狀態)
         elif self.state in [GameState.PLAYING, GameState.CRAFTING, GameState.SMELTING]:
             self._handle_gameplay_keys(key)
@@ -248,43 +518,41 @@ class Game:
             if self.state == GameState.PLAYING:
                 if self.cave_system.in_cave:
                     # 在洞穴中，與洞穴物件互動
-                    cave_objects = self.cave_system.get_cave_objects()
                     player_center_x = self.player.x + self.player.width // 2
                     player_center_y = self.player.y + self.player.height // 2
+                    nearby_objects = self.cave_system.get_nearby_cave_objects(
+                        player_center_x,
+                        player_center_y,
+                        self.player.interaction_range,
+                    )
 
-                    for obj in cave_objects:
-                        if obj.is_near(
-                            player_center_x,
-                            player_center_y,
-                            self.player.interaction_range,
-                        ):
-                            result = obj.interact(self.player)
-                            if result:
-                                self.add_message(result["message"])
-
-                                # 處理Boss戰結果
-                                if result.get("boss_defeated"):
-                                    depth = result.get("depth", 1)
-                                    self.cave_system.handle_boss_death(depth)
-                                    self.add_message(
-                                        f"獲得了第{depth + 1}層的入場鑰匙！"
-                                    )
-
-                                # 處理物品掉落
-                                if "items" in result:
-                                    # 🎵 播放撿取音效
-                                    self.sound_manager.play_pickup_sound()
-
-                                    for item_id, amount in result["items"]:
-                                        # 特殊處理深度鑰匙
-                                        if item_id == "depth_key":
-                                            # 不添加到背包，直接解鎖權限
-                                            continue
-
-                                        item = item_database.get_item(item_id)
-                                        if item:
-                                            self.player.inventory.add_item(item, amount)
-                            break
+                    # 只與最優先的物件互動（Boss > 怪物 > 寶箱）
+                    if nearby_objects:
+                        obj = nearby_objects[0]
+                        result = obj.interact(self.player)
+                        if result:
+                            self.add_message(result["message"])
+
+                            # 處理Boss戰結果
+                            if result.get("boss_defeated"):
+                                depth = result.get("depth", 1)
+                                self.cave_system.handle_boss_death(depth)
+                                self.add_message(f"獲得了第{depth + 1}層的入場鑰匙！")
+
+                            # 處理物品掉落
+                            if "items" in result:
+                                # 🎵 播放撿取音效
+                                self.sound_manager.play_pickup_sound()
+
+                                for item_id, amount in result["items"]:
+                                    # 特殊處理深度鑰匙
+                                    if item_id == "depth_key":
+                                        # 不添加到背包，直接解鎖權限
+                                        continue
+
+                                    item = item_database.get_item(item_id)
+                                    if item:
+                                        self.player.inventory.add_item(item, amount)
                 else:
                     # 在地表，正常互動
                     result = self.player.interact_with_world(self.world_manager)
@@ -468,21 +736,14 @@ class Game:
         """處理製作操作"""
         print(f"調試: 調試：進入製作處理，數字={number}")
 
-        recipes = [
-            "axe",
-            "pickaxe",
-            "bucket",
-            "torch",
-            "workbench",
-            "furnace",
-            "iron_sword",
-            "iron_armor",
-        ]
+        menu = recipe_registry.menu
+        recipes = [recipe.item_id for recipe in menu]
 
         print(f"📋 調試：可用配方 {len(recipes)} 個: {recipes}")
 
         if 1 <= number <= len(recipes):
-            item_id = recipes[number - 1]
+            recipe = menu[number - 1]
+            item_id = recipe.item_id
             print(f"調試：選中物品 {item_id} (索引 {number-1})")
 
             # 檢查玩家材料狀況
@@ -492,8 +753,8 @@ class Game:
                 print(f"調試：物品欄空槽位: {self.player.inventory.get_empty_slots()}")
                 print(f"調試：物品欄已滿: {self.player.inventory.is_full()}")
 
-            # 工作台和火把可以隨時製作（基礎製作）
-            if item_id in ["workbench", "torch"]:
+            # 基礎配方（工作台、火把）可以隨時製作
+            if not recipe.requires_workbench:
                 print(f"調試：製作基礎物品 {item_id}，呼叫 _craft_item")
                 message = self._craft_item(item_id)
                 print(f"📝 調試：製作結果訊息: {message}")
@@ -514,9 +775,10 @@ class Game:
                 self.add_message(message)
         else:
             print(f"調試：數字 {number} 超出範圍 (1-{len(recipes)})")
-            self.add_message(
-                "請按 1-8：1=斧頭 2=稿子 3=水桶 4=火把 5=工作台 6=熔爐 7=鐵劍 8=鐵甲"
+            choices = " ".join(
+                f"{index}={recipe.name}" for index, recipe in enumerate(menu, start=1)
             )
+            self.add_message(f"請按 1-{len(menu)}：{choices}")
 
     def _handle_smelting(self, number: int) -> None:
         """處理燒製操作"""
@@ -525,8 +787,9 @@ class Game:
             self.add_message("需要靠近熔爐才能燒製！")
             return
 
-        if number == 1:  # 只有鐵錠可以燒製
-            message = self._smelt_item("iron_ingot")
+        menu = recipe_registry.smelting_menu
+        if 1 <= number <= len(menu):
+            message = self._smelt_item(menu[number - 1].item_id)
             if message:
                 self.add_message(message)
 
@@ -567,84 +830,63 @@ class Game:
 
     def _craft_item(self, item_id: str) -> Optional[str]:
         """製作物品邏輯"""
-        from src.core.config import ITEM_RECIPES
-
-        if item_id not in ITEM_RECIPES:
+        recipe = recipe_registry.get_recipe(item_id)
+        if recipe is None:
             return "無法製作此物品"
 
-        recipe = ITEM_RECIPES[item_id]
         item = item_database.get_item(item_id)
 
         if not item:
             return "物品不存在"
 
         # 檢查材料
-        missing_materials = []
-        for material, amount in recipe.items():
-            if not self.player.inventory.has_item(material, amount):
-                owned = self.player.inventory.get_item_count(material)
-                missing_materials.append(f"{material} (需要{amount}，擁有{owned})")
-
-        if missing_materials:
+        inventory = self.player.inventory
+        table = recipe_registry.get_table(inventory)
+        if not table.can_craft(recipe):
+            missing_materials = [
+                f"{material} (需要{amount}，擁有{owned})"
+                for material, amount, owned in table.get_missing(recipe)
+            ]
             return f"缺少材料: {', '.join(missing_materials)}"
 
-        # 檢查物品欄空間
-        if self.player.inventory.is_full():
-            empty_slots = self.player.inventory.get_empty_slots()
-            if empty_slots == 0:
-                return "物品欄已滿，無法製作！請先清理物品欄"
-
-        # 消耗材料
-        consumed_materials = []
-        for material, amount in recipe.items():
-            removed = self.player.inventory.remove_item(material, amount)
-            consumed_materials.append(f"{material} x{removed}")
-
-        # 添加製作出的物品
-        added = self.player.inventory.add_item(item, 1)
-        if added > 0:
-            # 顯示詳細的製作成功信息
-            materials_used = ", ".join(consumed_materials)
-            return f"成功: 製作成功！獲得 [{item.name}] \n消耗材料: {materials_used}"
-        else:
-            # 如果添加失敗，恢復材料
-            for material, amount in recipe.items():
-                mat_item = item_database.get_item(material)
-                if mat_item:
-                    self.player.inventory.add_item(mat_item, amount)
-            return "物品欄已滿，製作失敗！材料已退還"
+        # 消耗材料並加入成品，放不下時物品欄保持原狀
+        if not inventory.transaction(recipe.materials, ((item, 1),)):
+            return "物品欄已滿，無法製作！請先清理物品欄"
 
-        return "製作失敗，未知錯誤"
+        # 顯示詳細的製作成功信息
+        materials_used = ", ".join(
+            f"{material} x{amount}" for material, amount in recipe.materials
+        )
+        return f"成功: 製作成功！獲得 [{item.name}] \n消耗材料: {materials_used}"
 
     def _smelt_item(self, item_id: str) -> Optional[str]:
         """燒製物品邏輯"""
-        if item_id == "iron_ingot":
-            if not self.player.inventory.has_item("iron_ore", 1):
-                return "缺少鐵礦"
-
-            has_fuel = self.player.inventory.has_item(
-                "coal", 1
-            ) or self.player.inventory.has_item("wood", 1)
-            if not has_fuel:
-                return "缺少燃料(煤炭或木材)"
-
-            # 消耗材料和燃料
-            self.player.inventory.remove_item("iron_ore", 1)
-            if self.player.inventory.has_item("coal", 1):
-                self.player.inventory.remove_item("coal", 1)
-            else:
-                self.player.inventory.remove_item("wood", 1)
-
-            # 添加鐵錠
-            item = item_database.get_item("iron_ingot")
-            if item:
-                added = self.player.inventory.add_item(item, 1)
-                if added > 0:
-                    return "成功燒製了鐵錠！已添加到物品欄"
-                else:
-                    return "物品欄已滿，無法燒製"
-
-        return "無法燒製此物品"
+        recipe = recipe_registry.get_smelting_recipe(item_id)
+        item = item_database.get_item(item_id)
+        if recipe is None or item is None:
+            return "無法燒製此物品"
+
+        inventory = self.player.inventory
+        table = recipe_registry.get_table(inventory)
+        material, amount = recipe.materials[0]
+        if table.get_count(material) < amount:
+            return f"缺少{self._item_name(material)}"
+
+        fuel = table.pick_fuel(recipe)
+        if fuel is None:
+            fuel_names = "或".join(self._item_name(fuel) for fuel in recipe.fuels)
+            return f"缺少燃料({fuel_names})"
+
+        # 消耗材料和燃料並加入產物，放不下時物品欄保持原狀
+        if not inventory.transaction(((material, amount), (fuel, 1)), ((item, 1),)):
+            return "物品欄已滿，無法燒製"
+        return f"成功燒製了{item.name}！已添加到物品欄"
+
+    @staticmethod
+    def _item_name(item_id: str) -> str:
+        """取得物品的顯示名稱（找不到時使用ID）"""
+        item = item_database.get_item(item_id)
+        return item.name if item else item_id
 
     def _is_near_workbench(self) -> bool:
         """檢查是否靠近工作台"""
@@ -702,7 +944,7 @@ class Game:
         Args:
             message (str): 要顯示的訊息
         """
-        current_time = time.time()
+        current_time = game_clock.now()
         self.messages.append((message, current_time))
 
         # 限制訊息數量
@@ -710,8 +952,14 @@ class Game:
         if len(self.messages) > max_messages:
             self.messages.pop(0)
 
-    def update(self) -> None:
-        """更新遊戲邏輯"""
+    def update(self, delta_time: Optional[float] = None, keys=None) -> None:
+        """
+        更新遊戲邏輯
+
+        Args:
+            delta_time (float): 幀時間（秒），預設使用時鐘實際經過的時間
+            keys: 按鍵狀態，預設讀取鍵盤（代理環境會傳入模擬的按鍵）
+        """
         if self.state not in [
             GameState.PLAYING,
             GameState.CRAFTING,
@@ -720,11 +968,14 @@ class Game:
             return
 
         # 計算幀時間
-        delta_time = self.clock.get_time() / 1000.0
+        if delta_time is None:
+            delta_time = self.clock.get_time() / 1000.0
+        game_clock.advance(delta_time)
 
         # 處理玩家輸入（只在遊戲進行時）
         if self.state == GameState.PLAYING:
-            keys = pygame.key.get_pressed()
+            if keys is None:
+                keys = pygame.key.get_pressed()
             self.player.handle_input(keys)
 
         # 更新各系統
@@ -765,6 +1016,10 @@ class Game:
 
         self.time_manager.update(delta_time)
 
+        # 自動存檔 - 主執行緒只收集資料，編碼與寫檔在背景完成
+        if self.save_manager.update(delta_time):
+            self.save_game(SAVE_CONFIG["autosave_slot"], background=True)
+
         # 清理過期訊息
         self._cleanup_messages()
 
@@ -781,28 +1036,25 @@ class Game:
         """處理怪物主動攻擊"""
         from src.world.world_objects import Monster
 
-        for obj in self.world_manager.objects:
-            if isinstance(obj, Monster) and obj.active:
-                if obj.state == "attacking" and obj._can_attack():
-                    # 檢查距離
-                    player_center_x = self.player.x + self.player.width // 2
-                    player_center_y = self.player.y + self.player.height // 2
-                    monster_center_x = obj.x + obj.width // 2
-                    monster_center_y = obj.y + obj.height // 2
-
-                    distance = (
-                        (player_center_x - monster_center_x) ** 2
-                        + (player_center_y - monster_center_y) ** 2
-                    ) ** 0.5
-
-                    if distance <= obj.attack_range:
-                        attack_result = obj._perform_attack()
-                        if attack_result and attack_result.get("monster_attack"):
-                            damage = attack_result.get("damage", 0)
-                            actual_damage = self.player.take_damage(damage)
-                            self.add_message(
-                                f"怪物攻擊了你！受到 {actual_damage} 點傷害"
-                            )
+        for obj in self.world_manager.get_objects_by_type(Monster):
+            if obj.state == "attacking" and obj._can_attack():
+                # 檢查距離
+                player_center_x = self.player.x + self.player.width // 2
+                player_center_y = self.player.y + self.player.height // 2
+                monster_center_x = obj.x + obj.width // 2
+                monster_center_y = obj.y + obj.height // 2
+
+                distance = (
+                    (player_center_x - monster_center_x) ** 2
+                    + (player_center_y - monster_center_y) ** 2
+                ) ** 0.5
+
+                if distance <= obj.attack_range:
+                    attack_result = obj._perform_attack()
+                    if attack_result and attack_result.get("monster_attack"):
+                        damage = attack_result.get("damage", 0)
+                        actual_damage = self.player.take_damage(damage)
+                        self.add_message(f"怪物攻擊了你！受到 {actual_damage} 點傷害")
 
     def _handle_cave_attack(self) -> Optional[str]:
         """
@@ -811,10 +1063,8 @@ class Game:
         Returns:
             Optional[str]: 攻擊結果訊息
         """
-        import time
-
         # 檢查攻擊冷卻
-        current_time = time.time()
+        current_time = game_clock.now()
         if current_time - self.player.last_attack < self.player.attack_cooldown:
             return None
 
@@ -830,21 +1080,14 @@ class Game:
         center_x = self.player.x + self.player.width // 2
         center_y = self.player.y + self.player.height // 2
 
-        # 獲取洞穴中的怪物
-        cave_objects = self.cave_system.get_cave_objects()
-        nearby_monsters = []
-
-        for obj in cave_objects:
-            if obj.__class__.__name__ in ["CaveMonster"]:
-                # 計算距離
-                obj_center_x = obj.x + obj.width // 2
-                obj_center_y = obj.y + obj.height // 2
-                distance = math.sqrt(
-                    (obj_center_x - center_x) ** 2 + (obj_center_y - center_y) ** 2
-                )
-
-                if distance <= self.player.attack_range:
-                    nearby_monsters.append(obj)
+        # 獲取攻擊範圍內的洞穴怪物
+        nearby_monsters = [
+            obj
+            for obj in self.cave_system.get_nearby_cave_objects(
+                center_x, center_y, self.player.attack_range
+            )
+            if obj.__class__.__name__ in ["CaveMonster"]
+        ]
 
         if not nearby_monsters:
             return "揮空了！洞穴中沒有攻擊到任何目標"
@@ -870,20 +1113,13 @@ class Game:
 
             if monster.health <= 0:
                 # 怪物死亡
-                cave_objects.remove(monster)
+                monster.destroy()
                 results.append(f"擊敗了洞穴怪物！造成{total_damage}點傷害")
 
-                # 洞穴怪物掉落更好的物品
-                import random
+                # 洞穴怪物依自己的掉落表（LOOT_TABLES）掉落物品
                 from src.systems.inventory import item_database
 
-                drop_items = [
-                    ("crystal", 1),
-                    ("emerald", random.randint(1, 2)),
-                    ("food", random.randint(2, 3)),
-                ]
-
-                for item_id, quantity in drop_items:
+                for item_id, quantity in monster.roll_drops():
                     item = item_database.get_item(item_id)
                     if item:
                         self.player.inventory.add_item(item, quantity)
@@ -952,7 +1188,7 @@ class Game:
 
     def _cleanup_messages(self) -> None:
         """清理過期的訊息"""
-        current_time = time.time()
+        current_time = game_clock.now()
         self.messages = [
             (msg, timestamp)
             for msg, timestamp in self.messages
@@ -994,32 +1230,44 @@ class Game:
         # 更新顯示
         pygame.display.flip()
 
+    def _bake_grass_layer(self) -> pygame.Surface:
+        """
+        把草地磚預先鋪成一張比螢幕多一格的大圖
+
+        Returns:
+            pygame.Surface: 鋪好草地的背景圖
+        """
+        size = self.grass_size
+        screen_width, screen_height = self.screen.get_size()
+        # 多鋪一格，捲動時偏移不超過一格都能蓋滿整個螢幕
+        width = (screen_width // size + 2) * size
+        height = (screen_height // size + 2) * size
+
+        layer = pygame.Surface((width, height))
+        layer.fill(COLORS["BACKGROUND"])
+        for x in range(0, width, size):
+            for y in range(0, height, size):
+                layer.blit(self.grass_texture, (x, y))
+        return layer.convert()
+
     def _draw_grass_background(self) -> None:
-        """繪製草地背景磚"""
+        """繪製草地背景（預先鋪好的背景圖，每幀只需一次 blit）"""
         if not hasattr(self, "grass_texture"):
             return
 
-        # 獲取相機可見範圍
-        left, top, right, bottom = self.camera.get_visible_area()
-
-        # 計算需要繪製的磚範圍
-        start_tile_x = int(left // self.grass_size) - 1
-        start_tile_y = int(top // self.grass_size) - 1
-        end_tile_x = int(right // self.grass_size) + 2
-        end_tile_y = int(bottom // self.grass_size) + 2
-
-        # 繪製草地磚
-        for tile_x in range(start_tile_x, end_tile_x):
-            for tile_y in range(start_tile_y, end_tile_y):
-                # 計算世界座標
-                world_x = tile_x * self.grass_size
-                world_y = tile_y * self.grass_size
-
-                # 轉換為螢幕座標
-                screen_x, screen_y = self.camera.world_to_screen(world_x, world_y)
+        # 螢幕尺寸改變時重新鋪圖
+        if self.grass_layer is None or self.grass_layer_screen_size != (
+            self.screen.get_size()
+        ):
+            self.grass_layer = self._bake_grass_layer()
+            self.grass_layer_screen_size = self.screen.get_size()
 
-                # 繪製草地磚
-                self.screen.blit(self.grass_texture, (screen_x, screen_y))
+        # 對齊到可見範圍左上角的草地磚，背景圖隨相機捲動
+        left, top, _, _ = self.camera.get_visible_area()
+        world_x = (left // self.grass_size) * self.grass_size
+        world_y = (top // self.grass_size) * self.grass_size
+        screen_x, screen_y = self.camera.world_to_screen(world_x, world_y)
+        self.screen.blit(self.grass_layer, (screen_x, screen_y))
 
     def _draw_gameplay(self) -> None:
         """繪製遊戲進行畫面"""
@@ -1103,8 +1351,8 @@ class Game:
         self.player.draw(self.screen, camera_center_x, camera_center_y)
         # 繪製出口提示
         exit_text = "按 Enter 鍵退出洞穴"
-        font = pygame.font.Font(None, 24)
-        text_surface = font.render(exit_text, True, (255, 255, 0))
+        font = text_cache.get_font(None, 24)
+        text_surface = text_cache.render(font, exit_text, (255, 255, 0))
         self.screen.blit(text_surface, (10, WINDOW_CONFIG["height"] - 40))
 
     def _draw_cave_ui(self) -> None:
@@ -1118,14 +1366,14 @@ class Game:
             torch_text = "黑暗中！按 L 鍵使用照明"
             color = (255, 0, 0)
 
-        font = pygame.font.Font(None, 20)
-        text_surface = font.render(torch_text, True, color)
+        font = text_cache.get_font(None, 20)
+        text_surface = text_cache.render(font, torch_text, color)
         self.screen.blit(text_surface, (10, 80))
 
         # 洞穴深度指示
         if self.cave_system.current_room:
             depth_text = f"洞穴深度: 第 {self.cave_system.current_room.depth} 層"
-            depth_surface = font.render(depth_text, True, (200, 200, 200))
+            depth_surface = text_cache.render(font, depth_text, (200, 200, 200))
             self.screen.blit(depth_surface, (10, 100))
 
     def _draw_inventory(self) -> None:
@@ -1209,11 +1457,41 @@ class Game:
             "small",
         )
 
+    def step(self, n_frames: int = 1, delta_time: Optional[float] = None) -> int:
+        """
+        以固定的模擬時間推進遊戲，不等待幀率
+
+        無頭模式下不繪製畫面，可以用遠快於即時的速度模擬長時間的遊戲
+
+        Args:
+            n_frames (int): 要推進的幀數
+            delta_time (float): 每幀的遊戲時間（秒），預設使用 SIMULATION_CONFIG
+
+        Returns:
+            int: 實際推進的幀數（遊戲被關閉時會提早停止）
+        """
+        if delta_time is None:
+            delta_time = SIMULATION_CONFIG["delta_time"]
+
+        frames = 0
+        while frames < n_frames and self.running:
+            self.handle_events()
+            self.update(delta_time)
+            if not self.headless:
+                self.draw()
+            frames += 1
+        return frames
+
     def run(self) -> None:
         """運行遊戲主迴圈"""
         print("開始遊戲！")
 
         while self.running:
+            if self.headless:
+                # 無頭模式不控制幀率，盡快推進
+                self.step()
+                continue
+
             # 控制幀率
             self.clock.tick(WINDOW_CONFIG["fps"])
 
@@ -1226,18 +1504,94 @@ class Game:
             # 繪製畫面
             self.draw()
 
-        # 清理資源
-        self.music_manager.cleanup()
+        self.close()
+
+    def close(self, autosave: bool = True) -> None:
+        """
+        清理資源（重複呼叫時只執行一次）
+
+        Args:
+            autosave (bool): 是否在離開前自動存檔；發生錯誤時狀態可能不完整，不存檔
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        # 離開前自動存檔，並等待背景寫檔完成
+        if (
+            autosave
+            and self.save_manager.autosave_enabled
+            and self.state != GameState.GAME_OVER
+        ):
+            self.save_game(SAVE_CONFIG["autosave_slot"])
+        self.save_manager.wait()
+        self._close_world()
+
+        # 音效要在音樂管理器關閉混音器之前停止
         self.sound_manager.cleanup()
+        self.music_manager.cleanup()
         pygame.quit()
         print("👋 遊戲結束，感謝遊玩！")
 
 
+def run_headless(frames: int, delta_time: float) -> None:
+    """
+    以無頭模式模擬指定幀數並輸出效能統計
+
+    Args:
+        frames (int): 模擬幀數
+        delta_time (float): 每幀的遊戲時間（秒）
+    """
+    game = Game(headless=True)
+    try:
+        start = time.perf_counter()
+        stepped = game.step(frames, delta_time)
+        elapsed = time.perf_counter() - start
+
+        stats = game.world_manager.get_object_stats()
+        print(f"🧪 無頭模擬完成: {stepped} 幀，遊戲時間 {game_clock.now():.1f} 秒")
+        print(
+            f"⏱️ 實際耗時 {elapsed:.2f} 秒 ({stepped / max(elapsed, 1e-9):.0f} 幀/秒)"
+        )
+        print(f"世界: 物件統計 {stats}")
+    finally:
+        game.close()
+
+
 def main():
     """主函數 - 遊戲入口點"""
+    parser = argparse.ArgumentParser(description=WINDOW_CONFIG["title"])
+    parser.add_argument(
+        "--headless", action="store_true", help="無頭模式，不開啟視窗直接模擬"
+    )
+    parser.add_argument("--frames", type=int, default=3600, help="無頭模式模擬的幀數")
+    parser.add_argument(
+        "--delta-time",
+        type=float,
+        default=SIMULATION_CONFIG["delta_time"],
+        help="無頭模式每幀的遊戲時間（秒）",
+    )
+    parser.add_argument(
+        "--load",
+        metavar="SLOT",
+        help=f"啟動後讀取存檔欄位（例如 {SAVE_CONFIG['autosave_slot']}）",
+    )
+    args = parser.parse_args()
+
     try:
+        if args.headless:
+            run_headless(args.frames, args.delta_time)
+            return
+
         game = Game()
-        game.run()
+        try:
+            if args.load:
+                game.load_game(args.load)
+            game.run()
+        except BaseException:
+            # 不論怎麼結束都要關閉世界，刪除這次的暫存區域檔
+            game.close(autosave=False)
+            raise
     except Exception as e:
         print(f"遊戲發生錯誤: {e}")
         pygame.quit()
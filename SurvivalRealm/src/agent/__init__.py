@@ -0,0 +1 @@
+"""Survival Realm - 代理環境"""
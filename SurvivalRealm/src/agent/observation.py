@@ -0,0 +1,166 @@
+"""
+Survival Realm - 網格觀察編碼器
+把玩家周圍的物件依類別畫進多通道的小網格，取代讀取整個畫面當作代理的輸入
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+編碼器的核心概念：
+1. 網格以玩家為中心，每個通道代表一類物件，格子被物件覆蓋時為 1
+2. 候選物件來自空間索引的矩形查詢，不需要走訪所有世界物件
+3. 物件覆蓋的格子範圍直接由座標換算，每列以一次切片賦值填滿
+4. 網格之後接著固定長度的玩家數值（生存狀態與物品數量）
+"""
+
+from array import array
+from typing import Dict, Optional, Tuple
+
+from ..core.config import ENV_CONFIG
+
+# 網格通道與對應的物件類別名稱
+GRID_CHANNELS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("tree", ("Tree",)),
+    ("rock", ("Rock",)),
+    ("food", ("Food",)),
+    ("river", ("River",)),
+    ("chest", ("Chest",)),
+    ("cave", ("Cave",)),
+    ("monster", ("Monster",)),
+    ("station", ("Workbench", "Furnace")),
+    # 以下通道只在洞穴中使用
+    ("cave_monster", ("CaveMonster", "CaveBoss")),
+    ("cave_treasure", ("TreasureChest",)),
+)
+
+# 網格之後的玩家數值欄位（物品數量接在最後）
+STAT_FIELDS: Tuple[str, ...] = (
+    "health",
+    "hunger",
+    "thirst",
+    "energy",
+    "sanity",
+    "in_cave",
+    "time_of_day",
+)
+
+
+class GridEncoder:
+    """以玩家為中心的多通道語意網格編碼器"""
+
+    def __init__(
+        self,
+        grid_size: Optional[Tuple[int, int]] = None,
+        cell_size: Optional[int] = None,
+    ) -> None:
+        """
+        初始化編碼器
+
+        Args:
+            grid_size (Tuple[int, int]): 網格的 (列數, 行數)，預設使用 ENV_CONFIG
+            cell_size (int): 每格代表的世界像素
+        """
+        self.rows, self.cols = grid_size or ENV_CONFIG["grid_size"]
+        self.cell_size = cell_size or ENV_CONFIG["grid_cell_size"]
+        self.items: Tuple[str, ...] = tuple(ENV_CONFIG["observation_items"])
+
+        self.channels = len(GRID_CHANNELS)
+        self.grid_length = self.channels * self.rows * self.cols
+        self.stats_length = len(STAT_FIELDS) + len(self.items)
+
+        self._channel_names = {
+            class_name: index
+            for index, (_, class_names) in enumerate(GRID_CHANNELS)
+            for class_name in class_names
+        }
+        self._channel_of: Dict[type, Optional[int]] = {}  # 類別 -> 通道的快取
+        self._blank = array("f", bytes(4 * self.grid_length))
+        self._ones = array("f", [1.0] * self.cols)
+
+    @property
+    def size(self) -> int:
+        """編碼結果的總長度"""
+        return self.grid_length + self.stats_length
+
+    @property
+    def grid_shape(self) -> Tuple[int, int, int]:
+        """網格的形狀 (通道, 列, 行)"""
+        return (self.channels, self.rows, self.cols)
+
+    def _channel(self, cls: type) -> Optional[int]:
+        """取得物件類別對應的通道（子類別沿用父類別的通道）"""
+        if cls not in self._channel_of:
+            channel = None
+            for base in cls.__mro__:
+                channel = self._channel_names.get(base.__name__)
+                if channel is not None:
+                    break
+            self._channel_of[cls] = channel
+        return self._channel_of[cls]
+
+    def encode(self, game) -> array:
+        """
+        編碼目前的遊戲狀態
+
+        Args:
+            game: 遊戲實例
+
+        Returns:
+            array: 長度為 size 的 float 陣列，前段為 grid_shape 網格，後段為玩家數值
+        """
+        observation = self._blank[:]
+        player = game.player
+        cave = game.cave_system
+        rows, cols, cell = self.rows, self.cols, self.cell_size
+
+        center_x, center_y = player.get_world_center()
+        left = center_x - cols * cell / 2
+        top = center_y - rows * cell / 2
+        right = left + cols * cell
+        bottom = top + rows * cell
+
+        if cave.in_cave and cave.current_room:
+            index = cave.current_room.spatial_index
+        else:
+            index = game.world_manager.spatial_index
+
+        # 索引以左上角分桶，往左上擴大搜尋範圍才能找到跨進網格的大型物件
+        margin = index.max_object_size
+        ones = self._ones
+        plane = rows * cols
+        for obj in index.query_rect(left - margin, top - margin, right, bottom):
+            if not obj.active:
+                continue
+            channel = self._channel(type(obj))
+            if channel is None:
+                continue
+
+            col_start = max(0, int((obj.x - left) // cell))
+            col_end = min(cols, -int(-(obj.x + obj.width - left) // cell))
+            row_start = max(0, int((obj.y - top) // cell))
+            row_end = min(rows, -int(-(obj.y + obj.height - top) // cell))
+            if col_start >= col_end or row_start >= row_end:
+                continue
+
+            span = col_end - col_start
+            base = channel * plane + col_start
+            for row in range(row_start, row_end):
+                start = base + row * cols
+                observation[start : start + span] = ones[:span]
+
+        stats = player.survival_stats
+        time_manager = game.time_manager
+        observation.extend(
+            (
+                stats.health / 100.0,
+                stats.hunger / 100.0,
+                stats.thirst / 100.0,
+                stats.energy / 100.0,
+                stats.sanity / 100.0,
+                1.0 if cave.in_cave else 0.0,
+                time_manager.game_time / time_manager.day_length,
+            )
+        )
+        inventory = player.inventory
+        observation.extend(inventory.get_item_count(item_id) for item_id in self.items)
+        return observation
@@ -0,0 +1,301 @@
+"""
+Survival Realm - 代理環境
+以 reset(seed) / step(action) 介面讓代理程式控制玩家，遊戲在無頭模式下執行
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+代理環境的核心概念：
+1. 每個動作對應一組按鍵：移動鍵在整個動作期間按住，其他按鍵只按一次
+2. 每個動作重複 frame_skip 幀，代理不需要每幀都做決策
+3. 只有需要畫面觀察時才會繪製，數值觀察直接讀取遊戲狀態
+"""
+
+from array import array
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+import pygame
+
+from ..core.config import CAVE_CONFIG, ENV_CONFIG, SIMULATION_CONFIG, WORLD_CONFIG
+from .observation import GridEncoder
+
+Observation = Union[List[float], array, bytes]
+
+# 所有可用的離散動作，動作編號即為在此列表中的索引
+ACTIONS: Tuple[str, ...] = (
+    "noop",
+    "move_up",
+    "move_down",
+    "move_left",
+    "move_right",
+    "interact",  # E 鍵
+    "attack",  # 空白鍵
+    "eat",  # F 鍵
+    "light",  # L 鍵
+    "cave",  # Enter 鍵 - 進入/退出洞穴
+    "craft_axe",
+    "craft_pickaxe",
+    "craft_bucket",
+    "craft_torch",
+    "craft_workbench",
+    "craft_furnace",
+    "craft_iron_sword",
+    "craft_iron_armor",
+)
+
+# 移動動作在整個動作期間按住的按鍵
+MOVE_KEYS = {
+    "move_up": pygame.K_w,
+    "move_down": pygame.K_s,
+    "move_left": pygame.K_a,
+    "move_right": pygame.K_d,
+}
+
+# 動作開始時按一次的按鍵
+PRESS_KEYS = {
+    "interact": pygame.K_e,
+    "attack": pygame.K_SPACE,
+    "eat": pygame.K_f,
+    "light": pygame.K_l,
+    "cave": pygame.K_RETURN,
+}
+
+# 製作動作對應製作介面的數字鍵 (1=斧頭 ... 8=鐵甲)
+CRAFT_NUMBERS = {
+    name: number
+    for number, name in enumerate(
+        (name for name in ACTIONS if name.startswith("craft_")), start=1
+    )
+}
+
+# 數值觀察的欄位名稱
+STATE_FIELDS: Tuple[str, ...] = (
+    "x",  # 玩家世界座標（以區塊為單位）
+    "y",
+    "health",
+    "hunger",
+    "thirst",
+    "energy",
+    "sanity",
+    "in_cave",
+    "depth",
+    "time_of_day",  # 當天經過的比例 (0-1)
+    "cave_entry",  # 是否站在可進入的洞穴入口
+)
+
+
+class HeldKeys:
+    """模擬 pygame.key.get_pressed() 回傳的按鍵狀態"""
+
+    def __init__(self, pressed: Iterable[int] = ()) -> None:
+        self.pressed: FrozenSet[int] = frozenset(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class SurvivalEnv:
+    """生存遊戲代理環境 - 離散動作、固定幀數的動作重複"""
+
+    def __init__(
+        self,
+        frame_skip: Optional[int] = None,
+        observation: Optional[str] = None,
+        max_steps: Optional[int] = None,
+    ) -> None:
+        """
+        初始化環境（建立無頭模式的遊戲）
+
+        Args:
+            frame_skip (int): 每個動作重複的幀數，預設使用 ENV_CONFIG
+            observation (str): 觀察類型 "state"、"grid" 或 "pixels"
+            max_steps (int): 每局最多動作數
+        """
+        # 主遊戲類別位於專案根目錄的 main.py
+        from main import Game
+
+        self.frame_skip = frame_skip or ENV_CONFIG["frame_skip"]
+        self.observation_type = observation or ENV_CONFIG["observation"]
+        self.max_steps = max_steps or ENV_CONFIG["max_steps"]
+        if self.observation_type not in ("state", "grid", "pixels"):
+            raise ValueError(f"未知的觀察類型: {self.observation_type}")
+
+        self.delta_time = SIMULATION_CONFIG["delta_time"]
+        self.encoder = GridEncoder() if self.observation_type == "grid" else None
+        self.game = Game(headless=True)
+        self.steps = 0
+        self._last_health = 0.0
+        self._last_items = 0
+
+        # 每個動作按住的按鍵，預先建立避免每步配置
+        self._held_keys = [
+            HeldKeys([MOVE_KEYS[name]] if name in MOVE_KEYS else []) for name in ACTIONS
+        ]
+
+    @property
+    def action_count(self) -> int:
+        """動作數量"""
+        return len(ACTIONS)
+
+    @property
+    def observation_shape(self) -> Tuple[int, ...]:
+        """觀察的形狀 - 數值為 (欄位數,)，網格為 (網格與數值總長,)，畫面為 (高, 寬, 3)"""
+        if self.observation_type == "pixels":
+            width, height = ENV_CONFIG["pixel_size"]
+            return (height, width, 3)
+        if self.encoder is not None:
+            return (self.encoder.size,)
+        return (len(STATE_FIELDS),)
+
+    def reset(self, seed: Optional[int] = None) -> Observation:
+        """
+        開始新的一局
+
+        Args:
+            seed (Optional[int]): 世界與亂數種子，相同種子與動作序列會得到相同結果
+
+        Returns:
+            Observation: 初始觀察
+        """
+        self.game.reset(seed)
+        self.steps = 0
+        self._last_health = self.game.player.survival_stats.health
+        self._last_items = self._count_items()
+        return self._observe()
+
+    def step(self, action: int) -> Tuple[Observation, float, bool, Dict[str, Any]]:
+        """
+        執行一個動作
+
+        Args:
+            action (int): 動作編號（ACTIONS 的索引）
+
+        Returns:
+            Tuple: (觀察, 獎勵, 是否結束, 額外資訊)
+        """
+        game = self.game
+        name = ACTIONS[action]
+        if name in PRESS_KEYS:
+            game._handle_keydown(PRESS_KEYS[name])
+        elif name in CRAFT_NUMBERS:
+            game._handle_crafting(CRAFT_NUMBERS[name])
+
+        keys = self._held_keys[action]
+        frames = 0
+        while frames < self.frame_skip:
+            game.update(self.delta_time, keys)
+            frames += 1
+            if not game.player.is_alive():
+                break
+        self.steps += 1
+
+        reward, dead = self._compute_reward()
+        truncated = self.steps >= self.max_steps
+        done = dead or truncated or not game.running
+        info = {
+            "frames": frames,
+            "truncated": truncated and not dead,
+            "in_cave": game.cave_system.in_cave,
+            "day": game.time_manager.current_day,
+        }
+        return self._observe(), reward, done, info
+
+    def snapshot(self) -> tuple:
+        """
+        取得環境與遊戲狀態的快照，供搜尋型代理從同一個狀態分支模擬
+
+        Returns:
+            tuple: 不透明的環境快照
+        """
+        return (self.game.snapshot(), self.steps, self._last_health, self._last_items)
+
+    def restore(self, snapshot: tuple) -> Observation:
+        """
+        還原 snapshot 取得的狀態
+
+        Args:
+            snapshot (tuple): 環境快照
+
+        Returns:
+            Observation: 還原後的觀察
+        """
+        game_state, self.steps, self._last_health, self._last_items = snapshot
+        self.game.restore(game_state)
+        return self._observe()
+
+    def _compute_reward(self) -> Tuple[float, bool]:
+        """
+        計算這一步的獎勵
+
+        Returns:
+            Tuple[float, bool]: (獎勵, 玩家是否死亡)
+        """
+        player = self.game.player
+        health = player.survival_stats.health
+        items = self._count_items()
+
+        reward = ENV_CONFIG["reward_alive"]
+        reward += max(0, items - self._last_items) * ENV_CONFIG["reward_item"]
+        reward += (health - self._last_health) * ENV_CONFIG["reward_health"]
+        self._last_health = health
+        self._last_items = items
+
+        dead = not player.is_alive()
+        if dead:
+            reward += ENV_CONFIG["reward_death"]
+        return reward, dead
+
+    def _count_items(self) -> int:
+        """計算物品欄中的物品總數"""
+        return self.game.player.inventory.get_total_count()
+
+    def _observe(self) -> Observation:
+        """取得目前的觀察"""
+        if self.observation_type == "pixels":
+            return self._observe_pixels()
+        if self.encoder is not None:
+            return self.encoder.encode(self.game)
+        return self._observe_state()
+
+    def _observe_state(self) -> List[float]:
+        """
+        取得數值觀察（不需要繪製畫面）
+
+        Returns:
+            List[float]: 依 STATE_FIELDS 順序排列的數值
+        """
+        game = self.game
+        stats = game.player.survival_stats
+        center_x, center_y = game.player.get_world_center()
+        chunk_size = WORLD_CONFIG["chunk_size"]
+        cave = game.cave_system
+        time_manager = game.time_manager
+        return [
+            center_x / chunk_size,
+            center_y / chunk_size,
+            stats.health / 100.0,
+            stats.hunger / 100.0,
+            stats.thirst / 100.0,
+            stats.energy / 100.0,
+            stats.sanity / 100.0,
+            1.0 if cave.in_cave else 0.0,
+            cave.current_depth / CAVE_CONFIG["max_depth"],
+            time_manager.game_time / time_manager.day_length,
+            1.0 if game.pending_cave_entry else 0.0,
+        ]
+
+    def _observe_pixels(self) -> bytes:
+        """
+        繪製畫面並縮放成畫面觀察
+
+        Returns:
+            bytes: RGB 像素資料，形狀為 observation_shape
+        """
+        self.game.draw()
+        frame = pygame.transform.smoothscale(self.game.screen, ENV_CONFIG["pixel_size"])
+        return pygame.image.tostring(frame, "RGB")
+
+    def close(self) -> None:
+        """關閉環境並釋放資源"""
+        self.game.close()
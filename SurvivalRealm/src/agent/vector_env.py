@@ -0,0 +1,350 @@
+"""
+Survival Realm - 多程序向量化環境
+每個遊戲實例在獨立的工作程序中執行，由同一個控制端同步推進
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+向量化環境的核心概念：
+1. 遊戲狀態存在模組層級的單例中（洞穴系統、相機、音效），一個程序只能跑一個遊戲
+2. 觀察、獎勵、結束旗標與動作都放在共享記憶體，每步不需要序列化任何資料
+3. 控制端與工作程序之間只傳送一個位元組的指令，所有工作程序同時推進
+4. 共享緩衝區以 memoryview 提供，np.asarray(env.observations) 可以零複製取得陣列
+"""
+
+import multiprocessing
+import os
+import sys
+import traceback
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.config import ENV_CONFIG
+from .observation import GridEncoder
+from .survival_env import STATE_FIELDS, SurvivalEnv
+
+# 控制端送給工作程序的指令
+_RESET = b"r"
+_STEP = b"s"
+_CLOSE = b"c"
+_ERROR = b"!"  # 工作程序回報錯誤的前綴
+
+_NO_SEED = -1  # 共享種子欄位中代表「隨機種子」的值
+
+
+class _SharedBuffers:
+    """共享記憶體中各欄位的 memoryview"""
+
+    def __init__(
+        self, buffer: memoryview, num_envs: int, obs_size: int, obs_format: str
+    ) -> None:
+        """
+        依固定配置切出各欄位（每個欄位以 8 位元組對齊）
+
+        Args:
+            buffer (memoryview): 共享記憶體緩衝區
+            num_envs (int): 環境數量
+            obs_size (int): 每個觀察的元素數量
+            obs_format (str): 觀察的元素格式 ("f" 數值 / "B" 像素)
+        """
+        self.obs_size = obs_size
+        self._views: List[memoryview] = []
+        offset = 0
+        fields = (
+            ("observations", obs_format, num_envs * obs_size),
+            ("rewards", "f", num_envs),
+            ("seeds", "q", num_envs),
+            ("actions", "i", num_envs),
+            ("dones", "B", num_envs),
+        )
+        for name, fmt, count in fields:
+            size = count * _ITEM_SIZES[fmt]
+            view = buffer[offset : offset + size]
+            self._views.append(view)
+            setattr(self, name, view.cast(fmt))
+            offset += _aligned(size)
+
+        # 觀察另外提供 (環境數, 觀察大小) 的二維檢視
+        self.observation_rows = self._views[0].cast(obs_format, (num_envs, obs_size))
+
+    @staticmethod
+    def required_size(num_envs: int, obs_size: int, obs_format: str) -> int:
+        """計算共享記憶體需要的位元組數"""
+        return (
+            _aligned(num_envs * obs_size * _ITEM_SIZES[obs_format])
+            + _aligned(num_envs * 4)
+            + _aligned(num_envs * 8)
+            + _aligned(num_envs * 4)
+            + _aligned(num_envs)
+        )
+
+    def write_observation(self, index: int, observation) -> None:
+        """
+        寫入一個環境的觀察
+
+        Args:
+            index (int): 環境編號
+            observation: 數值列表、float 陣列或像素 bytes
+        """
+        start = index * self.obs_size
+        if isinstance(observation, (bytes, array)):
+            self.observations[start : start + self.obs_size] = observation
+        else:
+            self.observations[start : start + self.obs_size] = array("f", observation)
+
+    def release(self) -> None:
+        """釋放所有 memoryview，之後才能關閉共享記憶體"""
+        for name in (
+            "observation_rows",
+            "observations",
+            "rewards",
+            "seeds",
+            "actions",
+            "dones",
+        ):
+            getattr(self, name).release()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+
+
+_ITEM_SIZES = {"f": 4, "B": 1, "q": 8, "i": 4}
+
+
+def _aligned(size: int) -> int:
+    """把位元組數對齊到 8 的倍數"""
+    return (size + 7) // 8 * 8
+
+
+def _worker(
+    index: int,
+    num_envs: int,
+    shm_name: str,
+    obs_size: int,
+    obs_format: str,
+    env_kwargs: Dict[str, Any],
+    conn,
+) -> None:
+    """
+    工作程序 - 執行一個遊戲實例，依控制端的指令重設或推進
+
+    Args:
+        index (int): 環境編號（共享緩衝區中的列）
+        num_envs (int): 環境總數
+        shm_name (str): 共享記憶體名稱
+        obs_size (int): 每個觀察的元素數量
+        obs_format (str): 觀察的元素格式
+        env_kwargs (Dict[str, Any]): SurvivalEnv 的參數
+        conn: 與控制端連線的管道
+    """
+    if not ENV_CONFIG["worker_output"]:
+        # 多個遊戲的除錯訊息會交錯在一起，預設關閉
+        sys.stdout = open(os.devnull, "w")
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buffers = _SharedBuffers(shm.buf, num_envs, obs_size, obs_format)
+    env = None
+    try:
+        env = SurvivalEnv(**env_kwargs)
+        seed: Optional[int] = None
+        conn.send_bytes(b"")  # 初始化完成
+
+        while True:
+            command = conn.recv_bytes()
+            if command == _CLOSE:
+                break
+
+            if command == _RESET:
+                seed = buffers.seeds[index]
+                seed = None if seed == _NO_SEED else seed
+                observation = env.reset(seed)
+                reward, done = 0.0, False
+            else:
+                observation, reward, done, _ = env.step(buffers.actions[index])
+                if done:
+                    # 自動開始下一局，有種子時依序使用下一個種子
+                    if seed is not None:
+                        seed += num_envs
+                    observation = env.reset(seed)
+
+            buffers.write_observation(index, observation)
+            buffers.rewards[index] = reward
+            buffers.dones[index] = 1 if done else 0
+            conn.send_bytes(b"")
+    except Exception:
+        conn.send_bytes(_ERROR + traceback.format_exc().encode("utf-8"))
+    finally:
+        if env is not None:
+            env.close()
+        buffers.release()
+        shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """向量化環境 - N 個獨立程序中的遊戲實例同步推進"""
+
+    def __init__(
+        self,
+        num_envs: int,
+        frame_skip: Optional[int] = None,
+        observation: Optional[str] = None,
+        max_steps: Optional[int] = None,
+    ) -> None:
+        """
+        啟動所有工作程序
+
+        Args:
+            num_envs (int): 環境數量，通常為 CPU 核心數
+            frame_skip (int): 每個動作重複的幀數
+            observation (str): 觀察類型 "state"、"grid" 或 "pixels"
+            max_steps (int): 每局最多動作數
+        """
+        if num_envs <= 0:
+            raise ValueError("環境數量必須大於 0")
+
+        observation = observation or ENV_CONFIG["observation"]
+        if observation == "pixels":
+            width, height = ENV_CONFIG["pixel_size"]
+            obs_size, obs_format = width * height * 3, "B"
+        elif observation == "grid":
+            obs_size, obs_format = GridEncoder().size, "f"
+        else:
+            obs_size, obs_format = len(STATE_FIELDS), "f"
+
+        self.num_envs = num_envs
+        self.obs_size = obs_size
+        self._closed = False
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=_SharedBuffers.required_size(num_envs, obs_size, obs_format),
+        )
+        self._buffers = _SharedBuffers(self._shm.buf, num_envs, obs_size, obs_format)
+
+        self.observations = self._buffers.observation_rows
+        self.rewards = self._buffers.rewards
+        self.dones = self._buffers.dones
+
+        # 使用 spawn 啟動全新的直譯器，每個程序都有自己的遊戲單例
+        context = multiprocessing.get_context(ENV_CONFIG["start_method"])
+        env_kwargs = {
+            "frame_skip": frame_skip,
+            "observation": observation,
+            "max_steps": max_steps,
+        }
+        self._connections = []
+        self._processes = []
+        for index in range(num_envs):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(
+                    index,
+                    num_envs,
+                    self._shm.name,
+                    obs_size,
+                    obs_format,
+                    env_kwargs,
+                    child_conn,
+                ),
+                name=f"survival-env-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+        try:
+            self._wait_all()
+        except Exception:
+            self.close()
+            raise
+        print(f"🧪 向量化環境啟動完成：{num_envs} 個遊戲實例")
+
+    def _wait_all(self) -> None:
+        """等待所有工作程序完成目前的指令"""
+        errors = []
+        for index, conn in enumerate(self._connections):
+            try:
+                reply = conn.recv_bytes()
+            except EOFError:
+                errors.append(f"環境 {index} 的工作程序意外結束")
+                continue
+            if reply.startswith(_ERROR):
+                errors.append(f"環境 {index} 發生錯誤:\n{reply[1:].decode('utf-8')}")
+        if errors:
+            raise RuntimeError("\n".join(errors))
+
+    def _broadcast(self, command: bytes) -> None:
+        """送出指令給所有工作程序並等待完成"""
+        if self._closed:
+            raise RuntimeError("向量化環境已關閉")
+        for conn in self._connections:
+            conn.send_bytes(command)
+        self._wait_all()
+
+    def reset(self, seeds: Optional[Sequence[Optional[int]]] = None) -> memoryview:
+        """
+        重設所有環境
+
+        Args:
+            seeds (Sequence[Optional[int]]): 每個環境的種子，None 表示隨機
+
+        Returns:
+            memoryview: 觀察緩衝區 (環境數, 觀察大小)
+        """
+        for index in range(self.num_envs):
+            seed = seeds[index] if seeds is not None else None
+            self._buffers.seeds[index] = _NO_SEED if seed is None else seed
+        self._broadcast(_RESET)
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> Tuple[memoryview, memoryview, memoryview]:
+        """
+        所有環境各執行一個動作（結束的環境會自動開始下一局）
+
+        Args:
+            actions (Sequence[int]): 每個環境的動作編號
+
+        Returns:
+            Tuple[memoryview, memoryview, memoryview]: (觀察, 獎勵, 結束旗標)
+            回傳的是共享緩衝區本身，下一次 step 時內容會被覆寫
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"需要 {self.num_envs} 個動作，收到 {len(actions)} 個")
+        action_buffer = self._buffers.actions
+        for index, action in enumerate(actions):
+            action_buffer[index] = int(action)
+        self._broadcast(_STEP)
+        return self.observations, self.rewards, self.dones
+
+    def close(self) -> None:
+        """關閉所有工作程序並釋放共享記憶體"""
+        if self._closed:
+            return
+        self._closed = True
+
+        for conn in self._connections:
+            try:
+                conn.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+
+        self._buffers.release()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
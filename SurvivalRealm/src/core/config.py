@@ -19,6 +19,60 @@ WINDOW_CONFIG = {
     "fullscreen": True,  # 啟用全螢幕模式
 }
 
+# ====== 無頭模擬配置 ======
+
+SIMULATION_CONFIG = {
+    "delta_time": 1 / 60,  # 每個模擬幀前進的遊戲時間（秒）
+    "video_driver": "dummy",  # 無頭模式使用的 SDL 視訊驅動
+    "audio_driver": "dummy",  # 無頭模式使用的 SDL 音效驅動
+}
+
+# ====== 代理環境配置 ======
+
+ENV_CONFIG = {
+    "frame_skip": 4,  # 每個動作重複的幀數
+    "max_steps": 10000,  # 每局最多動作數，超過時截斷
+    "observation": "state",  # 觀察類型: "state" 數值 / "grid" 語意網格 / "pixels" 畫面
+    "pixel_size": (160, 90),  # 畫面觀察縮放後的尺寸
+    "grid_size": (15, 15),  # 網格觀察的 (列數, 行數)，玩家位於中央
+    "grid_cell_size": 32,  # 網格每格代表的世界像素
+    # 網格觀察附帶數量的物品
+    "observation_items": (
+        "wood",
+        "stone",
+        "coal",
+        "food",
+        "berry",
+        "plant_fiber",
+        "iron_ore",
+        "iron_ingot",
+        "torch",
+        "axe",
+        "pickaxe",
+        "iron_sword",
+    ),
+    # 獎勵設定
+    "reward_alive": 0.01,  # 每個動作存活的獎勵
+    "reward_item": 1.0,  # 每獲得一個物品的獎勵
+    "reward_health": 0.1,  # 每點生命值變化的獎勵
+    "reward_death": -10.0,  # 死亡懲罰
+    # 多程序向量化環境
+    "start_method": "spawn",  # 工作程序啟動方式，spawn 讓每個程序有獨立的遊戲單例
+    "worker_output": False,  # 是否保留工作程序的除錯訊息
+}
+
+# ====== 存檔配置 ======
+
+SAVE_CONFIG = {
+    "save_dir": "saves",  # 存檔資料夾
+    "extension": ".srsave",  # 存檔副檔名
+    "quicksave_slot": "quicksave",  # F5 快速存檔 / F9 快速讀檔的欄位
+    "autosave_slot": "autosave",  # 自動存檔的欄位
+    "autosave_interval": 120.0,  # 自動存檔間隔（遊戲秒數）
+    "compression_level": 6,  # zlib 壓縮等級 (1-9)
+    "load_time_target": 0.25,  # 讀檔時間目標（秒），超過時輸出警告
+}
+
 # ====== 顏色定義 ======
 
 COLORS = {
@@ -202,6 +256,19 @@ SMELTING_RECIPES = {
     "copper_ingot": {"material": "copper_ore", "fuel": ["coal", "wood"]},  # 新增：銅錠
 }
 
+# ====== 製作介面配置 ======
+
+CRAFTING_CONFIG = {
+    # 製作介面的分類與順序，數字鍵 1-8 依此順序對應
+    "menu": {
+        "基礎工具": ["axe", "pickaxe", "bucket", "torch"],
+        "建築設施": ["workbench", "furnace"],
+        "戰鬥裝備": ["iron_sword", "iron_armor"],
+    },
+    "basic_recipes": ["workbench", "torch"],  # 不需要靠近工作台就能製作
+    "smelting_menu": ["iron_ingot"],  # 熔爐介面的數字鍵順序
+}
+
 # ====== 挖礦機率配置 ======
 
 MINING_CHANCES = {
@@ -221,11 +288,16 @@ CAVE_CONFIG = {
     "max_depth": 20,  # 增加到20層，更深的地下城
     "room_size": {"width": 1400, "height": 1000},  # 更大的地下城房間
     "rooms_per_level": 3,  # 每層有3個房間，需要闖關才能進入下一層
+    "prefetch_rooms": True,  # 在背景執行緒預先生成下一個可進入的房間
+    "prefetch_cache_size": 2,  # 最多保留幾間預先生成的房間
+    "spatial_cell_size": 100,  # 房間空間索引的格子大小（像素）
     # ====== 地下城生成密度（提高密度）======
     "monster_spawn_rate": 1.2,  # 大幅提高怪物密度，充滿挑戰
     "treasure_spawn_rate": 0.8,  # 提高寶藏密度
     "mineral_spawn_rate": 1.0,  # 大幅提高礦物密度
     "elite_monster_rate": 0.3,  # 精英怪物出現率
+    "object_spacing": 60,  # 房間物件的偏好最小間距（物件太多時自動縮小）
+    "scatter_fallback_attempts": 20,  # 取樣點不夠時，每個缺少的物件最多再隨機嘗試幾次
     # ====== 地下城環境配置 ======
     "torch_duration": 240,  # 火把持續時間（秒）
     "darkness_damage": 2,  # 黑暗傷害
@@ -233,6 +305,7 @@ CAVE_CONFIG = {
     "light_radius": 120,  # 照明半徑
     "darkness_visibility": 30,  # 黑暗中視線
     "max_visibility": 250,  # 最大可見距離
+    "light_mask_cache_size": 64,  # 光暈遮罩快取上限（LRU）
     # ====== 地下城深層配置 ======
     "deep_layer_threshold": 5,  # 深層從第5層開始
     "ultra_deep_threshold": 10,  # 超深層從第10層開始
@@ -275,6 +348,136 @@ CAVE_CONFIG = {
     "enchant_success_rate": {"1": 0.9, "2": 0.7, "3": 0.5, "4": 0.3, "5": 0.1},
 }
 
+# ====== 掉落表配置 ======
+# 每個掉落表由多個掉落組組成，每組獨立判定是否掉落：
+#   chance: 掉落機率，chance_per_depth 為每深一層增加的機率
+#   items: 等機率挑選一種物品（或 {物品: 權重}）；items_by_depth 為達到深度後加入的物品
+#   each: True 時 items 中每種物品各自獨立判定
+#   count: 數量範圍 (最小, 最大)；scale_count 為 True 時乘上深度獎勵倍數，且不少於 min_count
+#   min_depth: 達到此深度才會判定這一組
+
+LOOT_TABLES = {
+    # 地表寶箱
+    "chest": [
+        {"chance": 0.7, "items": ["food", "berry", "mushroom"], "count": (2, 5)},
+        {"chance": 0.3, "items": ["axe", "pickaxe", "bucket"]},
+        {"chance": 0.15, "items": ["iron_sword", "iron_armor", "treasure"]},
+        {"chance": 0.4, "items": ["iron_ore", "coal"], "count": (1, 3)},
+    ],
+    # 地表怪物
+    "monster": [
+        {"chance": 0.6, "items": ["food"], "count": (1, 3)},
+        {"chance": 0.3, "items": ["treasure"]},
+        {"chance": 0.2, "items": ["iron_ore", "coal"]},
+    ],
+    # 用稿子挖石頭時的礦物
+    "mining": [
+        {"chance": chance, "items": [ore_type]}
+        for ore_type, chance in MINING_CHANCES.items()
+    ],
+    # 洞穴怪物
+    "cave_monster": [
+        {"chance": 0.8, "items": ["treasure"], "count": (1, 2)},
+        {"chance": 0.6, "items": ["iron_ore"], "count": (2, 4)},
+        {"chance": 0.4, "items": ["coal"], "count": (1, 3)},
+        {"chance": 0.1, "items": ["diamond"]},
+    ],
+    "cave_spider": [
+        {"chance": 0.7, "items": ["plant_fiber"], "count": (2, 5)},
+        {"chance": 0.3, "items": ["rare_gem"]},
+    ],
+    # 洞穴Boss
+    "cave_boss": [
+        {"items": ["depth_key"]},  # 100%掉落下層鑰匙
+        {
+            "each": True,
+            "items": ["steel_ingot", "diamond", "rare_gem"],
+            "count": (2, 4),
+            "scale_count": True,
+        },
+        {
+            "chance": 0.8,
+            "items": ["diamond", "rare_gem", "treasure"],
+            "count": (1, 3),
+            "scale_count": True,
+        },
+        {"chance": 0.6, "items": ["steel_sword", "diamond_pickaxe", "steel_armor"]},
+        {
+            "each": True,
+            "items": ["health_potion", "energy_potion"],
+            "count": (3, 5),
+            "scale_count": True,
+            "min_count": 2,
+        },
+        {"chance": 0.3, "items": ["boss_trophy", "ancient_artifact", "magic_crystal"]},
+    ],
+    # 洞穴寶箱
+    "treasure_chest": [
+        # 超深層必掉的傳說物品、高級材料與超級藥水
+        {
+            "min_depth": CAVE_CONFIG["ultra_deep_threshold"],
+            "each": True,
+            "chance": 0.6,
+            "items": ["legendary_sword", "ancient_armor", "magic_orb", "dragon_scale"],
+        },
+        {
+            "min_depth": CAVE_CONFIG["ultra_deep_threshold"],
+            "each": True,
+            "items": ["diamond", "rare_gem", "mythril_ingot", "phoenix_feather"],
+            "count": (3, 8),
+        },
+        {
+            "min_depth": CAVE_CONFIG["ultra_deep_threshold"],
+            "each": True,
+            "chance": 0.8,
+            "items": [
+                "legendary_health_potion",
+                "ultimate_energy_potion",
+                "invincibility_potion",
+            ],
+            "count": (2, 5),
+        },
+        # 高級材料
+        {
+            "chance": 0.9,
+            "items": ["iron_ingot", "steel_ingot", "copper_ingot"],
+            "items_by_depth": {5: ["diamond", "rare_gem", "mythril_ingot"]},
+            "count": (2, 5),
+            "scale_count": True,
+        },
+        # 珍貴寶石
+        {
+            "chance": 0.5,
+            "chance_per_depth": 0.1,
+            "items": ["rare_gem", "diamond", "treasure"],
+            "items_by_depth": {7: ["legendary_gem", "cosmic_crystal"]},
+            "count": (1, 2),
+            "scale_count": True,
+        },
+        # 高級裝備
+        {
+            "chance": 0.3,
+            "chance_per_depth": 0.05,
+            "items": ["steel_sword", "steel_armor", "diamond_pickaxe"],
+            "items_by_depth": {
+                5: ["enchanted_sword", "dragon_armor"],
+                8: ["legendary_sword", "ancient_armor"],
+            },
+        },
+        # 藥水
+        {
+            "chance": 0.6,
+            "items": ["health_potion", "energy_potion"],
+            "items_by_depth": {
+                6: ["greater_health_potion", "greater_energy_potion"],
+                9: ["legendary_health_potion", "ultimate_energy_potion"],
+            },
+            "count": (1, 3),
+            "scale_count": True,
+        },
+    ],
+}
+
 # ====== 世界物件配置 ======
 
 WORLD_OBJECTS = {
@@ -438,15 +641,28 @@ WORLD_OBJECTS = {
 # ====== 世界生成參數 ======
 
 WORLD_CONFIG = {
-    "initial_objects": 200,  # 初始物件數量（減少以支持動態生成）
     "max_objects": 1000,  # 增加最大物件數量支持無限世界
     "spawn_interval": 0.5,  # 生成間隔（稍微放慢以避免過度生成）
     "safe_zone_radius": 60,  # 玩家周圍安全區域
-    "river_spawn_limit": 8,  # 增加河流數量限制
+    "river_chunk_chance": 0.12,  # 每個區塊生成河流的機率（河流很稀有）
     "permanent_objects_generated": False,  # 是否已生成永久物件
     "infinite_world": True,  # 🔥 啟用無限世界系統
-    "cleanup_distance": 2000,  # 清理距離玩家超過此距離的物件
-    "min_nearby_objects": 30,  # 玩家周圍最少物件數量
+    "world_seed": None,  # 世界種子（None = 每次隨機），相同種子生成相同世界
+    # 🔥 區塊串流設定
+    "chunk_size": 512,  # 區塊邊長（像素）
+    "objects_per_chunk": 6,  # 每個區塊生成的物件數量
+    "object_spacing": 40,  # 生成物件之間的最小間距（泊松圓盤取樣）
+    "active_chunk_radius": 2,  # 玩家周圍載入的區塊半徑（2 = 5x5 個區塊）
+    "chunk_eviction_budget": 2,  # 每幀最多卸載的區塊數量
+    "spatial_cell_size": 128,  # 空間雜湊格子大小（像素）
+    "compaction_threshold": 0.25,  # 物件容器空位比例超過此值才壓縮
+    # 區域檔 - 卸載區塊的玩家變化寫到磁碟，不常駐記憶體
+    "region_store": True,  # 是否啟用區域檔（無頭模擬一律使用記憶體）
+    "region_dir": "saves/regions",  # 區域檔暫存資料夾，每個世界一個子資料夾
+    "region_size": 32,  # 每個區域檔包含 32x32 個區塊
+    "region_flush_interval": 2.0,  # 待寫記錄最多累積幾秒再批次寫入
+    "region_batch_size": 64,  # 待寫記錄達到此數量時立即寫入
+    "region_compaction_bytes": 65536,  # 空洞超過此大小且多於有效資料時重寫區域檔
 }
 
 # ====== 時間系統配置 ======
@@ -512,6 +728,14 @@ UI_CONFIG = {
     "message_duration": 3.0,  # 訊息顯示時間
     "max_messages": 5,  # 最大訊息數量
     "inventory_size": 20,  # 物品欄大小
+    "text_cache_size": 512,  # 文字表面快取上限（LRU 淘汰）
+    # 字形圖集預先渲染的字元：數字、標點與 HUD 固定的中文詞彙
+    "glyph_atlas_charset": (
+        "0123456789 :/%.,-+×()"
+        "生命值飢餓度口渴度體力值精神值"
+        "第天白夜晚剩餘"
+        "木材石頭食物鐵礦錠"
+    ),
 }
 
 # ====== 音效配置 ======
@@ -8,14 +8,15 @@ Survival Realm - 玩家角色系統
 """
 
 import pygame
-import time
 import math
 import random
 from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING
+from operator import attrgetter
+from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from ..core.config import PLAYER_CONFIG, SURVIVAL_STATS, TOOL_EFFICIENCY, COLORS
 from ..systems.inventory import Inventory, Item, ItemType, item_database
+from ..systems.game_clock import game_clock
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -100,6 +101,30 @@ class SurvivalStats:
 class Player:
     """玩家角色類 - 處理玩家的所有行為和狀態"""
 
+    # 快照記錄的可變欄位（位置、移動、冷卻、模式與裝備）
+    SNAPSHOT_FIELDS = (
+        "x",
+        "y",
+        "velocity_x",
+        "velocity_y",
+        "is_moving",
+        "is_sprinting",
+        "has_moved_this_turn",
+        "previous_position",
+        "last_interaction",
+        "last_attack",
+        "crafting_mode",
+        "smelting_mode",
+        "equipped_tool",
+        "equipped_weapon",
+        "equipped_armor",
+        "attack_damage",
+        "defense",
+    )
+    STATS_FIELDS = ("health", "hunger", "thirst", "energy", "sanity")
+    _snapshot_getter = attrgetter(*SNAPSHOT_FIELDS)
+    _stats_getter = attrgetter(*STATS_FIELDS)
+
     def __init__(self, x: float, y: float) -> None:
         """
         初始化玩家角色
@@ -135,7 +160,6 @@ class Player:
 
         # 互動設定
         self.interaction_range = PLAYER_CONFIG["interaction_range"]
-        self.last_interaction = 0
         self.interaction_cooldown = PLAYER_CONFIG["interaction_cooldown"]
 
         # 裝備系統
@@ -151,8 +175,18 @@ class Player:
         self.attack_damage = 1  # 基礎攻擊力
         self.defense = 0  # 防禦力
         self.attack_range = PLAYER_CONFIG["attack_range"]
-        self.last_attack = 0
         self.attack_cooldown = PLAYER_CONFIG["attack_cooldown"]
+        self.reset_cooldowns()
+
+    def reset_cooldowns(self) -> None:
+        """
+        重設互動與攻擊冷卻
+
+        遊戲時鐘每局從 0 開始，上次動作時間設為負的冷卻時間，
+        新遊戲或讀檔後的第一次互動與攻擊不會被冷卻擋下
+        """
+        self.last_interaction = -self.interaction_cooldown
+        self.last_attack = -self.attack_cooldown
 
     def _add_starter_items(self) -> None:
         """
@@ -316,7 +350,7 @@ class Player:
         Returns:
             互動結果訊息或字典（洞穴入口的情況）
         """
-        current_time = time.time()
+        current_time = game_clock.now()
         if current_time - self.last_interaction < self.interaction_cooldown:
             return None
 
@@ -538,7 +572,7 @@ class Player:
         Returns:
             Optional[str]: 攻擊結果訊息
         """
-        current_time = time.time()
+        current_time = game_clock.now()
 
         # 檢查攻擊冷卻
         if current_time - self.last_attack < self.attack_cooldown:
@@ -943,6 +977,80 @@ class Player:
                 3,
             )
 
+    def snapshot(self) -> tuple:
+        """
+        取得玩家狀態的快照
+
+        Returns:
+            tuple: (玩家欄位, 生存數值, 物品欄)
+        """
+        return (
+            self._snapshot_getter(self),
+            self._stats_getter(self.survival_stats),
+            self.inventory.snapshot(),
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的玩家狀態
+
+        Args:
+            snapshot (tuple): 玩家快照
+        """
+        fields, stats, inventory = snapshot
+        for name, value in zip(self.SNAPSHOT_FIELDS, fields):
+            setattr(self, name, value)
+        for name, value in zip(self.STATS_FIELDS, stats):
+            setattr(self.survival_stats, name, value)
+        self.inventory.restore(inventory)
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        匯出需要存檔的玩家狀態（只包含內建型別）
+
+        Returns:
+            Dict[str, Any]: 位置、生存數值、物品欄與裝備
+        """
+        equipment = (self.equipped_tool, self.equipped_weapon, self.equipped_armor)
+        return {
+            "position": (self.x, self.y),
+            "stats": self._stats_getter(self.survival_stats),
+            "inventory": [
+                slot and (slot.item.id, slot.quantity) for slot in self.inventory.slots
+            ],
+            "equipment": tuple(item and item.id for item in equipment),
+            "combat": (self.attack_damage, self.defense),
+        }
+
+    def import_state(self, data: Dict[str, Any]) -> None:
+        """
+        載入 export_state 匯出的玩家狀態（物品以編號向物品資料庫查詢）
+
+        Args:
+            data (Dict[str, Any]): 玩家存檔資料
+        """
+        self.x, self.y = data["position"]
+        self.previous_position = (self.x, self.y)
+        for name, value in zip(self.STATS_FIELDS, data["stats"]):
+            setattr(self.survival_stats, name, value)
+
+        slots = []
+        for entry in data["inventory"]:
+            item = entry and item_database.get_item(entry[0])
+            slots.append((item, entry[1]) if item else None)
+        slots.extend([None] * (self.inventory.size - len(slots)))
+        self.inventory.restore(slots[: self.inventory.size])
+
+        self.equipped_tool, self.equipped_weapon, self.equipped_armor = (
+            item_id and item_database.get_item(item_id) for item_id in data["equipment"]
+        )
+        self.attack_damage, self.defense = data["combat"]
+        self.reset_cooldowns()
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
     def get_world_center(self) -> tuple:
         """
         獲取玩家在世界中的中心座標
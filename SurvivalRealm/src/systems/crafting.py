@@ -0,0 +1,251 @@
+"""
+Survival Realm - 配方系統
+把設定檔中的製作與燒製配方編譯成單一的配方註冊表，並追蹤哪些配方可以製作
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+配方系統的核心概念：
+1. ITEM_RECIPES、SMELTING_RECIPES 與 CRAFTING_CONFIG 是唯一的配方來源，遊戲邏輯與 UI 都從註冊表讀取
+2. 每個配方在啟動時編譯成不可變的 Recipe，名稱與描述直接取自物品資料庫
+3. 反向索引記錄「材料 -> 用到它的配方」，材料數量改變時只需要重算相關的配方
+4. 每個物品欄有一張可製作表，物品欄版本沒變時直接回傳快取結果
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from ..core.config import CRAFTING_CONFIG, ITEM_RECIPES, SMELTING_RECIPES
+from .inventory import Inventory, item_database
+
+
+@dataclass(frozen=True, eq=False)
+class Recipe:
+    """編譯後的配方"""
+
+    item_id: str  # 產出物品ID
+    name: str  # 產出物品顯示名稱
+    description: str  # 產出物品描述
+    materials: Tuple[Tuple[str, int], ...]  # (材料ID, 數量)
+    fuels: Tuple[str, ...] = ()  # 燒製用燃料，擇一消耗 1 個
+    requires_workbench: bool = False  # 是否需要靠近工作台
+    category: str = ""  # 製作介面分類
+
+
+class CraftabilityTable:
+    """單一物品欄的可製作表 - 只重算材料數量有變化的配方"""
+
+    def __init__(self, registry: "RecipeRegistry", inventory: Inventory) -> None:
+        """
+        初始化可製作表
+
+        Args:
+            registry (RecipeRegistry): 配方註冊表
+            inventory (Inventory): 追蹤的物品欄
+        """
+        self.registry = registry
+        self.inventory = inventory
+        self._version: Optional[int] = None
+        self._counts: Dict[str, int] = {}
+        self._craftable: Dict[Recipe, bool] = {}
+        self.recomputed = 0  # 累計重算的配方次數
+
+    def refresh(self) -> None:
+        """物品欄改變後更新材料數量，並重算受影響的配方"""
+        inventory = self.inventory
+        if inventory.version == self._version:
+            return
+        self._version = inventory.version
+
+        counts = self._counts
+        touched = set()
+        for material in self.registry.materials:
+            count = inventory.get_item_count(material)
+            if counts.get(material) != count:
+                counts[material] = count
+                touched.update(self.registry.recipes_using(material))
+
+        for recipe in touched:
+            self._craftable[recipe] = self._evaluate(recipe)
+        self.recomputed += len(touched)
+
+    def _evaluate(self, recipe: Recipe) -> bool:
+        """以快取的材料數量判斷配方是否可以製作"""
+        counts = self._counts
+        if not all(counts[material] >= amount for material, amount in recipe.materials):
+            return False
+        return not recipe.fuels or any(counts[fuel] >= 1 for fuel in recipe.fuels)
+
+    def can_craft(self, recipe: Recipe) -> bool:
+        """
+        檢查材料（與燃料）是否足夠
+
+        Args:
+            recipe (Recipe): 配方
+
+        Returns:
+            bool: 是否可以製作
+        """
+        self.refresh()
+        return self._craftable[recipe]
+
+    def get_count(self, material: str) -> int:
+        """
+        取得材料的持有數量
+
+        Args:
+            material (str): 材料ID
+
+        Returns:
+            int: 持有數量
+        """
+        self.refresh()
+        count = self._counts.get(material)
+        return self.inventory.get_item_count(material) if count is None else count
+
+    def get_missing(self, recipe: Recipe) -> List[Tuple[str, int, int]]:
+        """
+        取得不足的材料
+
+        Args:
+            recipe (Recipe): 配方
+
+        Returns:
+            List[Tuple[str, int, int]]: (材料ID, 需要數量, 持有數量)
+        """
+        self.refresh()
+        counts = self._counts
+        return [
+            (material, amount, counts[material])
+            for material, amount in recipe.materials
+            if counts[material] < amount
+        ]
+
+    def pick_fuel(self, recipe: Recipe) -> Optional[str]:
+        """
+        選擇燒製要消耗的燃料（依設定順序取第一個持有的）
+
+        Args:
+            recipe (Recipe): 燒製配方
+
+        Returns:
+            Optional[str]: 燃料ID，沒有燃料時為 None
+        """
+        self.refresh()
+        for fuel in recipe.fuels:
+            if self._counts[fuel] >= 1:
+                return fuel
+        return None
+
+
+class RecipeRegistry:
+    """配方註冊表 - 編譯後的製作與燒製配方、反向索引與可製作表"""
+
+    def __init__(self) -> None:
+        """編譯設定檔中的所有配方"""
+        basic_recipes = set(CRAFTING_CONFIG["basic_recipes"])
+        categories = {
+            item_id: category
+            for category, item_ids in CRAFTING_CONFIG["menu"].items()
+            for item_id in item_ids
+        }
+
+        self.recipes: Dict[str, Recipe] = {
+            item_id: self._compile(
+                item_id,
+                tuple(materials.items()),
+                requires_workbench=item_id not in basic_recipes,
+                category=categories.get(item_id, ""),
+            )
+            for item_id, materials in ITEM_RECIPES.items()
+        }
+        self.smelting_recipes: Dict[str, Recipe] = {
+            item_id: self._compile(
+                item_id, ((recipe["material"], 1),), fuels=tuple(recipe["fuel"])
+            )
+            for item_id, recipe in SMELTING_RECIPES.items()
+        }
+
+        # 介面順序（數字鍵從 1 開始依序對應）
+        self.categories: List[Tuple[str, List[Recipe]]] = [
+            (category, [self.recipes[item_id] for item_id in item_ids])
+            for category, item_ids in CRAFTING_CONFIG["menu"].items()
+        ]
+        self.menu: List[Recipe] = [
+            recipe for _, recipes in self.categories for recipe in recipes
+        ]
+        self.smelting_menu: List[Recipe] = [
+            self.smelting_recipes[item_id]
+            for item_id in CRAFTING_CONFIG["smelting_menu"]
+        ]
+
+        # 反向索引: 材料或燃料 -> 用到它的配方
+        by_material: Dict[str, List[Recipe]] = {}
+        for recipe in (*self.recipes.values(), *self.smelting_recipes.values()):
+            for material, _ in recipe.materials:
+                by_material.setdefault(material, []).append(recipe)
+            for fuel in recipe.fuels:
+                by_material.setdefault(fuel, []).append(recipe)
+        self._by_material = {
+            material: tuple(recipes) for material, recipes in by_material.items()
+        }
+        self.materials: Tuple[str, ...] = tuple(self._by_material)
+
+        self._tables: "WeakKeyDictionary[Inventory, CraftabilityTable]" = (
+            WeakKeyDictionary()
+        )
+
+    def _compile(
+        self, item_id: str, materials: Tuple[Tuple[str, int], ...], **kwargs
+    ) -> Recipe:
+        """建立配方，名稱與描述取自物品資料庫"""
+        item = item_database.get_item(item_id)
+        return Recipe(
+            item_id=item_id,
+            name=item.name if item else item_id,
+            description=item.description if item else "",
+            materials=materials,
+            **kwargs,
+        )
+
+    def get_recipe(self, item_id: str) -> Optional[Recipe]:
+        """取得製作配方"""
+        return self.recipes.get(item_id)
+
+    def get_smelting_recipe(self, item_id: str) -> Optional[Recipe]:
+        """取得燒製配方"""
+        return self.smelting_recipes.get(item_id)
+
+    def recipes_using(self, material: str) -> Tuple[Recipe, ...]:
+        """
+        查詢用到指定材料（或燃料）的配方
+
+        Args:
+            material (str): 材料ID
+
+        Returns:
+            Tuple[Recipe, ...]: 相關配方
+        """
+        return self._by_material.get(material, ())
+
+    def get_table(self, inventory: Inventory) -> CraftabilityTable:
+        """
+        取得物品欄的可製作表（每個物品欄共用一張）
+
+        Args:
+            inventory (Inventory): 物品欄
+
+        Returns:
+            CraftabilityTable: 可製作表
+        """
+        table = self._tables.get(inventory)
+        if table is None:
+            table = CraftabilityTable(self, inventory)
+            self._tables[inventory] = table
+        return table
+
+
+# 全域配方註冊表實例
+recipe_registry = RecipeRegistry()
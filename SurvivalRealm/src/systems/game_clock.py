@@ -0,0 +1,47 @@
+"""
+Survival Realm - 遊戲時鐘
+所有冷卻時間與計時都以遊戲時鐘為準，遊戲時間只在 Game.update 時前進
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+遊戲時鐘的核心概念：
+1. 一般遊玩時每幀前進實際經過的時間，行為與現實時間相同
+2. 無頭模擬時每幀前進固定的模擬時間，幾小時的遊戲時間幾秒就能跑完
+3. 暫停時不會前進，冷卻時間不會在暫停期間偷偷結束
+"""
+
+
+class GameClock:
+    """遊戲時鐘 - 取代 time.time() 的遊戲內計時來源"""
+
+    def __init__(self) -> None:
+        """初始化遊戲時鐘"""
+        self.elapsed = 0.0  # 遊戲開始後經過的遊戲時間（秒）
+
+    def advance(self, delta_time: float) -> None:
+        """
+        讓遊戲時間前進
+
+        Args:
+            delta_time (float): 前進的時間（秒）
+        """
+        self.elapsed += delta_time
+
+    def now(self) -> float:
+        """
+        取得目前的遊戲時間
+
+        Returns:
+            float: 遊戲時間（秒）
+        """
+        return self.elapsed
+
+    def reset(self) -> None:
+        """重設遊戲時鐘"""
+        self.elapsed = 0.0
+
+
+# 創建全域遊戲時鐘實例
+game_clock = GameClock()
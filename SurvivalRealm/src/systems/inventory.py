@@ -7,8 +7,10 @@ Survival Realm - 物品系統
 版本: 3.1.0 (重構版本)
 """
 
+import bisect
+import heapq
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..core.config import ItemType
 
 
@@ -99,6 +101,42 @@ class Inventory:
         """
         self.size = size
         self.slots: List[Optional[ItemStack]] = [None] * size
+        self.version = 0  # 內容每次改變就遞增，讓 UI 判斷是否需要重畫
+
+        # 索引 - 數量查詢與找空格都不必掃描整個物品欄
+        self._counts: Dict[str, int] = {}  # 物品ID -> 總數量
+        self._item_slots: Dict[str, List[int]] = {}  # 物品ID -> 由小到大的槽位
+        self._free_slots: List[int] = list(range(size))  # 空槽位（最小堆積）
+
+    def _rebuild_index(self) -> None:
+        """依照目前的槽位內容重建數量索引與空槽位列表"""
+        self._counts = {}
+        self._item_slots = {}
+        self._free_slots = []
+        for i, slot in enumerate(self.slots):
+            if slot is None:
+                self._free_slots.append(i)
+            else:
+                item_id = slot.item.id
+                self._counts[item_id] = self._counts.get(item_id, 0) + slot.quantity
+                self._item_slots.setdefault(item_id, []).append(i)
+
+    def _release_slot(self, slot_index: int, item_id: str) -> None:
+        """把清空的槽位從物品索引移到空槽位列表"""
+        self.slots[slot_index] = None
+        indices = self._item_slots[item_id]
+        indices.remove(slot_index)
+        if not indices:
+            del self._item_slots[item_id]
+        heapq.heappush(self._free_slots, slot_index)
+
+    def _adjust_count(self, item_id: str, delta: int) -> None:
+        """更新物品總數量，歸零時移除"""
+        count = self._counts.get(item_id, 0) + delta
+        if count > 0:
+            self._counts[item_id] = count
+        else:
+            self._counts.pop(item_id, None)
 
     def add_item(self, item: Item, quantity: int = 1) -> int:
         """
@@ -114,19 +152,28 @@ class Inventory:
         remaining = quantity
 
         # 步驟1: 先嘗試疊加到現有物品堆
-        for slot in self.slots:
-            if slot and slot.item.can_stack_with(item) and remaining > 0:
-                added = slot.add(remaining)
-                remaining -= added
-
-        # 步驟2: 如果還有剩餘，尋找空格放置
-        for i, slot in enumerate(self.slots):
-            if slot is None and remaining > 0:
+        for i in self._item_slots.get(item.id, ()):
+            if remaining <= 0:
+                break
+            slot = self.slots[i]
+            if slot.item.can_stack_with(item):
+                remaining -= slot.add(remaining)
+
+        # 步驟2: 如果還有剩餘，依序放到最前面的空格
+        if remaining > 0 and self._free_slots:
+            indices = self._item_slots.setdefault(item.id, [])
+            while remaining > 0 and self._free_slots:
+                i = heapq.heappop(self._free_slots)
                 add_amount = min(remaining, item.stack_size)
                 self.slots[i] = ItemStack(item, add_amount)
+                bisect.insort(indices, i)
                 remaining -= add_amount
 
-        return quantity - remaining
+        added = quantity - remaining
+        if added > 0:
+            self._adjust_count(item.id, added)
+            self.version += 1
+        return added
 
     def remove_item(self, item_id: str, quantity: int = 1) -> int:
         """
@@ -141,16 +188,20 @@ class Inventory:
         """
         removed = 0
 
-        for i, slot in enumerate(self.slots):
-            if slot and slot.item.id == item_id and removed < quantity:
-                need_remove = quantity - removed
-                actual_remove = slot.remove(need_remove)
-                removed += actual_remove
+        # 複製索引列表，清空槽位時會修改原列表
+        for i in list(self._item_slots.get(item_id, ())):
+            if removed >= quantity:
+                break
+            slot = self.slots[i]
+            removed += slot.remove(quantity - removed)
 
-                # 如果物品堆空了，清空槽位
-                if slot.is_empty():
-                    self.slots[i] = None
+            # 如果物品堆空了，清空槽位
+            if slot.is_empty():
+                self._release_slot(i, item_id)
 
+        if removed:
+            self._adjust_count(item_id, -removed)
+            self.version += 1
         return removed
 
     def has_item(self, item_id: str, quantity: int = 1) -> bool:
@@ -164,8 +215,7 @@ class Inventory:
         Returns:
             bool: 是否有足夠數量
         """
-        total = self.get_item_count(item_id)
-        return total >= quantity
+        return self._counts.get(item_id, 0) >= quantity
 
     def get_item_count(self, item_id: str) -> int:
         """
@@ -177,17 +227,69 @@ class Inventory:
         Returns:
             int: 物品總數量
         """
-        return sum(
-            slot.quantity for slot in self.slots if slot and slot.item.id == item_id
-        )
+        return self._counts.get(item_id, 0)
+
+    def get_total_count(self) -> int:
+        """獲取所有物品的總數量"""
+        return sum(self._counts.values())
 
     def get_empty_slots(self) -> int:
         """獲取空槽位數量"""
-        return sum(1 for slot in self.slots if slot is None)
+        return len(self._free_slots)
 
     def is_full(self) -> bool:
         """檢查物品欄是否已滿"""
-        return self.get_empty_slots() == 0
+        return not self._free_slots
+
+    def has_items(self, materials: Iterable[Tuple[str, int]]) -> bool:
+        """
+        檢查是否同時擁有多種物品（同一物品出現多次時數量會合計）
+
+        Args:
+            materials (Iterable[Tuple[str, int]]): (物品ID, 數量) 列表
+
+        Returns:
+            bool: 是否全部足夠
+        """
+        needed: Dict[str, int] = {}
+        for item_id, amount in materials:
+            needed[item_id] = needed.get(item_id, 0) + amount
+        counts = self._counts
+        return all(
+            counts.get(item_id, 0) >= amount for item_id, amount in needed.items()
+        )
+
+    def transaction(
+        self,
+        consume: Iterable[Tuple[str, int]] = (),
+        produce: Iterable[Tuple[Item, int]] = (),
+    ) -> bool:
+        """
+        原子性地消耗材料並加入產物 - 全部成功，或物品欄完全不變
+
+        Args:
+            consume (Iterable[Tuple[str, int]]): 要消耗的 (物品ID, 數量)
+            produce (Iterable[Tuple[Item, int]]): 要加入的 (物品, 數量)
+
+        Returns:
+            bool: 是否成功；材料不足或產物放不下時回傳 False
+        """
+        consume = tuple(consume)
+        produce = tuple(produce)
+        if not self.has_items(consume):
+            return False
+
+        snapshot = self.snapshot()
+        version = self.version
+        for item_id, amount in consume:
+            self.remove_item(item_id, amount)
+        for item, amount in produce:
+            if self.add_item(item, amount) < amount:
+                # 產物放不下，回到交易前的內容與版本
+                self.restore(snapshot)
+                self.version = version
+                return False
+        return True
 
     def get_item_by_slot(self, slot_index: int) -> Optional[ItemStack]:
         """
@@ -214,7 +316,11 @@ class Inventory:
             bool: 是否成功清空
         """
         if 0 <= slot_index < self.size:
-            self.slots[slot_index] = None
+            slot = self.slots[slot_index]
+            if slot is not None:
+                self._release_slot(slot_index, slot.item.id)
+                self._adjust_count(slot.item.id, -slot.quantity)
+                self.version += 1
             return True
         return False
 
@@ -234,6 +340,26 @@ class Inventory:
                 result.append((i, slot))
         return result
 
+    def snapshot(self) -> Tuple[Optional[Tuple[Item, int]], ...]:
+        """
+        取得物品欄的快照（物品定義共用，只記錄數量）
+
+        Returns:
+            Tuple: 每個槽位的 (物品, 數量) 或 None
+        """
+        return tuple(slot and (slot.item, slot.quantity) for slot in self.slots)
+
+    def restore(self, snapshot: Tuple[Optional[Tuple[Item, int]], ...]) -> None:
+        """
+        還原 snapshot 取得的物品欄內容
+
+        Args:
+            snapshot (Tuple): 物品欄快照
+        """
+        self.slots = [entry and ItemStack(*entry) for entry in snapshot]
+        self._rebuild_index()
+        self.version += 1
+
 
 class ItemDatabase:
     """物品資料庫 - 管理所有遊戲物品的定義"""
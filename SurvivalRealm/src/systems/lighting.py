@@ -0,0 +1,153 @@
+"""
+Survival Realm - 光照系統
+預先繪製光暈遮罩並重複使用黑暗遮罩，洞穴每幀不需要建立新的 Surface
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+光照系統的核心概念：
+1. 黑暗遮罩每種解析度只建立一次，每幀只調整透明度
+2. 光暈遮罩依 (種類, 半徑, 顏色, 強度) 分組快取
+3. 快取數量有上限，超過時淘汰最久沒用到的遮罩
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+import pygame
+
+from ..core.config import CAVE_CONFIG
+
+Color = Tuple[int, ...]
+
+
+class LightingCache:
+    """光照遮罩快取 - 黑暗遮罩與光暈遮罩的共用來源"""
+
+    def __init__(self, max_masks: int = 64, alpha_step: int = 4) -> None:
+        """
+        初始化光照快取
+
+        Args:
+            max_masks (int): 光暈遮罩快取上限
+            alpha_step (int): 透明度分組間距，時間變化的光暈不會產生過多遮罩
+        """
+        self.max_masks = max_masks
+        self.alpha_step = alpha_step
+        self._darkness: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._masks: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+
+    def _quantize_alpha(self, alpha: float) -> int:
+        """把透明度對齊到分組間距"""
+        step = self.alpha_step
+        return max(0, min(255, int(round(alpha / step)) * step))
+
+    def _cached(self, key: Hashable, builder) -> pygame.Surface:
+        """從 LRU 快取取得遮罩，沒有時建立"""
+        mask = self._masks.get(key)
+        if mask is not None:
+            self._masks.move_to_end(key)
+            return mask
+
+        mask = builder()
+        self._masks[key] = mask
+        if len(self._masks) > self.max_masks:
+            self._masks.popitem(last=False)  # 淘汰最久沒用到的遮罩
+        return mask
+
+    def get_darkness_overlay(self, size: Tuple[int, int], alpha: int) -> pygame.Surface:
+        """
+        取得指定解析度的黑暗遮罩
+
+        Args:
+            size (Tuple[int, int]): 螢幕尺寸
+            alpha (int): 黑暗程度 (0-255)
+
+        Returns:
+            pygame.Surface: 已設定透明度的全黑遮罩
+        """
+        overlay = self._darkness.get(size)
+        if overlay is None:
+            overlay = pygame.Surface(size)
+            overlay.fill((0, 0, 0))
+            self._darkness[size] = overlay
+        overlay.set_alpha(alpha)
+        return overlay
+
+    def get_light_mask(
+        self, radius: int, intensity: int, color: Color = (255, 255, 150)
+    ) -> pygame.Surface:
+        """
+        取得由外而內的同心圓漸變光暈
+
+        Args:
+            radius (int): 光暈半徑
+            intensity (int): 最外圈的透明度
+            color (Color): 光暈顏色
+
+        Returns:
+            pygame.Surface: 光暈遮罩，大小為 (radius*2, radius*2)
+        """
+        radius = int(radius)
+        intensity = int(intensity)
+
+        def build() -> pygame.Surface:
+            mask = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            # 從中心到邊緣的漸變光暈
+            for r in range(radius, 0, -5):
+                alpha = int(intensity * (r / radius))
+                pygame.draw.circle(mask, (*color, alpha), (radius, radius), r)
+            return mask
+
+        return self._cached(("light", radius, color, intensity), build)
+
+    def get_glow_circle(self, radius: int, color: Color, alpha: int) -> pygame.Surface:
+        """
+        取得單色半透明圓形光暈
+
+        Args:
+            radius (int): 半徑
+            color (Color): RGB 顏色
+            alpha (int): 透明度
+
+        Returns:
+            pygame.Surface: 光暈遮罩，大小為 (radius*2, radius*2)
+        """
+        radius = int(radius)
+        alpha = self._quantize_alpha(alpha)
+
+        def build() -> pygame.Surface:
+            mask = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(mask, (*color[:3], alpha), (radius, radius), radius)
+            return mask
+
+        return self._cached(("circle", radius, tuple(color[:3]), alpha), build)
+
+    def get_glow_rect(self, size: Tuple[int, int], color: Color) -> pygame.Surface:
+        """
+        取得單色半透明矩形光暈
+
+        Args:
+            size (Tuple[int, int]): 尺寸
+            color (Color): RGBA 顏色
+
+        Returns:
+            pygame.Surface: 光暈遮罩
+        """
+
+        def build() -> pygame.Surface:
+            mask = pygame.Surface(size, pygame.SRCALPHA)
+            mask.fill(color)
+            return mask
+
+        return self._cached(("rect", tuple(size), tuple(color)), build)
+
+    def clear(self) -> None:
+        """清空所有快取"""
+        self._darkness.clear()
+        self._masks.clear()
+
+
+# 創建全域光照快取實例
+lighting = LightingCache(CAVE_CONFIG["light_mask_cache_size"])
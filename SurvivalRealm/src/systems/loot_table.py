@@ -0,0 +1,383 @@
+"""
+Survival Realm - 掉落表系統
+把 LOOT_TABLES 的掉落設定編譯成可快速抽取的掉落表
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+掉落表的核心概念：
+1. 每個掉落組獨立判定是否掉落（伯努利試驗）
+2. 掉落組內以 Walker 別名表挑選物品，每次挑選 O(1)
+3. 批次抽取時以幾何分佈跳過沒掉落的次數，成本只與掉落次數有關
+4. 平衡模擬只需要總數，以二項分佈直接抽出每種 (物品, 數量) 的次數，與模擬次數無關
+5. 同一個 (掉落表, 深度, 數量倍數) 只編譯一次
+"""
+
+import math
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.config import LOOT_TABLES
+
+Drop = Tuple[str, int]
+
+
+def binomial(trials: int, chance: float, rng=random) -> int:
+    """
+    抽取二項分佈 B(trials, chance) 的成功次數
+
+    期望次數小時以幾何分佈逐次跳過，期望次數大時使用 Hörmann 的 BTRS 拒絕取樣，
+    兩者都與 trials 大小無關
+
+    Args:
+        trials (int): 試驗次數
+        chance (float): 每次成功的機率
+        rng: 亂數產生器
+
+    Returns:
+        int: 成功次數
+    """
+    if trials <= 0 or chance <= 0.0:
+        return 0
+    if chance >= 1.0:
+        return trials
+    if chance > 0.5:
+        return trials - binomial(trials, 1.0 - chance, rng)
+
+    random_value = rng.random
+    if trials * chance < 10.0:
+        log_miss = math.log(1.0 - chance)
+        hits = index = 0
+        while True:
+            index += int(math.log(1.0 - random_value()) / log_miss) + 1
+            if index > trials:
+                return hits
+            hits += 1
+
+    spq = math.sqrt(trials * chance * (1.0 - chance))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * chance
+    c = trials * chance + 0.5
+    v_r = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(chance / (1.0 - chance))
+    mode = int((trials + 1) * chance)
+    h = math.lgamma(mode + 1) + math.lgamma(trials - mode + 1)
+    while True:
+        u = random_value() - 0.5
+        us = 0.5 - abs(u)
+        k = int(math.floor((2.0 * a / us + b) * u + c))
+        if k < 0 or k > trials:
+            continue
+        v = random_value()
+        if us >= 0.07 and v <= v_r:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if v > 0.0 and math.log(v) <= (
+            h - math.lgamma(k + 1) - math.lgamma(trials - k + 1) + (k - mode) * lpq
+        ):
+            return k
+
+
+class AliasTable:
+    """Walker 別名表 - 依權重在 O(1) 時間內挑選一個項目"""
+
+    def __init__(self, items: Sequence[str], weights: Sequence[float]) -> None:
+        """
+        以 Vose 的方法建立別名表
+
+        Args:
+            items (Sequence[str]): 項目列表
+            weights (Sequence[float]): 對應的權重（不需要加總為1）
+        """
+        if not items or len(items) != len(weights):
+            raise ValueError("別名表需要相同數量的項目與權重")
+
+        count = len(items)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.items = list(items)
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # 剩下的項目因浮點誤差略小於1，視為必定選中自己
+
+    def pick(self, rng=random) -> str:
+        """
+        挑選一個項目（只需要一個亂數）
+
+        Args:
+            rng: 亂數產生器
+
+        Returns:
+            str: 挑選到的項目
+        """
+        value = rng.random() * len(self.items)
+        column = int(value)
+        if value - column < self.probability[column]:
+            return self.items[column]
+        return self.items[self.alias[column]]
+
+
+class LootGroup:
+    """掉落組 - 一次伯努利判定，成功時挑選一種物品與數量"""
+
+    def __init__(
+        self,
+        chance: float,
+        picker: AliasTable,
+        count_range: Tuple[int, int],
+        multiplier: float = 1.0,
+        min_count: int = 1,
+    ) -> None:
+        self.chance = max(0.0, min(1.0, chance))
+        self.picker = picker
+        self.min_amount, self.max_amount = count_range
+        self.multiplier = multiplier
+        self.min_count = min_count
+        self.outcomes = self._build_outcomes()
+
+    def _build_outcomes(self) -> List[Tuple[str, int, float]]:
+        """列出所有 (物品, 數量, 機率) 組合，供平衡模擬使用"""
+        picker = self.picker
+        count = len(picker.items)
+        item_chance: Dict[str, float] = {}
+        for column, item_id in enumerate(picker.items):
+            # 每一欄有 1/count 的機率被選中，再依 probability 決定是自己或別名
+            keep = picker.probability[column] / count
+            alias_id = picker.items[picker.alias[column]]
+            item_chance[item_id] = item_chance.get(item_id, 0.0) + keep
+            item_chance[alias_id] = item_chance.get(alias_id, 0.0) + 1 / count - keep
+
+        span = self.max_amount - self.min_amount + 1
+        amounts: Dict[int, int] = {}
+        for base in range(self.min_amount, self.max_amount + 1):
+            amount = base
+            if self.multiplier != 1.0:
+                amount = max(self.min_count, int(base * self.multiplier))
+            amounts[amount] = amounts.get(amount, 0) + 1
+
+        return [
+            (item_id, amount, chance * ways / span)
+            for item_id, chance in item_chance.items()
+            if chance > 0.0
+            for amount, ways in amounts.items()
+        ]
+
+    def roll_count(self, rng=random) -> int:
+        """抽取掉落數量"""
+        span = self.max_amount - self.min_amount + 1
+        amount = self.min_amount + int(rng.random() * span)
+        if self.multiplier != 1.0:
+            amount = max(self.min_count, int(amount * self.multiplier))
+        return amount
+
+    def successes(self, rolls: int, rng=random):
+        """
+        產生 rolls 次判定中成功的次數編號
+
+        以幾何分佈直接跳到下一次成功，成本與成功次數成正比
+
+        Args:
+            rolls (int): 判定次數
+            rng: 亂數產生器
+        """
+        if self.chance >= 1.0:
+            yield from range(rolls)
+            return
+        if self.chance <= 0.0:
+            return
+
+        log_miss = math.log(1.0 - self.chance)
+        index = -1
+        while True:
+            index += 1 + int(math.log(1.0 - rng.random()) / log_miss)
+            if index >= rolls:
+                return
+            yield index
+
+    def roll_totals(self, rolls: int, rng=random) -> Dict[Tuple[str, int], int]:
+        """
+        抽取 rolls 次判定後每種 (物品, 數量) 出現的次數
+
+        以條件二項分佈依序分配成功次數（多項分佈），成本只與組合數量有關
+
+        Args:
+            rolls (int): 判定次數
+            rng: 亂數產生器
+
+        Returns:
+            Dict[Tuple[str, int], int]: (物品ID, 數量) -> 出現次數
+        """
+        remaining = binomial(rolls, self.chance, rng)
+        remaining_chance = 1.0
+        hits: Dict[Tuple[str, int], int] = {}
+        for item_id, amount, chance in self.outcomes:
+            if remaining <= 0:
+                break
+            if chance >= remaining_chance:
+                hit = remaining
+            else:
+                hit = binomial(remaining, chance / remaining_chance, rng)
+            remaining_chance -= chance
+            if hit:
+                key = (item_id, amount)
+                hits[key] = hits.get(key, 0) + hit
+                remaining -= hit
+        return hits
+
+
+class LootTable:
+    """編譯後的掉落表"""
+
+    def __init__(self, name: str, groups: List[LootGroup]) -> None:
+        self.name = name
+        self.groups = groups
+
+    def roll(self, rng=random) -> List[Drop]:
+        """
+        抽取一次掉落
+
+        Args:
+            rng: 亂數產生器
+
+        Returns:
+            List[Drop]: (物品ID, 數量) 列表
+        """
+        drops = []
+        for group in self.groups:
+            if group.chance >= 1.0 or rng.random() < group.chance:
+                drops.append((group.picker.pick(rng), group.roll_count(rng)))
+        return drops
+
+    def roll_batch(self, rolls: int, rng=random) -> List[List[Drop]]:
+        """
+        抽取多次掉落，例如一次打開多個寶箱
+
+        Args:
+            rolls (int): 抽取次數
+            rng: 亂數產生器
+
+        Returns:
+            List[List[Drop]]: 每次抽取的掉落列表
+        """
+        results: List[List[Drop]] = [[] for _ in range(rolls)]
+        for group in self.groups:
+            pick, roll_count = group.picker.pick, group.roll_count
+            for index in group.successes(rolls, rng):
+                results[index].append((pick(rng), roll_count(rng)))
+        return results
+
+    def roll_totals(self, rolls: int, rng=random) -> Dict[str, int]:
+        """
+        模擬多次掉落並加總各物品數量，用於平衡測試
+
+        Args:
+            rolls (int): 模擬次數
+            rng: 亂數產生器
+
+        Returns:
+            Dict[str, int]: 物品ID -> 總數量
+        """
+        totals: Dict[str, int] = {}
+        for group in self.groups:
+            for (item_id, amount), hit in group.roll_totals(rolls, rng).items():
+                totals[item_id] = totals.get(item_id, 0) + amount * hit
+        return totals
+
+
+def _compile_group(
+    entry: Dict[str, Any], depth: int, multiplier: float
+) -> List[LootGroup]:
+    """把一個掉落組設定編譯成一或多個 LootGroup"""
+    if depth < entry.get("min_depth", 1):
+        return []
+
+    items = entry["items"]
+    if isinstance(items, dict):
+        weights = dict(items)
+    else:
+        weights = {}
+        for item_id in items:
+            weights[item_id] = weights.get(item_id, 0) + 1
+    for min_depth, extra_items in entry.get("items_by_depth", {}).items():
+        if depth >= min_depth:
+            for item_id in extra_items:
+                weights[item_id] = weights.get(item_id, 0) + 1
+
+    chance = entry.get("chance", 1.0) + entry.get("chance_per_depth", 0.0) * (depth - 1)
+    count_range = tuple(entry.get("count", (1, 1)))
+    if not entry.get("scale_count", False):
+        multiplier = 1.0
+    min_count = entry.get("min_count", 1)
+
+    if entry.get("each", False):
+        # 每種物品各自獨立判定
+        return [
+            LootGroup(
+                chance, AliasTable([item_id], [1]), count_range, multiplier, min_count
+            )
+            for item_id in weights
+        ]
+    picker = AliasTable(list(weights), list(weights.values()))
+    return [LootGroup(chance, picker, count_range, multiplier, min_count)]
+
+
+_compiled_tables: Dict[Tuple[str, int, float], LootTable] = {}
+
+
+def get_loot_table(name: str, depth: int = 1, multiplier: float = 1.0) -> LootTable:
+    """
+    取得編譯後的掉落表（同樣的參數只編譯一次）
+
+    Args:
+        name (str): LOOT_TABLES 中的掉落表名稱
+        depth (int): 深度，影響機率與可掉落的物品
+        multiplier (float): scale_count 掉落組的數量倍數
+
+    Returns:
+        LootTable: 掉落表
+    """
+    key = (name, depth, multiplier)
+    table = _compiled_tables.get(key)
+    if table is None:
+        groups: List[LootGroup] = []
+        for entry in LOOT_TABLES[name]:
+            groups.extend(_compile_group(entry, depth, multiplier))
+        table = LootTable(name, groups)
+        _compiled_tables[key] = table
+    return table
+
+
+def roll_loot(
+    name: str,
+    rng: Optional[random.Random] = None,
+    depth: int = 1,
+    multiplier: float = 1.0,
+) -> List[Drop]:
+    """
+    依掉落表抽取一次掉落
+
+    Args:
+        name (str): 掉落表名稱
+        rng (random.Random): 亂數產生器，預設使用全域 random
+        depth (int): 深度
+        multiplier (float): 數量倍數
+
+    Returns:
+        List[Drop]: (物品ID, 數量) 列表
+    """
+    return get_loot_table(name, depth, multiplier).roll(rng or random)
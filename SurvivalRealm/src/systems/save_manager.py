@@ -0,0 +1,276 @@
+"""
+Survival Realm - 存檔系統
+把玩家、世界變化、洞穴進度與時間寫成有版本的壓縮二進位存檔
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+存檔系統的核心概念：
+1. 世界由種子重新生成，存檔只保存種子與每個區塊被玩家改變的部分
+2. 存檔 = 固定長度的檔頭（識別碼、版本、CRC32、原始長度）+ zlib 壓縮的資料
+3. 資料只包含內建型別，讀檔時禁止還原任何類別，損壞或惡意的存檔不會執行程式碼
+4. 寫入先寫到暫存檔再原子性地取代舊檔，寫到一半當機也不會毀掉舊存檔
+5. 自動存檔在主執行緒只收集資料，編碼、壓縮與寫檔都在背景執行緒完成；
+   讀取成本高的資料（例如區域檔記錄）可以交給背景執行緒收集
+"""
+
+import io
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from ..core.config import SAVE_CONFIG
+
+SAVE_MAGIC = b"SRSV"
+SAVE_VERSION = 1
+
+# 檔頭: 識別碼、格式版本、壓縮前資料的 CRC32、壓縮前長度
+_HEADER = struct.Struct("<4sHII")
+
+# 存檔資料，或在背景執行緒呼叫、回傳存檔資料的函式
+SaveData = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+class SaveError(Exception):
+    """存檔格式錯誤、版本不支援或資料損壞"""
+
+
+class _SaveUnpickler(pickle.Unpickler):
+    """只允許內建資料型別的反序列化器"""
+
+    def find_class(self, module: str, name: str):
+        raise SaveError(f"存檔中不允許的型別: {module}.{name}")
+
+
+def load_builtins(raw: bytes) -> Any:
+    """
+    反序列化只包含內建型別的資料（存檔與區域檔共用）
+
+    Args:
+        raw (bytes): pickle 資料
+
+    Returns:
+        Any: 還原的資料
+
+    Raises:
+        SaveError: 資料包含類別或無法解析
+    """
+    try:
+        return _SaveUnpickler(io.BytesIO(raw)).load()
+    except SaveError:
+        raise
+    except Exception as e:
+        raise SaveError(f"存檔資料無法解析: {e}") from e
+
+
+def encode_save(data: Dict[str, Any], level: Optional[int] = None) -> bytes:
+    """
+    把存檔資料編碼成壓縮的二進位格式
+
+    Args:
+        data (Dict[str, Any]): 只包含內建型別的存檔資料
+        level (int): zlib 壓縮等級，預設使用 SAVE_CONFIG
+
+    Returns:
+        bytes: 完整的存檔內容（檔頭 + 壓縮資料）
+    """
+    if level is None:
+        level = SAVE_CONFIG["compression_level"]
+    raw = pickle.dumps(data, protocol=4)
+    header = _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(raw), len(raw))
+    return header + zlib.compress(raw, level)
+
+
+def decode_save(blob: bytes) -> Dict[str, Any]:
+    """
+    解碼存檔內容並驗證檔頭與校驗碼
+
+    Args:
+        blob (bytes): 存檔內容
+
+    Returns:
+        Dict[str, Any]: 存檔資料
+
+    Raises:
+        SaveError: 不是存檔、版本不支援或資料損壞
+    """
+    if len(blob) < _HEADER.size:
+        raise SaveError("存檔太短")
+    magic, version, checksum, length = _HEADER.unpack_from(blob)
+    if magic != SAVE_MAGIC:
+        raise SaveError("不是 Survival Realm 的存檔")
+    if version != SAVE_VERSION:
+        raise SaveError(f"不支援的存檔版本 {version}（目前版本 {SAVE_VERSION}）")
+
+    try:
+        raw = zlib.decompress(blob[_HEADER.size :])
+    except zlib.error as e:
+        raise SaveError(f"存檔解壓縮失敗: {e}") from e
+    if len(raw) != length or zlib.crc32(raw) != checksum:
+        raise SaveError("存檔校驗失敗，檔案可能已損壞")
+
+    data = load_builtins(raw)
+    if not isinstance(data, dict):
+        raise SaveError("存檔資料格式錯誤")
+    return data
+
+
+def write_atomic(path: str, blob: bytes) -> None:
+    """
+    原子性地寫入檔案（先寫暫存檔、同步到磁碟後再取代）
+
+    Args:
+        path (str): 目標路徑
+        blob (bytes): 檔案內容
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(blob)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class SaveManager:
+    """存檔管理器 - 同步存讀檔與背景自動存檔"""
+
+    def __init__(self, save_dir: Optional[str] = None) -> None:
+        """
+        初始化存檔管理器
+
+        Args:
+            save_dir (str): 存檔資料夾，預設使用 SAVE_CONFIG
+        """
+        self.save_dir = save_dir or SAVE_CONFIG["save_dir"]
+        self.autosave_enabled = True
+        self.autosave_interval = SAVE_CONFIG["autosave_interval"]
+        self.autosave_timer = 0.0
+        self.last_load_time = 0.0  # 上一次讀檔解碼耗時（秒）
+
+        # 背景寫檔 - 只保留最新一份待寫資料，寫檔慢時舊的自動存檔直接被取代
+        self._write_condition = threading.Condition()
+        self._pending: Optional[Tuple[str, SaveData]] = None
+        self._writing = False
+        self._writer_thread: Optional[threading.Thread] = None
+
+    def path_for(self, slot: str) -> str:
+        """取得存檔欄位對應的檔案路徑"""
+        return os.path.join(self.save_dir, slot + SAVE_CONFIG["extension"])
+
+    def has_save(self, slot: str) -> bool:
+        """檢查存檔欄位是否有存檔"""
+        return os.path.isfile(self.path_for(slot))
+
+    def save(self, data: Dict[str, Any], slot: str) -> str:
+        """
+        立即編碼並寫入存檔（會先等待背景寫檔完成）
+
+        Args:
+            data (Dict[str, Any]): 存檔資料
+            slot (str): 存檔欄位
+
+        Returns:
+            str: 存檔路徑
+        """
+        self.wait()
+        path = self.path_for(slot)
+        write_atomic(path, encode_save(data))
+        return path
+
+    def save_async(self, data: SaveData, slot: str) -> None:
+        """
+        在背景執行緒編碼並寫入存檔
+
+        Args:
+            data (SaveData): 存檔資料，交出後呼叫端不可再修改；
+                傳入函式時在背景執行緒呼叫以取得存檔資料
+            slot (str): 存檔欄位
+        """
+        with self._write_condition:
+            self._pending = (slot, data)
+            self._write_condition.notify_all()
+
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(
+                target=self._writer_worker, name="save-writer", daemon=True
+            )
+            self._writer_thread.start()
+
+    def _writer_worker(self) -> None:
+        """背景執行緒 - 編碼、壓縮並寫入最新的待寫資料"""
+        while True:
+            with self._write_condition:
+                while self._pending is None:
+                    self._write_condition.wait()
+                slot, data = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                start = time.perf_counter()
+                if callable(data):
+                    data = data()
+                blob = encode_save(data)
+                write_atomic(self.path_for(slot), blob)
+                elapsed = (time.perf_counter() - start) * 1000
+                print(
+                    f"💾 自動存檔完成: {slot}（{len(blob)} 位元組，{elapsed:.1f} ms）"
+                )
+            except Exception as e:
+                print(f"⚠️ 背景存檔失敗: {e}")
+
+            with self._write_condition:
+                self._writing = False
+                self._write_condition.notify_all()
+
+    def wait(self) -> None:
+        """等待背景寫檔全部完成"""
+        with self._write_condition:
+            while self._pending is not None or self._writing:
+                self._write_condition.wait()
+
+    def load(self, slot: str) -> Dict[str, Any]:
+        """
+        讀取並解碼存檔（會先等待背景寫檔完成）
+
+        Args:
+            slot (str): 存檔欄位
+
+        Returns:
+            Dict[str, Any]: 存檔資料
+
+        Raises:
+            FileNotFoundError: 存檔不存在
+            SaveError: 存檔損壞或版本不支援
+        """
+        self.wait()
+        start = time.perf_counter()
+        with open(self.path_for(slot), "rb") as file:
+            data = decode_save(file.read())
+        self.last_load_time = time.perf_counter() - start
+        return data
+
+    def update(self, delta_time: float) -> bool:
+        """
+        推進自動存檔計時器
+
+        Args:
+            delta_time (float): 幀時間（秒）
+
+        Returns:
+            bool: 是否到了自動存檔的時間
+        """
+        if not self.autosave_enabled:
+            return False
+        self.autosave_timer += delta_time
+        if self.autosave_timer < self.autosave_interval:
+            return False
+        self.autosave_timer = 0.0
+        return True
@@ -34,6 +34,23 @@ class TimeManager:
             self.game_time = 0
             self.current_day += 1
 
+    def snapshot(self) -> tuple:
+        """取得時間狀態的快照 (遊戲時間, 天數)"""
+        return (self.game_time, self.current_day)
+
+    def restore(self, snapshot: tuple) -> None:
+        """還原 snapshot 取得的時間狀態"""
+        self.game_time, self.current_day = snapshot
+
+    def export_state(self) -> dict:
+        """匯出需要存檔的時間狀態"""
+        return {"game_time": self.game_time, "current_day": self.current_day}
+
+    def import_state(self, data: dict) -> None:
+        """載入 export_state 匯出的時間狀態"""
+        self.game_time = data["game_time"]
+        self.current_day = data["current_day"]
+
     def get_time_of_day(self) -> TimeOfDay:
         """
         獲取當前時段
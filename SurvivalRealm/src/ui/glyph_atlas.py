@@ -0,0 +1,132 @@
+"""
+Survival Realm - 字形圖集
+把 HUD 常用的字元預先渲染到一張圖集，動態文字用一次 blits 拼出來
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+字形圖集的核心概念：
+1. 數字、標點與 HUD 固定的中文詞彙在載入字體時各渲染一次，排成一張白色圖集
+2. 每個字元記錄它在圖集中的矩形與前進寬度，拼字時只需要查表和累加位置
+3. 不同顏色各保留一份染色後的圖集，第一次用到某個顏色時才建立
+4. 整段文字一次交給 Surface.blits，不論數值多常變化，HUD 的成本都固定
+5. 文字中有圖集沒有的字元時回報失敗，由呼叫端改用一般的文字快取
+"""
+
+import pygame
+from typing import Dict, Optional, Tuple
+
+from ..core.config import UI_CONFIG
+
+# 圖集每列的最大寬度（像素）
+_ATLAS_ROW_WIDTH = 512
+_WHITE = (255, 255, 255)
+
+
+class GlyphAtlas:
+    """單一字體的字形圖集"""
+
+    def __init__(self, font: pygame.font.Font, charset: Optional[str] = None) -> None:
+        """
+        預先渲染字元並建立圖集
+
+        Args:
+            font (pygame.font.Font): 字體
+            charset (str): 要放進圖集的字元，預設使用 UI_CONFIG
+        """
+        self.font = font
+        self.height = font.get_height()
+        # 字元 -> (圖集中的矩形, 前進寬度)
+        self.glyphs: Dict[str, Tuple[pygame.Rect, int]] = {}
+        self._tinted: Dict[Tuple[int, ...], pygame.Surface] = {}
+        self.atlas = self._build(charset or UI_CONFIG["glyph_atlas_charset"])
+
+    def _build(self, charset: str) -> pygame.Surface:
+        """渲染字元並排進圖集，字體沒有的字元直接略過"""
+        rendered = []
+        for char in dict.fromkeys(charset):
+            metrics = self.font.metrics(char)
+            if not metrics or metrics[0] is None:
+                continue
+            rendered.append((char, self.font.render(char, True, _WHITE), metrics[0][4]))
+
+        # 依序排列，超過列寬就換行
+        positions = []
+        x = y = width = 0
+        for char, surface, advance in rendered:
+            if x and x + surface.get_width() > _ATLAS_ROW_WIDTH:
+                x = 0
+                y += self.height
+            positions.append((x, y))
+            x += surface.get_width()
+            width = max(width, x)
+
+        atlas = pygame.Surface((max(1, width), y + self.height), pygame.SRCALPHA)
+        for (char, surface, advance), (gx, gy) in zip(rendered, positions):
+            atlas.blit(surface, (gx, gy))
+            self.glyphs[char] = (
+                pygame.Rect(gx, gy, surface.get_width(), surface.get_height()),
+                advance,
+            )
+        self._tinted[_WHITE] = atlas
+        return atlas
+
+    def _get_tinted(self, color: Tuple[int, ...]) -> pygame.Surface:
+        """建立並保存指定顏色的染色圖集"""
+        atlas = self.atlas.copy()
+        atlas.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        self._tinted[color] = atlas
+        return atlas
+
+    def can_render(self, text: str) -> bool:
+        """檢查文字的每個字元是否都在圖集中"""
+        glyphs = self.glyphs
+        return all(char in glyphs for char in text)
+
+    def size(self, text: str) -> Tuple[int, int]:
+        """
+        計算文字的尺寸（只包含圖集中的字元）
+
+        Args:
+            text (str): 文字內容
+
+        Returns:
+            Tuple[int, int]: (寬度, 高度)
+        """
+        glyphs = self.glyphs
+        return sum(glyphs[char][1] for char in text if char in glyphs), self.height
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        text: str,
+        x: int,
+        y: int,
+        color: Tuple[int, ...],
+    ) -> bool:
+        """
+        用圖集拼出文字並一次繪製
+
+        Args:
+            surface (pygame.Surface): 繪製表面
+            text (str): 文字內容
+            x, y (int): 左上角位置
+            color (Tuple[int, ...]): 文字顏色
+
+        Returns:
+            bool: 是否成功繪製；有圖集沒有的字元時不繪製並回傳 False
+        """
+        glyphs = self.glyphs
+        atlas = self._tinted.get(color) or self._get_tinted(color)
+        sequence = []
+        append = sequence.append
+        try:
+            for char in text:
+                area, advance = glyphs[char]
+                append((atlas, (x, y), area))
+                x += advance
+        except KeyError:
+            return False
+        surface.blits(sequence, doreturn=False)
+        return True
@@ -0,0 +1,82 @@
+"""
+Survival Realm - 保留式 UI 面板
+面板畫進快取表面，只有輸入改變時才重畫，其餘幀只需要一次 blit
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+保留式面板的核心概念：
+1. 每個面板擁有一張和自己一樣大的表面，繪製函式以面板左上角為原點畫在這張表面上
+2. 呼叫端每幀提供一個「輸入鍵」（物品欄版本、狀態區間、滾輪位置等），鍵沒變就直接貼上舊表面
+3. 不透明的面板用一般表面；HUD 這類浮在世界上的面板用透明表面，每次重畫前先清成全透明
+4. 記錄重畫與重用次數，方便確認面板是否真的被重用
+"""
+
+import pygame
+from typing import Callable, Hashable, Optional, Tuple
+
+# 用來表示「還沒畫過」的鍵，不會和任何輸入鍵相等
+_UNSET = object()
+
+
+class RetainedPanel:
+    """有快取表面的 UI 面板"""
+
+    def __init__(self, size: Tuple[int, int], transparent: bool = False) -> None:
+        """
+        初始化面板
+
+        Args:
+            size (Tuple[int, int]): 面板尺寸
+            transparent (bool): 面板是否有透明區域（例如 HUD）
+        """
+        self.size = size
+        self.transparent = transparent
+        self.surface: Optional[pygame.Surface] = None
+        self.key: Hashable = _UNSET
+
+        self.renders = 0
+        self.reuses = 0
+
+    def _create_surface(self) -> pygame.Surface:
+        """建立面板表面，有顯示模式時轉成螢幕格式以加快 blit"""
+        if self.transparent:
+            surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            return surface.convert_alpha() if pygame.display.get_surface() else surface
+        surface = pygame.Surface(self.size)
+        return surface.convert() if pygame.display.get_surface() else surface
+
+    def invalidate(self) -> None:
+        """強制下一次繪製時重畫"""
+        self.key = _UNSET
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        position: Tuple[int, int],
+        key: Hashable,
+        render: Callable[[pygame.Surface], None],
+    ) -> None:
+        """
+        繪製面板，輸入鍵改變時才重新呼叫 render
+
+        Args:
+            screen (pygame.Surface): 目標表面
+            position (Tuple[int, int]): 面板左上角在目標表面上的位置
+            key (Hashable): 決定面板內容的所有輸入
+            render (Callable): 以面板左上角為原點繪製內容的函式
+        """
+        if self.surface is None:
+            self.surface = self._create_surface()
+
+        if key != self.key:
+            if self.transparent:
+                self.surface.fill((0, 0, 0, 0))
+            render(self.surface)
+            self.key = key
+            self.renders += 1
+        else:
+            self.reuses += 1
+
+        screen.blit(self.surface, position)
@@ -0,0 +1,123 @@
+"""
+Survival Realm - 文字表面快取
+把 font.render 的結果保存起來，同一段文字只排版一次
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+文字快取的核心概念：
+1. 以 (字體, 文字, 顏色, 抗鋸齒) 為鍵保存渲染好的表面，中文字排版很貴，能重用就重用
+2. 快取有上限，超過時淘汰最久沒用到的項目（LRU），不斷變化的文字不會撐爆記憶體
+3. 記錄命中、未命中與淘汰次數，方便確認 HUD 的文字是否真的被重用
+4. 字體物件也集中快取，繪製時不再每幀建立新的 pygame.font.Font
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from ..core.config import UI_CONFIG
+
+TextKey = Tuple[pygame.font.Font, str, Tuple[int, ...], bool]
+
+
+class TextCache:
+    """有上限的文字表面 LRU 快取"""
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """
+        初始化文字快取
+
+        Args:
+            max_size (int): 最多保存的文字表面數量，預設使用 UI_CONFIG
+        """
+        self.max_size = max_size or UI_CONFIG["text_cache_size"]
+        self._surfaces: "OrderedDict[TextKey, pygame.Surface]" = OrderedDict()
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: Tuple[int, ...],
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        """
+        取得渲染好的文字表面，沒有快取時才呼叫 font.render
+
+        回傳的表面由快取共用，呼叫端不可修改內容；
+        需要暫時調整透明度時請在繪製後還原
+
+        Args:
+            font (pygame.font.Font): 字體
+            text (str): 文字內容
+            color (Tuple[int, ...]): 文字顏色
+            antialias (bool): 是否抗鋸齒
+
+        Returns:
+            pygame.Surface: 文字表面
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def get_font(self, path: Optional[str], size: int) -> pygame.font.Font:
+        """
+        取得共用的字體物件，同一組路徑與大小只載入一次
+
+        Args:
+            path (str): 字體檔路徑，None 表示 pygame 預設字體
+            size (int): 字體大小
+
+        Returns:
+            pygame.font.Font: 字體
+        """
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self._fonts[key] = font
+        return font
+
+    def clear(self) -> None:
+        """清空快取的文字表面與統計"""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        取得快取統計
+
+        Returns:
+            Dict[str, float]: 項目數、命中、未命中、淘汰次數與命中率
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 全域文字快取實例
+text_cache = TextCache()
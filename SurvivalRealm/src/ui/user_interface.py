@@ -8,11 +8,15 @@ Survival Realm - 使用者介面系統
 """
 
 import pygame
-import time
 from typing import List, Tuple, TYPE_CHECKING
 
 from ..core.config import WINDOW_CONFIG, COLORS, SURVIVAL_STATS, UI_CONFIG
-from ..systems.inventory import Inventory, ItemType
+from ..systems.crafting import recipe_registry
+from ..systems.game_clock import game_clock
+from ..systems.inventory import Inventory, ItemType, item_database
+from .glyph_atlas import GlyphAtlas
+from .retained_panel import RetainedPanel
+from .text_cache import text_cache
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -23,69 +27,34 @@ if TYPE_CHECKING:
 class UI:
     """使用者介面管理類"""
 
+    # 生存狀態條版面
+    BAR_WIDTH = 200
+    BAR_HEIGHT = 20
+    BAR_SPACING = 30
+    BAR_START = (20, 20)
+
+    # 各面板尺寸
+    HUD_SIZE = (380, 160)  # 只包含五條狀態條與數值標籤
+    INVENTORY_SIZE = (400, 350)
+    CRAFTING_SIZE = (720, 600)
+    SMELTING_SIZE = (400, 250)
+
     def __init__(self):
         """初始化UI系統"""
         print("載入: 開始載入字體...")
         self.fonts = self._load_fonts()  # 將返回的字體字典賦值給self.fonts
-        self.crafting_scroll_offset = 0  # 製作界面滾輪偏移量
-        print("UI系統初始化完成！")
-
-    def _get_all_recipes(self):
-        """獲取所有配方的統一列表，用於滾輪計算"""
-        recipe_categories = {
-            "基礎工具": {
-                "axe": {
-                    "materials": {"wood": 3, "stone": 2},
-                    "name": "斧頭",
-                    "desc": "砍伐樹木的利器",
-                },
-                "pickaxe": {
-                    "materials": {"wood": 2, "stone": 3},
-                    "name": "稿子",
-                    "desc": "挖掘石頭和礦物",
-                },
-                "bucket": {
-                    "materials": {"wood": 4, "stone": 1},
-                    "name": "木桶",
-                    "desc": "更有效地飲用河水",
-                },
-                "torch": {
-                    "materials": {"wood": 1, "coal": 1},
-                    "name": "火把",
-                    "desc": "照亮黑暗的洞穴",
-                },
-            },
-            "建築設施": {
-                "workbench": {
-                    "materials": {"wood": 4},
-                    "name": "工作台",
-                    "desc": "製作高級物品必需",
-                },
-                "furnace": {
-                    "materials": {"stone": 8},
-                    "name": "熔爐",
-                    "desc": "燒製礦物成錠",
-                },
-            },
-            "戰鬥裝備": {
-                "iron_sword": {
-                    "materials": {"iron_ingot": 2, "wood": 1},
-                    "name": "鐵劍",
-                    "desc": "強力的戰鬥武器",
-                },
-                "iron_armor": {
-                    "materials": {"iron_ingot": 5},
-                    "name": "鐵甲",
-                    "desc": "抵禦怪物攻擊",
-                },
-            },
+        # 每種字體大小一張字形圖集，給每幀變化的數值文字使用
+        self.glyph_atlases = {
+            size_name: GlyphAtlas(font) for size_name, font in self.fonts.items()
         }
+        self.crafting_scroll_offset = 0  # 製作界面滾輪偏移量
 
-        all_recipes = []
-        for category_name, recipes in recipe_categories.items():
-            for item_id, recipe_data in recipes.items():
-                all_recipes.append((category_name, item_id, recipe_data))
-        return all_recipes
+        # 保留式面板 - 只有輸入改變時才重畫，其餘幀只貼上快取表面
+        self.hud_panel = RetainedPanel(self.HUD_SIZE, transparent=True)
+        self.inventory_panel = RetainedPanel(self.INVENTORY_SIZE)
+        self.crafting_panel = RetainedPanel(self.CRAFTING_SIZE)
+        self.smelting_panel = RetainedPanel(self.SMELTING_SIZE)
+        print("UI系統初始化完成！")
 
     def _load_fonts(self) -> dict:
         """載入字體，針對不同操作系統優化 - 智能中文字體選擇"""
@@ -331,9 +300,35 @@ class UI:
             size: 字體大小 ("large", "medium", "small")
         """
         font = self.fonts.get(size, self.fonts["medium"])
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(font, text, color)
         surface.blit(text_surface, (x, y))
 
+    def draw_dynamic_text(
+        self,
+        surface: pygame.Surface,
+        text: str,
+        x: int,
+        y: int,
+        color: Tuple[int, int, int],
+        size: str = "medium",
+    ) -> None:
+        """
+        繪製經常變化的文字（數值、倒數計時）
+
+        優先用字形圖集拼字，避免每個新數值都重新排版；
+        有圖集沒有的字元時改用 draw_text
+
+        Args:
+            surface: 繪製表面
+            text: 文字內容
+            x, y: 位置座標
+            color: 文字顏色
+            size: 字體大小 ("large", "medium", "small")
+        """
+        atlas = self.glyph_atlases.get(size, self.glyph_atlases["medium"])
+        if not atlas.draw(surface, text, x, y, color):
+            self.draw_text(surface, text, x, y, color, size)
+
     def draw_centered_text(
         self,
         surface: pygame.Surface,
@@ -354,52 +349,32 @@ class UI:
             size: 字體大小
         """
         font = self.fonts.get(size, self.fonts["medium"])
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(font, text, color)
         text_rect = text_surface.get_rect(center=(center_x, center_y))
         surface.blit(text_surface, text_rect)
 
     def draw_survival_bars(self, screen: pygame.Surface, player: "Player") -> None:
         """
-        繪製生存狀態條
+        繪製生存狀態條（數值跨過顯示的整數或像素時才重畫）
 
         Args:
             screen: pygame螢幕物件
             player: 玩家物件
         """
-        bar_width = 200
-        bar_height = 20
-        bar_spacing = 30
-        start_x = 20
-        start_y = 20
-
-        stats = player.survival_stats
-        stat_data = [
-            ("生命值", stats.health, SURVIVAL_STATS["health"]["max"], COLORS["HEALTH"]),
-            ("飢餓度", stats.hunger, SURVIVAL_STATS["hunger"]["max"], COLORS["HUNGER"]),
-            ("口渴度", stats.thirst, SURVIVAL_STATS["thirst"]["max"], COLORS["THIRST"]),
-            ("體力值", stats.energy, SURVIVAL_STATS["energy"]["max"], COLORS["ENERGY"]),
-            ("精神值", stats.sanity, SURVIVAL_STATS["sanity"]["max"], COLORS["SANITY"]),
-        ]
-
-        for i, (name, current, max_val, color) in enumerate(stat_data):
-            y = start_y + i * bar_spacing
-
-            # 繪製背景條
-            bg_rect = pygame.Rect(start_x, y, bar_width, bar_height)
-            pygame.draw.rect(screen, COLORS["UI_PANEL"], bg_rect)
-            pygame.draw.rect(screen, COLORS["UI_BORDER"], bg_rect, 2)
-
-            # 繪製數值條
-            fill_width = int((current / max_val) * bar_width)
-            if fill_width > 0:
-                fill_rect = pygame.Rect(start_x, y, fill_width, bar_height)
-                pygame.draw.rect(screen, color, fill_rect)
+        stat_data = self._get_stat_data(player)
+        key = tuple(
+            (int(current), int((current / max_val) * self.BAR_WIDTH))
+            for _, current, max_val, _ in stat_data
+        )
+        self.hud_panel.draw(
+            screen,
+            (0, 0),
+            key,
+            lambda surface: self._render_survival_bars(surface, stat_data),
+        )
 
-            # 繪製文字標籤
-            text = f"{name}: {int(current)}/{int(max_val)}"
-            self.draw_text(
-                screen, text, start_x + bar_width + 10, y + 2, COLORS["TEXT"], "small"
-            )
+        start_x, start_y = self.BAR_START
+        bar_spacing = self.BAR_SPACING
 
         # 繪製玩家狀態
         status_text = player.get_status_text()
@@ -433,6 +408,44 @@ class UI:
                 "small",
             )
 
+    def _get_stat_data(self, player: "Player") -> list:
+        """取得各項生存數值 [(名稱, 目前值, 最大值, 顏色)]"""
+        stats = player.survival_stats
+        return [
+            ("生命值", stats.health, SURVIVAL_STATS["health"]["max"], COLORS["HEALTH"]),
+            ("飢餓度", stats.hunger, SURVIVAL_STATS["hunger"]["max"], COLORS["HUNGER"]),
+            ("口渴度", stats.thirst, SURVIVAL_STATS["thirst"]["max"], COLORS["THIRST"]),
+            ("體力值", stats.energy, SURVIVAL_STATS["energy"]["max"], COLORS["ENERGY"]),
+            ("精神值", stats.sanity, SURVIVAL_STATS["sanity"]["max"], COLORS["SANITY"]),
+        ]
+
+    def _render_survival_bars(self, screen: pygame.Surface, stat_data: list) -> None:
+        """把生存狀態條與數值標籤畫到 HUD 面板上"""
+        bar_width = self.BAR_WIDTH
+        bar_height = self.BAR_HEIGHT
+        bar_spacing = self.BAR_SPACING
+        start_x, start_y = self.BAR_START
+
+        for i, (name, current, max_val, color) in enumerate(stat_data):
+            y = start_y + i * bar_spacing
+
+            # 繪製背景條
+            bg_rect = pygame.Rect(start_x, y, bar_width, bar_height)
+            pygame.draw.rect(screen, COLORS["UI_PANEL"], bg_rect)
+            pygame.draw.rect(screen, COLORS["UI_BORDER"], bg_rect, 2)
+
+            # 繪製數值條
+            fill_width = int((current / max_val) * bar_width)
+            if fill_width > 0:
+                fill_rect = pygame.Rect(start_x, y, fill_width, bar_height)
+                pygame.draw.rect(screen, color, fill_rect)
+
+            # 繪製文字標籤
+            text = f"{name}: {int(current)}/{int(max_val)}"
+            self.draw_dynamic_text(
+                screen, text, start_x + bar_width + 10, y + 2, COLORS["TEXT"], "small"
+            )
+
     def draw_time_info(
         self, screen: pygame.Surface, time_manager: "TimeManager"
     ) -> None:
@@ -446,8 +459,8 @@ class UI:
         time_str = time_manager.get_time_string()
         period_str = time_manager.get_time_period_chinese()
 
-        # 時間顯示
-        self.draw_text(
+        # 時間顯示（倒數每秒變化）
+        self.draw_dynamic_text(
             screen, time_str, WINDOW_CONFIG["width"] - 200, 20, COLORS["TEXT"], "medium"
         )
 
@@ -476,7 +489,7 @@ class UI:
 
         for message, timestamp in messages:
             # 計算透明度（訊息即將消失時變淡）
-            current_time = time.time()
+            current_time = game_clock.now()
             age = current_time - timestamp
             alpha = max(0, min(255, int(255 * (1 - age / message_duration))))
 
@@ -485,13 +498,13 @@ class UI:
 
             for line in lines:
                 if line.strip():  # 只繪製非空行
-                    # 創建半透明表面
-                    text_surface = self.fonts["small"].render(
-                        line, True, COLORS["TEXT"]
+                    # 快取的表面是共用的，淡出後要把透明度還原
+                    text_surface = text_cache.render(
+                        self.fonts["small"], line, COLORS["TEXT"]
                     )
                     text_surface.set_alpha(alpha)
-
                     screen.blit(text_surface, (20, y_offset))
+                    text_surface.set_alpha(255)
                 y_offset -= 25
 
     def draw_inventory(self, screen: pygame.Surface, inventory: Inventory) -> None:
@@ -502,12 +515,22 @@ class UI:
             screen: pygame螢幕物件
             inventory: 物品欄物件
         """
-        # 物品欄背景
-        inv_width = 400
-        inv_height = 350
+        inv_width, inv_height = self.INVENTORY_SIZE
         inv_x = (WINDOW_CONFIG["width"] - inv_width) // 2
         inv_y = (WINDOW_CONFIG["height"] - inv_height) // 2
+        self.inventory_panel.draw(
+            screen,
+            (inv_x, inv_y),
+            (inventory, inventory.version),
+            lambda surface: self._render_inventory(surface, inventory),
+        )
 
+    def _render_inventory(self, screen: pygame.Surface, inventory: Inventory) -> None:
+        """把物品欄畫到面板上（以面板左上角為原點）"""
+        inv_width, inv_height = self.INVENTORY_SIZE
+        inv_x = inv_y = 0
+
+        # 物品欄背景
         bg_rect = pygame.Rect(inv_x, inv_y, inv_width, inv_height)
         pygame.draw.rect(screen, COLORS["UI_PANEL"], bg_rect)
         pygame.draw.rect(screen, COLORS["UI_BORDER"], bg_rect, 3)
@@ -579,7 +602,7 @@ class UI:
         # 繪製數量
         if item_stack.quantity > 1:
             qty_text = f"{item_stack.quantity}"
-            self.draw_text(
+            self.draw_dynamic_text(
                 screen,
                 qty_text,
                 slot_rect.right - 15,
@@ -600,13 +623,6 @@ class UI:
         info_y = inv_y + inv_height - 80
         self.draw_text(screen, "物品統計:", inv_x + 30, info_y, COLORS["TEXT"], "small")
 
-        # 統計各類物品數量
-        item_counts = {}
-        for slot in inventory.slots:
-            if slot:
-                item_id = slot.item.id
-                item_counts[item_id] = item_counts.get(item_id, 0) + slot.quantity
-
         # 顯示重要物品數量
         important_items = {
             "wood": "木材",
@@ -621,14 +637,14 @@ class UI:
         item_count = 0
 
         for item_id, chinese_name in important_items.items():
-            if item_id in item_counts:
-                count = item_counts[item_id]
+            count = inventory.get_item_count(item_id)
+            if count:
                 text = f"{chinese_name}: {count}"
 
                 x_offset = inv_x + 30 + (item_count % items_per_row) * 120
                 row_offset = (item_count // items_per_row) * 20
 
-                self.draw_text(
+                self.draw_dynamic_text(
                     screen,
                     text,
                     x_offset,
@@ -641,12 +657,37 @@ class UI:
     def draw_crafting_interface(
         self, screen: pygame.Surface, player: "Player", world_manager=None
     ) -> None:
-        """繪製支持滾輪的製作介面 - 垂直列表佈局"""
-        craft_width = 720
-        craft_height = 600
+        """繪製支持滾輪的製作介面（物品欄、工作台或滾輪改變時才重畫）"""
+        craft_width, craft_height = self.CRAFTING_SIZE
         craft_x = (WINDOW_CONFIG["width"] - craft_width) // 2
         craft_y = (WINDOW_CONFIG["height"] - craft_height) // 2
 
+        # 先限制滾輪範圍，讓輸入鍵反映實際顯示的位置
+        categories = recipe_registry.categories
+        total_items = sum(len(recipes) for _, recipes in categories) + len(categories)
+        max_scroll = max(0, total_items * 110 - (craft_height - 140))
+        self.crafting_scroll_offset = max(
+            0, min(self.crafting_scroll_offset, max_scroll)
+        )
+
+        # 檢查工作台
+        has_workbench = self._player_near_workbench(player, world_manager)
+        inventory = player.inventory
+        key = (inventory, inventory.version, has_workbench, self.crafting_scroll_offset)
+        self.crafting_panel.draw(
+            screen,
+            (craft_x, craft_y),
+            key,
+            lambda surface: self._render_crafting(surface, player, has_workbench),
+        )
+
+    def _render_crafting(
+        self, screen: pygame.Surface, player: "Player", has_workbench: bool
+    ) -> None:
+        """把製作介面畫到面板上（以面板左上角為原點）"""
+        craft_width, craft_height = self.CRAFTING_SIZE
+        craft_x = craft_y = 0
+
         # 主背景
         bg_rect = pygame.Rect(craft_x, craft_y, craft_width, craft_height)
         pygame.draw.rect(screen, COLORS["UI_PANEL"], bg_rect)
@@ -667,58 +708,9 @@ class UI:
             "large",
         )
 
-        # 配方資料
-        recipe_categories = {
-            "基礎工具": {
-                "axe": {
-                    "materials": {"wood": 3, "stone": 2},
-                    "name": "斧頭",
-                    "desc": "砍伐樹木的利器",
-                },
-                "pickaxe": {
-                    "materials": {"wood": 2, "stone": 3},
-                    "name": "稿子",
-                    "desc": "挖掘石頭和礦物",
-                },
-                "bucket": {
-                    "materials": {"wood": 4, "stone": 1},
-                    "name": "木桶",
-                    "desc": "更有效地飲用河水",
-                },
-                "torch": {
-                    "materials": {"wood": 1, "coal": 1},
-                    "name": "火把",
-                    "desc": "照亮黑暗的洞穴",
-                },
-            },
-            "建築設施": {
-                "workbench": {
-                    "materials": {"wood": 4},
-                    "name": "工作台",
-                    "desc": "製作高級物品必需",
-                },
-                "furnace": {
-                    "materials": {"stone": 8},
-                    "name": "熔爐",
-                    "desc": "燒製礦物成錠",
-                },
-            },
-            "戰鬥裝備": {
-                "iron_sword": {
-                    "materials": {"iron_ingot": 2, "wood": 1},
-                    "name": "鐵劍",
-                    "desc": "強力的戰鬥武器",
-                },
-                "iron_armor": {
-                    "materials": {"iron_ingot": 5},
-                    "name": "鐵甲",
-                    "desc": "抵禦怪物攻擊",
-                },
-            },
-        }
-
-        # 檢查工作台
-        has_workbench = self._player_near_workbench(player, world_manager)
+        # 配方資料（與遊戲邏輯共用同一個註冊表）
+        recipe_categories = recipe_registry.categories
+        table = recipe_registry.get_table(player.inventory)
 
         # 內容區域設定
         content_area = pygame.Rect(
@@ -726,7 +718,7 @@ class UI:
         )
 
         # 計算總內容高度
-        total_items = sum(len(recipes) for recipes in recipe_categories.values()) + len(
+        total_items = sum(len(recipes) for _, recipes in recipe_categories) + len(
             recipe_categories
         )
         total_content_height = total_items * 110  # 每個物品 100px + 間距 10px
@@ -744,7 +736,7 @@ class UI:
         current_y = content_area.y - self.crafting_scroll_offset
         recipe_index = 1
 
-        for category_name, recipes in recipe_categories.items():
+        for category_name, recipes in recipe_categories:
             # 分類標題
             if current_y > content_area.y - 40 and current_y < content_area.bottom + 40:
                 category_rect = pygame.Rect(
@@ -774,21 +766,16 @@ class UI:
             current_y += 40
 
             # 繪製配方
-            for item_id, recipe_data in recipes.items():
+            for recipe in recipes:
                 if recipe_index > 8:
                     break
 
                 # 只繪製可見區域的物品
                 if current_y + 100 > content_area.y and current_y < content_area.bottom:
                     # 製作條件檢查
-                    can_craft_materials = all(
-                        player.inventory.has_item(mat, amount)
-                        for mat, amount in recipe_data["materials"].items()
-                    )
+                    can_craft_materials = table.can_craft(recipe)
 
-                    is_basic_craft = (
-                        item_id in ["workbench"] or category_name == "基礎工具"
-                    )
+                    is_basic_craft = not recipe.requires_workbench
                     can_craft_location = is_basic_craft or has_workbench
                     can_craft = can_craft_materials and can_craft_location
 
@@ -832,7 +819,7 @@ class UI:
                     name_color = (0, 0, 0)  # 統一使用黑色，在任何背景下都清晰可見
                     self.draw_text(
                         screen,
-                        recipe_data["name"],
+                        recipe.name,
                         content_area.x + 60,
                         current_y + 10,
                         name_color,
@@ -842,7 +829,7 @@ class UI:
                     # 物品描述
                     self.draw_text(
                         screen,
-                        recipe_data["desc"],
+                        recipe.description,
                         content_area.x + 60,
                         current_y + 35,
                         (220, 220, 220),
@@ -851,8 +838,8 @@ class UI:
 
                     # 材料需求 - 智能截斷以適應窗口
                     materials_parts = []
-                    for mat, amount in recipe_data["materials"].items():
-                        owned = player.inventory.get_item_count(mat)
+                    for mat, amount in recipe.materials:
+                        owned = table.get_count(mat)
                         part = f"{mat}×{amount}"
                         if owned < amount:
                             part += f"({owned})"
@@ -939,6 +926,11 @@ class UI:
             screen, status_text, craft_x + 400, info_y, status_color, "medium"
         )
 
+    def _item_name(self, item_id: str) -> str:
+        """取得物品的顯示名稱（找不到時使用ID）"""
+        item = item_database.get_item(item_id)
+        return item.name if item else item_id
+
     def _player_near_workbench(self, player: "Player", world_manager=None) -> bool:
         """檢查玩家是否靠近工作台（UI用）"""
         if world_manager is None:
@@ -961,11 +953,22 @@ class UI:
         return False
 
     def draw_smelting_interface(self, screen: pygame.Surface, player: "Player") -> None:
-        """繪製燒製介面"""
-        craft_width = 400
-        craft_height = 250
+        """繪製燒製介面（物品欄改變時才重畫）"""
+        craft_width, craft_height = self.SMELTING_SIZE
         craft_x = (WINDOW_CONFIG["width"] - craft_width) // 2
         craft_y = (WINDOW_CONFIG["height"] - craft_height) // 2
+        inventory = player.inventory
+        self.smelting_panel.draw(
+            screen,
+            (craft_x, craft_y),
+            (inventory, inventory.version),
+            lambda surface: self._render_smelting(surface, player),
+        )
+
+    def _render_smelting(self, screen: pygame.Surface, player: "Player") -> None:
+        """把燒製介面畫到面板上（以面板左上角為原點）"""
+        craft_width, craft_height = self.SMELTING_SIZE
+        craft_x = craft_y = 0
 
         bg_rect = pygame.Rect(craft_x, craft_y, craft_width, craft_height)
         pygame.draw.rect(screen, COLORS["UI_PANEL"], bg_rect)
@@ -982,24 +985,17 @@ class UI:
         )
 
         # 燒製配方
-        smelting_recipes = {
-            "iron_ingot": {"material": "iron_ore", "name": "鐵錠", "fuel": "煤炭/木材"},
-        }
+        table = recipe_registry.get_table(player.inventory)
 
         y_offset = craft_y + 70
-        for i, (item_id, recipe_data) in enumerate(smelting_recipes.items()):
-            has_material = player.inventory.has_item(recipe_data["material"], 1)
-            has_fuel = player.inventory.has_item(
-                "coal", 1
-            ) or player.inventory.has_item("wood", 1)
-            can_smelt = has_material and has_fuel
+        for i, recipe in enumerate(recipe_registry.smelting_menu):
+            can_smelt = table.can_craft(recipe)
 
             color = COLORS["SUCCESS"] if can_smelt else COLORS["TEXT_SECONDARY"]
 
-            recipe_text = (
-                f"{i+1}. {recipe_data['name']} "
-                f"(需要: {recipe_data['material']} + {recipe_data['fuel']})"
-            )
+            material = recipe.materials[0][0]
+            fuel_names = "/".join(self._item_name(fuel) for fuel in recipe.fuels)
+            recipe_text = f"{i+1}. {recipe.name} " f"(需要: {material} + {fuel_names})"
             self.draw_text(screen, recipe_text, craft_x + 30, y_offset, color, "medium")
 
             y_offset += 40
@@ -10,9 +10,11 @@ Survival Realm - 洞穴探險系統
 import pygame
 import random
 import math
+import queue
+import threading
 import time
-from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
-from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional, Set, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
 
 if TYPE_CHECKING:
     from ..entities.player import Player
@@ -21,7 +23,13 @@ if TYPE_CHECKING:
 from .world_objects import Rock
 
 from .game_object import GameObject
+from .poisson_disk import PoissonDiskSampler, spacing_for_count
+from .spatial_hash import SpatialHash
 from ..core.config import CAVE_CONFIG, WORLD_OBJECTS, WINDOW_CONFIG
+from ..systems.game_clock import game_clock
+from ..systems.lighting import lighting
+from ..ui.text_cache import text_cache
+from ..systems.loot_table import roll_loot
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -51,6 +59,9 @@ class CaveRoom:
     doors: List[GameObject] = None  # 房間的門
     enchanting_table: Optional[GameObject] = None  # 附魔台
     completion_reward: Dict[str, int] = None  # 完成獎勵
+    # 可互動物件（Boss、怪物、寶箱）的空間索引，怪物移動與死亡時同步更新
+    spatial_index: SpatialHash = None
+    _objects_cache: Optional[List[GameObject]] = field(default=None, repr=False)
 
     def __post_init__(self):
         if self.monsters is None:
@@ -63,6 +74,74 @@ class CaveRoom:
             self.doors = []
         if self.completion_reward is None:
             self.completion_reward = {}
+        if self.spatial_index is None:
+            self.spatial_index = SpatialHash(CAVE_CONFIG["spatial_cell_size"])
+
+    def build_index(self) -> None:
+        """房間物件生成完畢後建立空間索引"""
+        self.spatial_index.clear()
+        for obj in self._interactive_objects():
+            self.spatial_index.insert(obj)
+            obj.on_destroy = self._on_object_destroyed
+        self._objects_cache = None
+
+    def _interactive_objects(self) -> List[GameObject]:
+        """依互動優先順序排列的物件（Boss、怪物、寶箱）"""
+        objects = [self.boss] if self.boss else []
+        objects.extend(self.monsters)
+        objects.extend(self.treasures)
+        return objects
+
+    def _on_object_destroyed(self, game_object: GameObject) -> None:
+        """物件死亡時移出索引"""
+        self.spatial_index.remove(game_object)
+        self._objects_cache = None
+
+    def update_object(self, game_object: GameObject) -> None:
+        """物件移動後同步空間索引"""
+        self.spatial_index.update(game_object)
+
+    def get_objects(self) -> List[GameObject]:
+        """
+        取得所有活躍的可互動物件（快取，物件死亡時才重建）
+
+        Returns:
+            List[GameObject]: 共用的物件列表，呼叫端不可修改
+        """
+        if self._objects_cache is None:
+            self._objects_cache = [
+                obj for obj in self._interactive_objects() if obj.active
+            ]
+        return self._objects_cache
+
+    def get_nearby_objects(self, x: float, y: float, radius: float) -> List[GameObject]:
+        """
+        取得中心點在範圍內的活躍物件，依互動優先順序排列（Boss、怪物、寶箱）
+
+        Args:
+            x, y (float): 中心座標
+            radius (float): 搜尋半徑
+
+        Returns:
+            List[GameObject]: 範圍內的物件列表
+        """
+        # 索引以左上角分桶，判斷中心距離時需擴大搜尋範圍
+        search_radius = radius + self.spatial_index.max_object_size
+        nearby = [
+            obj
+            for obj in self.spatial_index.query(x, y, search_radius)
+            if obj.active and obj.is_near(x, y, radius)
+        ]
+        nearby.sort(key=self._interaction_priority)
+        return nearby
+
+    def _interaction_priority(self, game_object: GameObject) -> int:
+        """互動優先順序：Boss > 怪物 > 寶箱"""
+        if game_object is self.boss:
+            return 0
+        if isinstance(game_object, TreasureChest):
+            return 2
+        return 1
 
     def is_room_completed(self) -> bool:
         """檢查房間是否已完成（所有怪物被擊敗）"""
@@ -87,6 +166,8 @@ class CaveRoom:
 class LockedDoor(GameObject):
     """地下城鎖門 - 需要鑰匙才能通過"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("is_locked",)
+
     def __init__(self, x: float, y: float, required_key: str = "depth_key"):
         config = WORLD_OBJECTS["locked_door"]
         size = config["size"]
@@ -213,6 +294,8 @@ class EnchantingTable(GameObject):
 class EliteMonster(GameObject):
     """精英怪物 - 比普通怪物更強"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("health", "last_attack", "state")
+
     def __init__(self, x: float, y: float, monster_type: str, depth: int):
         if monster_type == "elite_skeleton":
             config = WORLD_OBJECTS["elite_skeleton"]
@@ -254,7 +337,7 @@ class EliteMonster(GameObject):
         # 計算與玩家的距離
         distance = math.sqrt((self.x - player_x) ** 2 + (self.y - player_y) ** 2)
 
-        current_time = time.time()
+        current_time = game_clock.now()
 
         if (
             distance <= self.attack_range
@@ -285,7 +368,7 @@ class EliteMonster(GameObject):
 
     def can_attack(self) -> bool:
         """檢查精英怪物是否可以攻擊"""
-        current_time = time.time()
+        current_time = game_clock.now()
         return (
             self.state == "attacking"
             and current_time - self.last_attack >= self.attack_cooldown
@@ -296,7 +379,7 @@ class EliteMonster(GameObject):
         if not self.can_attack():
             return None
 
-        current_time = time.time()
+        current_time = game_clock.now()
         self.last_attack = current_time
 
         print(f"💥 精英{self.monster_type}攻擊玩家！造成{self.damage}點傷害")
@@ -429,6 +512,16 @@ class EliteMonster(GameObject):
 class CaveBoss(GameObject):
     """洞穴Boss - 每層的守護者，必須擊敗才能獲得下層鑰匙"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + (
+        "health",
+        "last_attack",
+        "attack_cooldown",
+        "move_speed",
+        "state",
+        "is_enraged",
+        "phase",
+    )
+
     def __init__(self, x: float, y: float, depth: int):
         config = WORLD_OBJECTS["cave_boss"]
         size = config["size"]
@@ -554,7 +647,7 @@ class CaveBoss(GameObject):
 
     def can_attack(self) -> bool:
         """檢查Boss是否可以攻擊"""
-        current_time = time.time()
+        current_time = game_clock.now()
         return (
             self.state == "attacking"
             and current_time - self.last_attack >= self.attack_cooldown
@@ -565,7 +658,7 @@ class CaveBoss(GameObject):
         if not self.can_attack():
             return None
 
-        self.last_attack = time.time()
+        self.last_attack = game_clock.now()
         actual_damage = player.take_damage(self.damage)
 
         # 根據階段提供不同的攻擊訊息
@@ -688,14 +781,9 @@ class CaveBoss(GameObject):
         pygame.draw.rect(screen, health_color, health_rect)
 
         # Boss標記
-        font_size = 12
-        try:
-            font = pygame.font.Font(None, font_size)
-        except:
-            font = pygame.font.SysFont("Arial", font_size)
-
+        font = text_cache.get_font(None, 12)
         boss_text = f"BOSS - 第{self.depth}層"
-        text_surface = font.render(boss_text, True, (255, 255, 255))
+        text_surface = text_cache.render(font, boss_text, (255, 255, 255))
         text_x = screen_x + self.width // 2 - text_surface.get_width() // 2
         text_y = screen_y - 35
         screen.blit(text_surface, (text_x, text_y))
@@ -734,44 +822,11 @@ class CaveBoss(GameObject):
 
     def _generate_boss_loot(self) -> List[Tuple[str, int]]:
         """生成Boss戰利品 - 包含下層鑰匙"""
-        loot = []
-
-        # 100%掉落下層鑰匙
-        loot.append(("depth_key", 1))
-
         # 根據深度提供不同品質的獎勵
         base_reward_multiplier = 1.0 + (self.depth - 1) * 0.3
-
-        # 高級材料（必掉）
-        advanced_materials = ["steel_ingot", "diamond", "rare_gem"]
-        for material in advanced_materials:
-            count = max(1, int(random.randint(2, 4) * base_reward_multiplier))
-            loot.append((material, count))
-
-        # 珍貴寶石（高概率）
-        if random.random() < 0.8:
-            gems = ["diamond", "rare_gem", "treasure"]
-            gem = random.choice(gems)
-            count = max(1, int(random.randint(1, 3) * base_reward_multiplier))
-            loot.append((gem, count))
-
-        # 高級裝備（中等概率）
-        if random.random() < 0.6:
-            equipment = ["steel_sword", "diamond_pickaxe", "steel_armor"]
-            item = random.choice(equipment)
-            loot.append((item, 1))
-
-        # 藥水獎勵（必掉）
-        potions = ["health_potion", "energy_potion"]
-        for potion in potions:
-            count = max(2, int(random.randint(3, 5) * base_reward_multiplier))
-            loot.append((potion, count))
-
-        # 特殊Boss專屬掉落
-        if random.random() < 0.3:
-            special_items = ["boss_trophy", "ancient_artifact", "magic_crystal"]
-            special = random.choice(special_items)
-            loot.append((special, 1))
+        loot = roll_loot(
+            "cave_boss", depth=self.depth, multiplier=base_reward_multiplier
+        )
 
         print(f"調試: Boss掉落物品: {loot}")
         return loot
@@ -780,6 +835,8 @@ class CaveBoss(GameObject):
 class CaveMonster(GameObject):
     """洞穴怪物 - 比地表怪物更強大且主動攻擊"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("health", "last_attack", "state")
+
     def __init__(self, x: float, y: float, monster_type: str = "cave_monster"):
         config = WORLD_OBJECTS[monster_type]
         size = config["size"]
@@ -871,7 +928,7 @@ class CaveMonster(GameObject):
 
     def can_attack(self) -> bool:
         """檢查是否可以攻擊"""
-        current_time = time.time()
+        current_time = game_clock.now()
         return (
             self.state == "attacking"
             and current_time - self.last_attack >= self.attack_cooldown
@@ -882,7 +939,7 @@ class CaveMonster(GameObject):
         if not self.can_attack():
             return None
 
-        self.last_attack = time.time()
+        self.last_attack = game_clock.now()
         actual_damage = player.take_damage(self.damage)
 
         monster_names = {"cave_monster": "洞穴怪物", "cave_spider": "洞穴蜘蛛"}
@@ -1002,7 +1059,7 @@ class CaveMonster(GameObject):
             self.destroy()
 
             # 洞穴怪物掉落更好的物品
-            drops = self._generate_loot()
+            drops = self.roll_drops()
 
             monster_names = {"cave_monster": "洞穴怪物", "cave_spider": "洞穴蜘蛛"}
             name = monster_names.get(self.monster_type, "怪物")
@@ -1013,36 +1070,30 @@ class CaveMonster(GameObject):
             "message": f"與洞穴怪物激戰中... 怪物生命值: {self.health}/{self.max_health}"
         }
 
-    def _generate_loot(self) -> List[Tuple[str, int]]:
-        """生成戰利品"""
-        loot = []
-
-        if self.monster_type == "cave_monster":
-            # 洞穴怪物掉落
-            if random.random() < 0.8:
-                loot.append(("treasure", random.randint(1, 2)))
-            if random.random() < 0.6:
-                loot.append(("iron_ore", random.randint(2, 4)))
-            if random.random() < 0.4:
-                loot.append(("coal", random.randint(1, 3)))
-            if random.random() < 0.1:
-                loot.append(("diamond", 1))
-
-        elif self.monster_type == "cave_spider":
-            # 洞穴蜘蛛掉落
-            if random.random() < 0.7:
-                loot.append(("plant_fiber", random.randint(2, 5)))
-            if random.random() < 0.3:
-                loot.append(("rare_gem", 1))
+    def roll_drops(self) -> List[Tuple[str, int]]:
+        """
+        依怪物種類的掉落表（LOOT_TABLES）抽取戰利品
 
-        return loot
+        Returns:
+            List[Tuple[str, int]]: (物品ID, 數量) 列表，沒有掉落表的怪物不掉落
+        """
+        if self.monster_type in ("cave_monster", "cave_spider"):
+            return roll_loot(self.monster_type)
+        return []
 
 
 class TreasureChest(GameObject):
     """洞穴寶箱 - 包含更珍貴的物品，支援特殊類型"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("opened",)
+
     def __init__(
-        self, x: float, y: float, chest_type: str = "treasure_chest", depth: int = 1
+        self,
+        x: float,
+        y: float,
+        chest_type: str = "treasure_chest",
+        depth: int = 1,
+        rng: Optional[random.Random] = None,
     ):
         config = WORLD_OBJECTS[chest_type]
         size = config["size"]
@@ -1051,96 +1102,25 @@ class TreasureChest(GameObject):
         self.chest_type = chest_type
         self.depth = depth  # 記錄深度用於獎勵計算
         self.opened = False
-        self.loot = self._generate_treasure()
+        # 只記錄戰利品種子，打開時才生成內容，大量寶箱的房間生成更快
+        self.loot_seed = (rng or random).getrandbits(32)
 
-    def _generate_treasure(self) -> List[Tuple[str, int]]:
-        """生成寶箱內容 - 根據深度調整獎勵"""
-        loot = []
+    @property
+    def loot(self) -> List[Tuple[str, int]]:
+        """寶箱內容（由戰利品種子決定，每次結果相同）"""
+        return self._generate_treasure(random.Random(self.loot_seed))
 
+    def _generate_treasure(self, rng=random) -> List[Tuple[str, int]]:
+        """生成寶箱內容 - 根據深度調整獎勵"""
         # 基於深度的獎勵倍數
         depth_multiplier = 1.0 + (self.depth - 1) * 0.3
+        loot = roll_loot(
+            "treasure_chest", rng, depth=self.depth, multiplier=depth_multiplier
+        )
 
-        # 第10層超級寶物
         if self.depth >= CAVE_CONFIG["ultra_deep_threshold"]:
-            # 第10層必掉稀有物品
-            ultra_rare_items = [
-                "legendary_sword",
-                "ancient_armor",
-                "magic_orb",
-                "dragon_scale",
-            ]
-            for item in ultra_rare_items:
-                if random.random() < 0.6:  # 60%機率獲得每種傳說物品
-                    loot.append((item, 1))
-
-            # 大量高級材料
-            premium_materials = [
-                "diamond",
-                "rare_gem",
-                "mythril_ingot",
-                "phoenix_feather",
-            ]
-            for material in premium_materials:
-                count = random.randint(3, 8)  # 大量掉落
-                loot.append((material, count))
-
-            # 超級藥水
-            super_potions = [
-                "legendary_health_potion",
-                "ultimate_energy_potion",
-                "invincibility_potion",
-            ]
-            for potion in super_potions:
-                if random.random() < 0.8:
-                    loot.append((potion, random.randint(2, 5)))
-
             print(f"第{self.depth}層超級寶箱！掉落傳說級物品！")
 
-        # 高級材料 (高機率)
-        if random.random() < 0.9:
-            materials = ["iron_ingot", "steel_ingot", "copper_ingot"]
-            if self.depth >= 5:
-                materials.extend(["diamond", "rare_gem", "mythril_ingot"])
-
-            material = random.choice(materials)
-            count = max(1, int(random.randint(2, 5) * depth_multiplier))
-            loot.append((material, count))
-
-        # 珍貴寶石 (根據深度提高機率和品質)
-        gem_chance = 0.5 + (self.depth - 1) * 0.1  # 深度越高機率越高
-        if random.random() < gem_chance:
-            gems = ["rare_gem", "diamond", "treasure"]
-            if self.depth >= 7:
-                gems.extend(["legendary_gem", "cosmic_crystal"])
-
-            gem = random.choice(gems)
-            count = max(1, int(random.randint(1, 2) * depth_multiplier))
-            loot.append((gem, count))
-
-        # 高級裝備 (深度越高越好)
-        equipment_chance = 0.3 + (self.depth - 1) * 0.05
-        if random.random() < equipment_chance:
-            equipment = ["steel_sword", "steel_armor", "diamond_pickaxe"]
-            if self.depth >= 5:
-                equipment.extend(["enchanted_sword", "dragon_armor"])
-            if self.depth >= 8:
-                equipment.extend(["legendary_sword", "ancient_armor"])
-
-            item = random.choice(equipment)
-            loot.append((item, 1))
-
-        # 藥水 (必掉，深度越高品質越好)
-        if random.random() < 0.6:
-            potions = ["health_potion", "energy_potion"]
-            if self.depth >= 6:
-                potions.extend(["greater_health_potion", "greater_energy_potion"])
-            if self.depth >= 9:
-                potions.extend(["legendary_health_potion", "ultimate_energy_potion"])
-
-            potion = random.choice(potions)
-            count = max(1, int(random.randint(1, 3) * depth_multiplier))
-            loot.append((potion, count))
-
         return loot
 
     def draw(self, screen: pygame.Surface, darkness_alpha: int = 255) -> None:
@@ -1161,14 +1141,9 @@ class TreasureChest(GameObject):
         # 寶箱發光效果（未開啟時）
         if not self.opened:
             glow_color = (255, 215, 0, 100)  # 金色光暈
-            glow_rect = pygame.Rect(
-                self.x - 2, self.y - 2, self.width + 4, self.height + 4
-            )
-            # 創建發光表面
-            glow_surface = pygame.Surface(
-                (self.width + 4, self.height + 4), pygame.SRCALPHA
+            glow_surface = lighting.get_glow_rect(
+                (self.width + 4, self.height + 4), glow_color
             )
-            glow_surface.fill(glow_color)
             screen.blit(glow_surface, (self.x - 2, self.y - 2))
 
     def draw_with_camera_alpha(
@@ -1198,11 +1173,9 @@ class TreasureChest(GameObject):
         # 寶箱發光效果（未開啟時）
         if not self.opened:
             glow_color = (255, 215, 0, 100)  # 金色光暈
-            # 創建發光表面
-            glow_surface = pygame.Surface(
-                (self.width + 4, self.height + 4), pygame.SRCALPHA
+            glow_surface = lighting.get_glow_rect(
+                (self.width + 4, self.height + 4), glow_color
             )
-            glow_surface.fill(glow_color)
             screen.blit(glow_surface, (screen_x - 2, screen_y - 2))
 
     def interact(self, player: "Player") -> Optional[Dict]:
@@ -1211,8 +1184,9 @@ class TreasureChest(GameObject):
             return {"message": "這個寶箱已經空了"}
 
         self.opened = True
-        if self.loot:
-            return {"message": "打開了神秘寶箱！發現了珍貴的寶物！", "items": self.loot}
+        loot = self.loot
+        if loot:
+            return {"message": "打開了神秘寶箱！發現了珍貴的寶物！", "items": loot}
         else:
             return {"message": "寶箱是空的..."}
 
@@ -1221,6 +1195,29 @@ class CaveSystem:
     """地下城系統管理器 - 支援多房間闖關和鎖門機制"""
 
     def __init__(self):
+        self._room_sampler: Optional[PoissonDiskSampler] = None  # 生成房間用的取樣器
+        self._room_rng: Optional[random.Random] = None  # 生成房間用的亂數產生器
+
+        # 房間預先生成 - 背景執行緒在玩家探索時先建好下一個可進入的房間
+        self.prefetch_enabled = CAVE_CONFIG["prefetch_rooms"]
+        self._generation_lock = threading.Lock()  # 房間生成共用取樣器，一次只生成一間
+        self._prefetch_condition = threading.Condition()
+        self._prefetched_rooms: Dict[Tuple[int, int], CaveRoom] = {}  # 已生成的房間
+        self._prefetch_pending: Set[Tuple[int, int]] = set()  # 排隊或生成中的房間
+        self._prefetch_queue: "queue.Queue[Tuple[int, Tuple[int, int]]]" = queue.Queue()
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._generation = 0  # 每次重設加一，用來丟棄上一局排隊中的房間
+
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        重設洞穴探險進度（開始新的一局時使用）
+
+        Args:
+            seed (Optional[int]): 房間生成種子（通常是世界種子），未指定時隨機產生
+        """
+        self.seed = random.randrange(2**32) if seed is None else seed
         self.in_cave = False
         self.current_room = None
         self.player_torch_time = 0  # 玩家火把剩餘時間
@@ -1232,6 +1229,218 @@ class CaveSystem:
         self.room_progress = {}  # 房間進度 {depth: {room_id: completed}}
         self.player_keys = set()  # 玩家擁有的鑰匙
 
+        # 丟棄上一局預先生成的房間
+        self._discard_prefetched()
+
+    def _discard_prefetched(self) -> None:
+        """丟棄預先生成的房間；排隊或生成中的工作完成後也不會放進快取"""
+        with self._prefetch_condition:
+            self._generation += 1
+            self._prefetched_rooms.clear()
+            self._prefetch_pending.clear()
+            self._prefetch_condition.notify_all()
+
+    def export_state(self) -> Dict:
+        """
+        匯出需要存檔的洞穴探險進度
+
+        房間每次進入時重新生成，不會存檔；在洞穴中存檔時讀檔後會回到地表
+
+        Returns:
+            Dict: 可進入深度、深度鑰匙、房間進度與玩家鑰匙
+        """
+        return {
+            "max_unlocked_depth": self.max_unlocked_depth,
+            "depth_keys": dict(self.depth_keys),
+            "room_progress": {
+                depth: dict(rooms) for depth, rooms in self.room_progress.items()
+            },
+            "player_keys": sorted(self.player_keys),
+        }
+
+    def import_state(self, data: Dict, seed: Optional[int] = None) -> None:
+        """
+        載入 export_state 匯出的洞穴探險進度（會先重設洞穴系統）
+
+        Args:
+            data (Dict): 洞穴存檔資料
+            seed (Optional[int]): 房間生成種子（通常是世界種子）
+        """
+        self.reset(seed)
+        self.max_unlocked_depth = data["max_unlocked_depth"]
+        self.depth_keys = dict(data["depth_keys"])
+        self.room_progress = {
+            depth: dict(rooms) for depth, rooms in data["room_progress"].items()
+        }
+        self.player_keys = set(data["player_keys"])
+
+    def snapshot(self) -> tuple:
+        """
+        取得洞穴探險進度與目前房間的快照
+
+        房間本身不會被複製；房間生成後物件列表不再改變，
+        只需記錄房間物件的可變欄位與空間索引
+
+        Returns:
+            tuple: 不透明的洞穴快照
+        """
+        room = self.current_room
+        room_state = None
+        if room is not None:
+            objects = room._interactive_objects() + room.minerals + room.doors
+            if room.mini_boss is not None:
+                objects.append(room.mini_boss)
+            room_state = (
+                room.boss_defeated,
+                room.has_key,
+                room.is_locked,
+                tuple((obj, obj.snapshot_state()) for obj in objects),
+                room.spatial_index.snapshot(),
+            )
+
+        return (
+            self.seed,
+            self.in_cave,
+            room,
+            room_state,
+            self.player_torch_time,
+            self.darkness_damage_timer,
+            self.current_depth,
+            self.current_room_id,
+            self.max_unlocked_depth,
+            dict(self.depth_keys),
+            {depth: dict(rooms) for depth, rooms in self.room_progress.items()},
+            frozenset(self.player_keys),
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的洞穴狀態
+
+        Args:
+            snapshot (tuple): 洞穴快照
+        """
+        (
+            seed,
+            self.in_cave,
+            self.current_room,
+            room_state,
+            self.player_torch_time,
+            self.darkness_damage_timer,
+            self.current_depth,
+            self.current_room_id,
+            self.max_unlocked_depth,
+            depth_keys,
+            room_progress,
+            player_keys,
+        ) = snapshot
+        if seed != self.seed:
+            # 快照屬於另一個種子，預先生成的房間不再適用
+            self.seed = seed
+            self._discard_prefetched()
+        self.depth_keys = dict(depth_keys)
+        self.room_progress = {
+            depth: dict(rooms) for depth, rooms in room_progress.items()
+        }
+        self.player_keys = set(player_keys)
+
+        room = self.current_room
+        if room is not None:
+            (
+                room.boss_defeated,
+                room.has_key,
+                room.is_locked,
+                objects,
+                spatial_index,
+            ) = room_state
+            for obj, state in objects:
+                obj.restore_state(state)
+            room.spatial_index.restore(spatial_index)
+            room._objects_cache = None
+
+    def schedule_prefetch(self) -> None:
+        """預先生成玩家接下來可能進入的房間"""
+        if not self.prefetch_enabled:
+            return
+
+        # 地表入口會直接進入最深可到達的層數
+        next_depth = min(self.max_unlocked_depth, CAVE_CONFIG["max_depth"])
+        self.prefetch_room(next_depth, 0)
+
+        # 洞穴中的下一個房間
+        if self.in_cave:
+            next_room_id = self.current_room_id + 1
+            if next_room_id < CAVE_CONFIG["rooms_per_level"]:
+                self.prefetch_room(self.current_depth, next_room_id)
+
+    def prefetch_room(self, depth: int, room_id: int = 0) -> None:
+        """
+        在背景執行緒生成指定房間
+
+        Args:
+            depth (int): 深度
+            room_id (int): 房間編號
+        """
+        key = (depth, room_id)
+        with self._prefetch_condition:
+            if key in self._prefetched_rooms or key in self._prefetch_pending:
+                return
+            self._prefetch_pending.add(key)
+            generation = self._generation
+
+        if self._prefetch_thread is None or not self._prefetch_thread.is_alive():
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch_worker, name="cave-prefetch", daemon=True
+            )
+            self._prefetch_thread.start()
+        self._prefetch_queue.put((generation, key))
+
+    def _prefetch_worker(self) -> None:
+        """背景執行緒 - 依序生成排隊中的房間"""
+        while True:
+            generation, key = self._prefetch_queue.get()
+            with self._prefetch_condition:
+                if generation != self._generation:
+                    continue  # 排隊期間已經重設，不必生成
+
+            try:
+                room = self._build_room(*key)
+            except Exception as e:
+                print(f"⚠️ 預先生成第{key[0]}層第{key[1]}號房間失敗: {e}")
+                room = None
+
+            with self._prefetch_condition:
+                if generation != self._generation:
+                    continue  # 生成期間已經重設，舊房間直接丟棄
+                self._prefetch_pending.discard(key)
+                if room is not None:
+                    self._prefetched_rooms[key] = room
+                    # 只保留最近生成的幾間房間
+                    while (
+                        len(self._prefetched_rooms) > CAVE_CONFIG["prefetch_cache_size"]
+                    ):
+                        oldest = next(iter(self._prefetched_rooms))
+                        del self._prefetched_rooms[oldest]
+                self._prefetch_condition.notify_all()
+
+    def _take_prefetched_room(self, depth: int, room_id: int) -> Optional[CaveRoom]:
+        """
+        取出已預先生成的房間，正在生成中的房間會等待完成
+
+        Returns:
+            Optional[CaveRoom]: 預先生成的房間，沒有時為 None
+        """
+        key = (depth, room_id)
+        with self._prefetch_condition:
+            while key in self._prefetch_pending:
+                self._prefetch_condition.wait()
+            return self._prefetched_rooms.pop(key, None)
+
+    def _build_room(self, depth: int, room_id: int) -> CaveRoom:
+        """生成房間（與背景執行緒互斥）"""
+        with self._generation_lock:
+            return self._generate_cave_room(depth, room_id)
+
     def enter_cave(self, depth: int = 1, room_id: int = 0) -> CaveRoom:
         """進入地下城 - 檢查鑰匙權限和房間進度"""
         # 檢查是否有權限進入此深度
@@ -1248,8 +1457,13 @@ class CaveSystem:
         self.in_cave = True
         self.current_depth = depth
         self.current_room_id = room_id
-        self.current_room = self._generate_cave_room(depth, room_id)
+        # 優先使用背景執行緒已生成的房間，沒有時才同步生成
+        room = self._take_prefetched_room(depth, room_id)
+        if room is None:
+            room = self._build_room(depth, room_id)
+        self.current_room = room
         print(f"🏰 進入地下城第 {depth} 層第 {room_id} 號房間！")
+        self.schedule_prefetch()
         return self.current_room
 
     def exit_cave(self) -> None:
@@ -1260,12 +1474,14 @@ class CaveSystem:
         self.current_room_id = 0
         self.player_torch_time = 0
         print("🌅 返回地表")
+        self.schedule_prefetch()
 
     def unlock_next_depth(self, depth: int) -> bool:
         """解鎖下一層深度"""
         if depth >= self.max_unlocked_depth:
             self.max_unlocked_depth = depth + 1
             print(f"🗝️ 解鎖了第{depth + 1}層地下城！")
+            self.schedule_prefetch()
             return True
         return False
 
@@ -1325,6 +1541,10 @@ class CaveSystem:
         """生成地下城房間 - 高密度闖關風格"""
         print(f"🏗️ 生成第{depth}層第{room_id}號房間...")
 
+        # 每間房間使用由 (種子, 深度, 房間編號) 決定的亂數產生器，
+        # 不論在背景執行緒或主執行緒生成，結果都相同，也不會動到全域 random
+        self._room_rng = random.Random(f"{self.seed}:{depth}:{room_id}")
+
         # 根據房間編號確定房間類型
         room_type = self._determine_room_type_by_id(depth, room_id)
 
@@ -1421,6 +1641,7 @@ class CaveSystem:
             room.boss = CaveBoss(boss_x, boss_y, depth)
             print(f"第{depth}層地下城守護者就位於 ({boss_x}, {boss_y})")
 
+        room.build_index()
         return room
 
     def _ensure_objects_around_spawn(
@@ -1439,8 +1660,10 @@ class CaveSystem:
         monster_types = ["cave_monster", "cave_spider"]
 
         for i in range(monsters_around_spawn):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(80, spawn_radius)  # 不要太近，但要在可見範圍內
+            angle = self._room_rng.uniform(0, 2 * math.pi)
+            distance = self._room_rng.uniform(
+                80, spawn_radius
+            )  # 不要太近，但要在可見範圍內
 
             x = spawn_x + distance * math.cos(angle)
             y = spawn_y + distance * math.sin(angle)
@@ -1449,15 +1672,15 @@ class CaveSystem:
             x = max(30, min(x, room.width - 80))
             y = max(30, min(y, room.height - 80))
 
-            monster_type = random.choice(monster_types)
+            monster_type = self._room_rng.choice(monster_types)
             room.monsters.append(CaveMonster(x, y, monster_type))
 
         # 在出生點周圍生成寶箱
         treasures_around_spawn = max(5, treasure_count // 3)
 
         for i in range(treasures_around_spawn):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(60, spawn_radius)
+            angle = self._room_rng.uniform(0, 2 * math.pi)
+            distance = self._room_rng.uniform(60, spawn_radius)
 
             x = spawn_x + distance * math.cos(angle)
             y = spawn_y + distance * math.sin(angle)
@@ -1465,15 +1688,17 @@ class CaveSystem:
             x = max(40, min(x, room.width - 90))
             y = max(40, min(y, room.height - 90))
 
-            room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+            room.treasures.append(
+                TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+            )
 
         # 補充剩餘的物件到房間其他位置
         remaining_monsters = monster_count - monsters_around_spawn
         for i in range(remaining_monsters):
             attempts = 0
             while attempts < 50:
-                x = random.randint(30, room.width - 80)
-                y = random.randint(30, room.height - 80)
+                x = self._room_rng.randint(30, room.width - 80)
+                y = self._room_rng.randint(30, room.height - 80)
 
                 # 避免與Boss重疊
                 if room.boss:
@@ -1484,7 +1709,7 @@ class CaveSystem:
                         attempts += 1
                         continue
 
-                monster_type = random.choice(monster_types)
+                monster_type = self._room_rng.choice(monster_types)
                 room.monsters.append(CaveMonster(x, y, monster_type))
                 break
 
@@ -1495,10 +1720,12 @@ class CaveSystem:
         for i in range(remaining_treasures):
             attempts = 0
             while attempts < 50:
-                x = random.randint(20, room.width - 70)
-                y = random.randint(20, room.height - 70)
+                x = self._room_rng.randint(20, room.width - 70)
+                y = self._room_rng.randint(20, room.height - 70)
 
-                room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+                room.treasures.append(
+                    TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+                )
                 break
 
     def _determine_room_type_by_id(self, depth: int, room_id: int) -> str:
@@ -1508,13 +1735,13 @@ class CaveSystem:
         if room_id == 0:
             # 第一個房間：標準戰鬥房間或特殊房間
             room_types = ["standard", "elite_chamber", "maze"]
-            return random.choice(room_types)
+            return self._room_rng.choice(room_types)
         elif room_id == 1:
             # 第二個房間：資源或特殊功能房間
-            if random.random() < CAVE_CONFIG["enchanting_room_chance"]:
+            if self._room_rng.random() < CAVE_CONFIG["enchanting_room_chance"]:
                 return "enchanting_room"
             room_types = ["treasure_room", "armory", "puzzle_room"]
-            return random.choice(room_types)
+            return self._room_rng.choice(room_types)
         elif room_id == 2:
             # 第三個房間：Boss房間
             return "boss_chamber"
@@ -1535,11 +1762,11 @@ class CaveSystem:
         elif depth >= 5:
             special_chance *= 1.5
 
-        if random.random() < special_chance:
+        if self._room_rng.random() < special_chance:
             # 排除標準房間，選擇特殊房間
             special_rooms = [rt for rt in room_types if rt != "standard"]
             if special_rooms:
-                return random.choice(special_rooms)
+                return self._room_rng.choice(special_rooms)
 
         return "standard"
 
@@ -1553,8 +1780,8 @@ class CaveSystem:
             return (3 * room.width // 4, room.height // 2)
         else:
             # 其他房間：隨機位置，但不在邊緣
-            x = random.randint(room.width // 4, 3 * room.width // 4)
-            y = random.randint(room.height // 4, 3 * room.height // 4)
+            x = self._room_rng.randint(room.width // 4, 3 * room.width // 4)
+            y = self._room_rng.randint(room.height // 4, 3 * room.height // 4)
             return (x, y)
 
     def _generate_dungeon_objects(
@@ -1567,6 +1794,24 @@ class CaveSystem:
         depth: int,
     ) -> None:
         """根據房間類型生成地下城物件 - 支援新房間類型"""
+        # 整個房間共用一個取樣器，怪物、寶箱、礦物之間都保持最小間距
+        border = 30
+        total_count = monster_count + treasure_count + mineral_count
+        spacing = spacing_for_count(
+            room.width - 2 * border,
+            room.height - 2 * border,
+            total_count,
+            CAVE_CONFIG["object_spacing"],
+        )
+        self._room_sampler = PoissonDiskSampler(
+            border,
+            border,
+            room.width - 2 * border,
+            room.height - 2 * border,
+            spacing,
+            rng=self._room_rng,
+        )
+
         if room_type == "treasure_room":
             self._generate_treasure_room(room, treasure_count, mineral_count)
         elif room_type == "boss_chamber":
@@ -1598,6 +1843,49 @@ class CaveSystem:
                 room, monster_count, treasure_count, mineral_count, depth
             )
 
+    def _scatter_positions(
+        self,
+        room: CaveRoom,
+        count: int,
+        margin: int,
+        predicate: Optional[Callable[[float, float], bool]] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        從房間取樣器取出分散且互不重疊的位置
+
+        Args:
+            room (CaveRoom): 目標房間
+            count (int): 需要的位置數量
+            margin (int): 與房間邊緣的距離
+            predicate (Callable): 額外的位置條件
+
+        Returns:
+            List[Tuple[float, float]]: 位置列表；條件太嚴格時可能少於 count
+        """
+
+        def is_valid(x: float, y: float) -> bool:
+            if not (margin <= x <= room.width - margin):
+                return False
+            if not (margin <= y <= room.height - margin):
+                return False
+            return predicate is None or predicate(x, y)
+
+        positions = self._room_sampler.take(count, is_valid)
+
+        # 取樣點用完時（條件太嚴格），退回隨機位置補足物件數量；
+        # 嘗試次數有上限，條件幾乎無法滿足時接受較少的物件，不會卡住房間生成
+        if margin > room.width - margin or margin > room.height - margin:
+            return positions
+        attempts = (count - len(positions)) * CAVE_CONFIG["scatter_fallback_attempts"]
+        for _ in range(attempts):
+            if len(positions) >= count:
+                break
+            x = self._room_rng.randint(margin, room.width - margin)
+            y = self._room_rng.randint(margin, room.height - margin)
+            if predicate is None or predicate(x, y):
+                positions.append((x, y))
+        return positions
+
     def _generate_standard_room(
         self,
         room: CaveRoom,
@@ -1615,39 +1903,34 @@ class CaveSystem:
             monster_types.append("shadow_beast")
 
         # 高密度怪物生成
-        for _ in range(monster_count):
-            x = random.randint(50, room.width - 50)
-            y = random.randint(50, room.height - 50)
-            monster_type = random.choice(monster_types)
+        for x, y in self._scatter_positions(room, monster_count, 50):
+            monster_type = self._room_rng.choice(monster_types)
 
             # 小機率生成精英怪物
-            if random.random() < CAVE_CONFIG["elite_monster_rate"]:
-                elite_type = random.choice(["elite_skeleton", "shadow_beast"])
+            if self._room_rng.random() < CAVE_CONFIG["elite_monster_rate"]:
+                elite_type = self._room_rng.choice(["elite_skeleton", "shadow_beast"])
                 room.monsters.append(EliteMonster(x, y, elite_type, depth))
             else:
                 room.monsters.append(CaveMonster(x, y, monster_type))
 
         # 多種寶箱類型
-        for _ in range(treasure_count):
-            x = random.randint(40, room.width - 40)
-            y = random.randint(40, room.height - 40)
-
+        for x, y in self._scatter_positions(room, treasure_count, 40):
             # 根據深度決定寶箱類型
             if depth >= 15:
-                chest_type = random.choice(
+                chest_type = self._room_rng.choice(
                     ["treasure_chest", "epic_chest", "legendary_chest"]
                 )
             elif depth >= 10:
-                chest_type = random.choice(["treasure_chest", "epic_chest"])
+                chest_type = self._room_rng.choice(["treasure_chest", "epic_chest"])
             else:
                 chest_type = "treasure_chest"
 
-            room.treasures.append(TreasureChest(x, y, chest_type, room.depth))
+            room.treasures.append(
+                TreasureChest(x, y, chest_type, room.depth, self._room_rng)
+            )
 
         # 大量礦物資源
-        for _ in range(mineral_count):
-            x = random.randint(30, room.width - 30)
-            y = random.randint(30, room.height - 30)
+        for x, y in self._scatter_positions(room, mineral_count, 30):
             room.minerals.append(Rock(x, y))
 
         # 添加鎖門（除了第一個房間）
@@ -1665,16 +1948,16 @@ class CaveSystem:
         # 寶箱集中在房間中央區域
         center_x, center_y = room.width // 2, room.height // 2
         for _ in range(treasure_count):
-            x = center_x + random.randint(-100, 100)
-            y = center_y + random.randint(-80, 80)
+            x = center_x + self._room_rng.randint(-100, 100)
+            y = center_y + self._room_rng.randint(-80, 80)
             x = max(40, min(x, room.width - 40))
             y = max(40, min(y, room.height - 40))
-            room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+            room.treasures.append(
+                TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+            )
 
         # 少量強力守衛
-        for _ in range(max(1, treasure_count // 3)):
-            x = random.randint(50, room.width - 50)
-            y = random.randint(50, room.height - 50)
+        for x, y in self._scatter_positions(room, max(1, treasure_count // 3), 50):
             room.monsters.append(CaveMonster(x, y, "cave_monster"))
 
     def _generate_enchanting_room(
@@ -1692,25 +1975,27 @@ class CaveSystem:
 
         # 少量精英守護怪物
         guardian_count = max(1, monster_count // 4)
-        for _ in range(guardian_count):
-            x = random.randint(100, room.width - 100)
-            y = random.randint(100, room.height - 100)
+
+        def away_from_table(x: float, y: float) -> bool:
             # 確保不會太靠近附魔台
-            if abs(x - enchanting_x) < 80 and abs(y - enchanting_y) < 80:
-                continue
+            return abs(x - enchanting_x) >= 80 or abs(y - enchanting_y) >= 80
+
+        for x, y in self._scatter_positions(room, guardian_count, 100, away_from_table):
             room.monsters.append(EliteMonster(x, y, "elite_skeleton", room.depth))
 
         # 少量高品質寶箱
-        for _ in range(treasure_count // 2):
-            x = random.randint(60, room.width - 60)
-            y = random.randint(60, room.height - 60)
+        for x, y in self._scatter_positions(
+            room, treasure_count // 2, 60, away_from_table
+        ):
             chest_type = "epic_chest" if room.depth >= 10 else "treasure_chest"
-            room.treasures.append(TreasureChest(x, y, chest_type, room.depth))
+            room.treasures.append(
+                TreasureChest(x, y, chest_type, room.depth, self._room_rng)
+            )
 
         # 一些魔法礦物
-        for _ in range(mineral_count // 2):
-            x = random.randint(40, room.width - 40)
-            y = random.randint(40, room.height - 40)
+        for x, y in self._scatter_positions(
+            room, mineral_count // 2, 40, away_from_table
+        ):
             room.minerals.append(Rock(x, y))  # 可以是魔法礦物
 
         print("✨ 生成附魔房間完成！")
@@ -1728,29 +2013,27 @@ class CaveSystem:
 
         # 生成精英怪物（數量少但強大）
         elite_count = max(2, monster_count // 2)
-        for _ in range(elite_count):
-            x = random.randint(80, room.width - 80)
-            y = random.randint(80, room.height - 80)
-            elite_type = random.choice(elite_types)
+        for x, y in self._scatter_positions(room, elite_count, 80):
+            elite_type = self._room_rng.choice(elite_types)
             room.monsters.append(EliteMonster(x, y, elite_type, depth))
 
         # 可能有小Boss
-        if random.random() < CAVE_CONFIG["mini_boss_rate"]:
-            boss_x = room.width // 2 + random.randint(-100, 100)
-            boss_y = room.height // 2 + random.randint(-100, 100)
+        if self._room_rng.random() < CAVE_CONFIG["mini_boss_rate"]:
+            boss_x = room.width // 2 + self._room_rng.randint(-100, 100)
+            boss_y = room.height // 2 + self._room_rng.randint(-100, 100)
             room.mini_boss = CaveBoss(boss_x, boss_y, depth)
 
         # 高品質獎勵
-        for _ in range(treasure_count):
-            x = random.randint(50, room.width - 50)
-            y = random.randint(50, room.height - 50)
+        for x, y in self._scatter_positions(room, treasure_count, 50):
             if depth >= 15:
                 chest_type = "legendary_chest"
             elif depth >= 10:
                 chest_type = "epic_chest"
             else:
                 chest_type = "treasure_chest"
-            room.treasures.append(TreasureChest(x, y, chest_type, depth))
+            room.treasures.append(
+                TreasureChest(x, y, chest_type, depth, self._room_rng)
+            )
 
         print("⭐ 生成精英房間完成！")
 
@@ -1772,8 +2055,8 @@ class CaveSystem:
         monsters_per_group = monster_count // 3
         for center_x, center_y in group_centers:
             for _ in range(monsters_per_group):
-                x = center_x + random.randint(-60, 60)
-                y = center_y + random.randint(-60, 60)
+                x = center_x + self._room_rng.randint(-60, 60)
+                y = center_y + self._room_rng.randint(-60, 60)
                 x = max(50, min(room.width - 50, x))
                 y = max(50, min(room.height - 50, y))
                 room.monsters.append(CaveMonster(x, y, "cave_monster"))
@@ -1781,9 +2064,11 @@ class CaveSystem:
         # 中央獎勵區域
         center_x, center_y = room.width // 2, room.height // 2
         for _ in range(treasure_count):
-            x = center_x + random.randint(-40, 40)
-            y = center_y + random.randint(-40, 40)
-            room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+            x = center_x + self._room_rng.randint(-40, 40)
+            y = center_y + self._room_rng.randint(-40, 40)
+            room.treasures.append(
+                TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+            )
 
         print("🧩 生成謎題房間完成！")
 
@@ -1797,13 +2082,10 @@ class CaveSystem:
     ) -> None:
         """生成軍械庫 - 大量高級裝備但有重兵把守"""
         # 重兵把守
-        for _ in range(monster_count):
-            x = random.randint(60, room.width - 60)
-            y = random.randint(60, room.height - 60)
-
+        for x, y in self._scatter_positions(room, monster_count, 60):
             # 軍械庫多為精英守衛
-            if random.random() < 0.6:
-                elite_type = random.choice(["elite_skeleton", "shadow_beast"])
+            if self._room_rng.random() < 0.6:
+                elite_type = self._room_rng.choice(["elite_skeleton", "shadow_beast"])
                 room.monsters.append(EliteMonster(x, y, elite_type, depth))
             else:
                 room.monsters.append(CaveMonster(x, y, "cave_monster"))
@@ -1826,18 +2108,20 @@ class CaveSystem:
 
                 # 軍械庫多為裝備類寶箱
                 if depth >= 15:
-                    chest_type = random.choice(["epic_chest", "legendary_chest"])
+                    chest_type = self._room_rng.choice(
+                        ["epic_chest", "legendary_chest"]
+                    )
                 elif depth >= 10:
                     chest_type = "epic_chest"
                 else:
                     chest_type = "treasure_chest"
 
-                room.treasures.append(TreasureChest(x, y, chest_type, depth))
+                room.treasures.append(
+                    TreasureChest(x, y, chest_type, depth, self._room_rng)
+                )
 
         # 一些稀有礦物
-        for _ in range(mineral_count // 2):
-            x = random.randint(50, room.width - 50)
-            y = random.randint(50, room.height - 50)
+        for x, y in self._scatter_positions(room, mineral_count // 2, 50):
             room.minerals.append(Rock(x, y))
 
         print("⚔️ 生成軍械庫完成！")
@@ -1852,13 +2136,13 @@ class CaveSystem:
         """生成Boss房間 - 有少量小怪和豐富獎勵"""
         # Boss房間可能有少量小怪
         minion_count = max(2, monster_count // 3)
-        for _ in range(minion_count):
-            x = random.randint(80, room.width - 80)
-            y = random.randint(80, room.height - 80)
+        center_x, center_y = room.width // 2, room.height // 2
+
+        def away_from_boss(x: float, y: float) -> bool:
             # 避免太靠近中央（Boss位置）
-            center_x, center_y = room.width // 2, room.height // 2
-            if abs(x - center_x) < 100 and abs(y - center_y) < 100:
-                continue
+            return abs(x - center_x) >= 100 or abs(y - center_y) >= 100
+
+        for x, y in self._scatter_positions(room, minion_count, 80, away_from_boss):
             room.monsters.append(CaveMonster(x, y, "cave_monster"))
 
         # Boss戰勝後的豐富獎勵
@@ -1879,12 +2163,14 @@ class CaveSystem:
                 chest_type = "epic_chest"
             else:
                 chest_type = "treasure_chest"
-            room.treasures.append(TreasureChest(x, y, chest_type, room.depth))
+            room.treasures.append(
+                TreasureChest(x, y, chest_type, room.depth, self._room_rng)
+            )
 
         # 一些稀有礦物
-        for _ in range(mineral_count // 2):
-            x = random.randint(60, room.width - 60)
-            y = random.randint(60, room.height - 60)
+        for x, y in self._scatter_positions(
+            room, mineral_count // 2, 60, away_from_boss
+        ):
             room.minerals.append(Rock(x, y))
 
         print("👑 生成Boss房間完成！")
@@ -1898,54 +2184,57 @@ class CaveSystem:
     ) -> None:
         """生成迷宮房間 - 礦物較多，怪物分散"""
         # 礦物形成"牆壁"般的分佈
-        for _ in range(mineral_count):
-            if random.random() < 0.3:  # 30%機率在邊緣
-                if random.random() < 0.5:
-                    x = random.choice(
-                        [
-                            random.randint(20, 60),
-                            random.randint(room.width - 60, room.width - 20),
-                        ]
-                    )
-                    y = random.randint(30, room.height - 30)
-                else:
-                    x = random.randint(30, room.width - 30)
-                    y = random.choice(
-                        [
-                            random.randint(20, 60),
-                            random.randint(room.height - 60, room.height - 20),
-                        ]
-                    )
+        edge_count = sum(
+            1 for _ in range(mineral_count) if self._room_rng.random() < 0.3
+        )
+        for _ in range(edge_count):  # 30%機率在邊緣
+            if self._room_rng.random() < 0.5:
+                x = self._room_rng.choice(
+                    [
+                        self._room_rng.randint(20, 60),
+                        self._room_rng.randint(room.width - 60, room.width - 20),
+                    ]
+                )
+                y = self._room_rng.randint(30, room.height - 30)
             else:
-                x = random.randint(30, room.width - 30)
-                y = random.randint(30, room.height - 30)
+                x = self._room_rng.randint(30, room.width - 30)
+                y = self._room_rng.choice(
+                    [
+                        self._room_rng.randint(20, 60),
+                        self._room_rng.randint(room.height - 60, room.height - 20),
+                    ]
+                )
+            room.minerals.append(Rock(x, y))
+
+        # 其餘礦物分散在房間內部
+        for x, y in self._scatter_positions(room, mineral_count - edge_count, 30):
             room.minerals.append(Rock(x, y))
 
         # 少量怪物分散放置
-        for _ in range(monster_count):
-            x = random.randint(60, room.width - 60)
-            y = random.randint(60, room.height - 60)
+        for x, y in self._scatter_positions(room, monster_count, 60):
             room.monsters.append(CaveMonster(x, y, "cave_monster"))
 
         # 寶箱隱藏在角落
         for _ in range(treasure_count):
             corner_areas = [
-                (random.randint(20, 80), random.randint(20, 80)),
+                (self._room_rng.randint(20, 80), self._room_rng.randint(20, 80)),
                 (
-                    random.randint(room.width - 80, room.width - 20),
-                    random.randint(20, 80),
+                    self._room_rng.randint(room.width - 80, room.width - 20),
+                    self._room_rng.randint(20, 80),
                 ),
                 (
-                    random.randint(20, 80),
-                    random.randint(room.height - 80, room.height - 20),
+                    self._room_rng.randint(20, 80),
+                    self._room_rng.randint(room.height - 80, room.height - 20),
                 ),
                 (
-                    random.randint(room.width - 80, room.width - 20),
-                    random.randint(room.height - 80, room.height - 20),
+                    self._room_rng.randint(room.width - 80, room.width - 20),
+                    self._room_rng.randint(room.height - 80, room.height - 20),
                 ),
             ]
-            x, y = random.choice(corner_areas)
-            room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+            x, y = self._room_rng.choice(corner_areas)
+            room.treasures.append(
+                TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+            )
 
     def _generate_trap_room(
         self,
@@ -1958,7 +2247,9 @@ class CaveSystem:
         # 中央有誘人的寶箱
         center_x, center_y = room.width // 2, room.height // 2
         room.treasures.append(
-            TreasureChest(center_x, center_y, "treasure_chest", room.depth)
+            TreasureChest(
+                center_x, center_y, "treasure_chest", room.depth, self._room_rng
+            )
         )
 
         # 周圍有守衛怪物
@@ -1973,10 +2264,10 @@ class CaveSystem:
             room.monsters.append(CaveMonster(x, y, "cave_monster"))
 
         # 其餘寶箱分散放置
-        for _ in range(treasure_count - 1):
-            x = random.randint(40, room.width - 40)
-            y = random.randint(40, room.height - 40)
-            room.treasures.append(TreasureChest(x, y, "treasure_chest", room.depth))
+        for x, y in self._scatter_positions(room, treasure_count - 1, 40):
+            room.treasures.append(
+                TreasureChest(x, y, "treasure_chest", room.depth, self._room_rng)
+            )
 
     def update(self, delta_time: float, player: "Player") -> List[str]:
         """更新洞穴系統 - 包含Boss戰邏輯"""
@@ -2015,6 +2306,7 @@ class CaveSystem:
                 self.current_room.boss.update(
                     delta_time, player_center_x, player_center_y, player_in_darkness
                 )
+                self.current_room.update_object(self.current_room.boss)
 
                 # 檢查Boss主動攻擊
                 if self.current_room.boss.can_attack():
@@ -2033,6 +2325,7 @@ class CaveSystem:
                     monster.update(
                         delta_time, player_center_x, player_center_y, player_in_darkness
                     )
+                    self.current_room.update_object(monster)
 
                     # 檢查怪物主動攻擊
                     if monster.can_attack():
@@ -2083,11 +2376,9 @@ class CaveSystem:
         # 繪製黑暗遮罩
         darkness_alpha = int(darkness_level * 200)  # 0-200的透明度
         if darkness_alpha > 0:
-            dark_surface = pygame.Surface(
-                (WINDOW_CONFIG["width"], WINDOW_CONFIG["height"])
+            dark_surface = lighting.get_darkness_overlay(
+                (WINDOW_CONFIG["width"], WINDOW_CONFIG["height"]), darkness_alpha
             )
-            dark_surface.set_alpha(darkness_alpha)
-            dark_surface.fill((0, 0, 0))
             screen.blit(dark_surface, (0, 0))
 
         # 繪製洞穴物件（只繪製視線範圍內的）
@@ -2134,8 +2425,26 @@ class CaveSystem:
                     light_alpha,
                 )
 
+        # 相機模式只取照明範圍內的候選物件
+        monsters = self.current_room.monsters
+        treasures = self.current_room.treasures
+        if camera:
+            player_world_x, player_world_y = camera.screen_to_world(
+                player_screen_x, player_screen_y
+            )
+            nearby = self.current_room.spatial_index.query(
+                player_world_x, player_world_y, light_radius + 1
+            )
+            treasures = [obj for obj in nearby if isinstance(obj, TreasureChest)]
+            monsters = [
+                obj
+                for obj in nearby
+                if obj is not self.current_room.boss
+                and not isinstance(obj, TreasureChest)
+            ]
+
         # 繪製普通怪物（視線範圍限制）
-        for monster in self.current_room.monsters:
+        for monster in monsters:
             if monster.active:
                 if camera:
                     if camera.is_visible(
@@ -2164,7 +2473,7 @@ class CaveSystem:
                     monster.draw(screen, light_alpha)
 
         # 繪製寶箱（視線範圍限制）
-        for treasure in self.current_room.treasures:
+        for treasure in treasures:
             if treasure.active:
                 if camera:
                     if camera.is_visible(
@@ -2194,20 +2503,8 @@ class CaveSystem:
 
         # 繪製照明範圍指示器（可選）
         if self.player_torch_time > 0:
-            # 繪製光圈效果
-            light_surface = pygame.Surface(
-                (light_radius * 2, light_radius * 2), pygame.SRCALPHA
-            )
-            # 從中心到邊緣的漸變光暈
-            for r in range(int(light_radius), 0, -5):
-                alpha = int(30 * (r / light_radius))  # 漸變透明度
-                pygame.draw.circle(
-                    light_surface,
-                    (255, 255, 150, alpha),
-                    (int(light_radius), int(light_radius)),
-                    r,
-                )
-
+            # 繪製光圈效果（預先繪製的漸變光暈）
+            light_surface = lighting.get_light_mask(light_radius, 30)
             screen.blit(
                 light_surface,
                 (player_screen_x - light_radius, player_screen_y - light_radius),
@@ -2460,10 +2757,7 @@ class CaveSystem:
             for i in range(3):
                 radius = 30 + i * 20
                 alpha = 50 - i * 15
-                glow_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(
-                    glow_surface, (*accent_color, alpha), (radius, radius), radius
-                )
+                glow_surface = lighting.get_glow_circle(radius, accent_color, alpha)
                 screen.blit(glow_surface, (screen_x - radius, screen_y - radius))
 
     def _draw_boss_chamber_effects(
@@ -2483,8 +2777,7 @@ class CaveSystem:
         ):
             # 脈動效果（隨時間變化）
             pulse = int(50 + 30 * math.sin(time.time() * 2))
-            danger_surface = pygame.Surface((200, 200), pygame.SRCALPHA)
-            pygame.draw.circle(danger_surface, (*accent_color, pulse), (100, 100), 100)
+            danger_surface = lighting.get_glow_circle(100, accent_color, pulse)
             screen.blit(danger_surface, (screen_x - 100, screen_y - 100))
 
     def _draw_maze_effects(
@@ -2508,8 +2801,7 @@ class CaveSystem:
                 0 <= screen_x <= WINDOW_CONFIG["width"]
                 and 0 <= screen_y <= WINDOW_CONFIG["height"]
             ):
-                mystery_surface = pygame.Surface((60, 60), pygame.SRCALPHA)
-                pygame.draw.circle(mystery_surface, (*accent_color, 40), (30, 30), 30)
+                mystery_surface = lighting.get_glow_circle(30, accent_color, 40)
                 screen.blit(mystery_surface, (screen_x - 30, screen_y - 30))
 
     def _draw_trap_room_effects(
@@ -2533,8 +2825,7 @@ class CaveSystem:
                 0 <= screen_x <= WINDOW_CONFIG["width"]
                 and 0 <= screen_y <= WINDOW_CONFIG["height"]
             ):
-                warning_surface = pygame.Surface((40, 40), pygame.SRCALPHA)
-                pygame.draw.circle(warning_surface, (*accent_color, 60), (20, 20), 20)
+                warning_surface = lighting.get_glow_circle(20, accent_color, 60)
                 screen.blit(warning_surface, (screen_x - 20, screen_y - 20))
 
     def _draw_corner_decorations(
@@ -2583,23 +2874,29 @@ class CaveSystem:
                         )
 
     def get_cave_objects(self) -> List[GameObject]:
-        """獲取當前洞穴中的所有物件 - 包含Boss"""
+        """獲取當前洞穴中的所有物件 - 包含Boss（共用的快取列表，請勿修改）"""
         if not self.in_cave or not self.current_room:
             return []
 
-        objects = []
+        return self.current_room.get_objects()
 
-        # 加入Boss（優先級最高）
-        if self.current_room.boss and self.current_room.boss.active:
-            objects.append(self.current_room.boss)
+    def get_nearby_cave_objects(
+        self, x: float, y: float, radius: float
+    ) -> List[GameObject]:
+        """
+        獲取當前洞穴中指定範圍內的物件
 
-        # 加入普通怪物
-        objects.extend([m for m in self.current_room.monsters if m.active])
+        Args:
+            x, y (float): 中心座標
+            radius (float): 搜尋半徑
 
-        # 加入寶箱
-        objects.extend([t for t in self.current_room.treasures if t.active])
+        Returns:
+            List[GameObject]: 依Boss、怪物、寶箱排列的物件列表
+        """
+        if not self.in_cave or not self.current_room:
+            return []
 
-        return objects
+        return self.current_room.get_nearby_objects(x, y, radius)
 
     def handle_boss_death(self, depth: int) -> None:
         """處理Boss死亡事件"""
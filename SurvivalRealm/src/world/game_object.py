@@ -9,7 +9,8 @@ Survival Realm - 遊戲物件基礎類
 
 import pygame
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, TYPE_CHECKING
+from operator import attrgetter
+from typing import Callable, Optional, Dict, Tuple, TYPE_CHECKING
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -19,6 +20,14 @@ if TYPE_CHECKING:
 class GameObject(ABC):
     """遊戲物件基礎類 - 所有世界物件的父類"""
 
+    # 快照記錄的可變欄位，子類別在後面追加自己會改變的狀態
+    SNAPSHOT_FIELDS: Tuple[str, ...] = ("x", "y", "active")
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # 每個類別預先建立一次欄位讀取器，快照時一次取出所有欄位
+        cls._snapshot_getter = attrgetter(*cls.SNAPSHOT_FIELDS)
+
     def __init__(self, x: float, y: float, width: int, height: int):
         """
         初始化遊戲物件
@@ -35,6 +44,8 @@ class GameObject(ABC):
         self.height = height
         self.rect = pygame.Rect(x, y, width, height)
         self.active = True  # 物件是否處於活躍狀態
+        # 銷毀時通知所屬的管理器，讓管理器不必每幀掃描所有物件
+        self.on_destroy: Optional[Callable[["GameObject"], None]] = None
 
     @abstractmethod
     def draw(self, screen: pygame.Surface) -> None:
@@ -94,6 +105,26 @@ class GameObject(ABC):
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
 
+    def snapshot_state(self) -> tuple:
+        """
+        取得物件可變狀態的快照
+
+        Returns:
+            tuple: 依 SNAPSHOT_FIELDS 順序排列的欄位值
+        """
+        return self._snapshot_getter(self)
+
+    def restore_state(self, state: tuple) -> None:
+        """
+        還原 snapshot_state 取得的狀態
+
+        Args:
+            state (tuple): 物件狀態快照
+        """
+        for name, value in zip(self.SNAPSHOT_FIELDS, state):
+            setattr(self, name, value)
+        self.update_rect()
+
     def get_center(self) -> tuple:
         """獲取物件中心座標"""
         return (self.x + self.width // 2, self.y + self.height // 2)
@@ -126,4 +157,7 @@ class GameObject(ABC):
 
     def destroy(self) -> None:
         """銷毀物件"""
+        was_active = self.active
         self.active = False
+        if was_active and self.on_destroy:
+            self.on_destroy(self)
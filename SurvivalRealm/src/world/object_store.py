@@ -0,0 +1,179 @@
+"""
+Survival Realm - 世界物件容器
+以空位標記取代每幀重建列表，移除物件是 O(1)，只在空位比例過高時才批次壓縮
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+容器的核心概念：
+1. 物件存放在槽位列表中，移除時只把槽位設為 None
+2. 空位比例超過門檻時才一次壓縮，攤還後每次移除仍是 O(1)
+3. 每個物件有固定的編號（handle），壓縮後依然有效
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+from .game_object import GameObject
+
+
+class ObjectStore:
+    """世界物件容器 - 常數時間新增與移除，延遲批次壓縮"""
+
+    def __init__(
+        self, compaction_threshold: float = 0.25, min_compaction_size: int = 64
+    ) -> None:
+        """
+        初始化物件容器
+
+        Args:
+            compaction_threshold (float): 空位比例超過此值時壓縮
+            min_compaction_size (int): 槽位數量少於此值時不壓縮
+        """
+        self.compaction_threshold = compaction_threshold
+        self.min_compaction_size = min_compaction_size
+        self._slots: List[Optional[GameObject]] = []
+        self._slot_of: Dict[GameObject, int] = {}  # 物件目前所在槽位
+        self._handles: Dict[int, GameObject] = {}  # 固定編號 -> 物件
+        self._handle_of: Dict[GameObject, int] = {}
+        self._next_handle = 0
+        self._dead = 0  # 空位數量
+
+    def add(self, obj: GameObject) -> int:
+        """
+        加入物件
+
+        Args:
+            obj (GameObject): 要加入的物件
+
+        Returns:
+            int: 物件的固定編號
+        """
+        handle = self._handle_of.get(obj)
+        if handle is not None:
+            return handle
+
+        handle = self._next_handle
+        self._next_handle += 1
+        self._slot_of[obj] = len(self._slots)
+        self._slots.append(obj)
+        self._handles[handle] = obj
+        self._handle_of[obj] = handle
+        return handle
+
+    def remove(self, obj: GameObject) -> bool:
+        """
+        移除物件（只標記空位，不搬移其他物件）
+
+        Args:
+            obj (GameObject): 要移除的物件
+
+        Returns:
+            bool: 物件原本是否在容器中
+        """
+        slot = self._slot_of.pop(obj, None)
+        if slot is None:
+            return False
+
+        self._slots[slot] = None
+        self._dead += 1
+        del self._handles[self._handle_of.pop(obj)]
+        return True
+
+    def get(self, handle: int) -> Optional[GameObject]:
+        """
+        依固定編號取得物件
+
+        Args:
+            handle (int): 物件編號
+
+        Returns:
+            Optional[GameObject]: 物件，已移除時為 None
+        """
+        return self._handles.get(handle)
+
+    def handle_of(self, obj: GameObject) -> Optional[int]:
+        """取得物件的固定編號"""
+        return self._handle_of.get(obj)
+
+    @property
+    def dead_fraction(self) -> float:
+        """空位佔槽位的比例"""
+        return self._dead / len(self._slots) if self._slots else 0.0
+
+    def compact_if_needed(self) -> bool:
+        """
+        空位比例超過門檻時壓縮槽位
+
+        不可在迭代容器時呼叫
+
+        Returns:
+            bool: 是否進行了壓縮
+        """
+        if len(self._slots) < self.min_compaction_size:
+            if self._dead and self._dead == len(self._slots):
+                self.compact()  # 全部都是空位，直接清掉
+                return True
+            return False
+        if self.dead_fraction < self.compaction_threshold:
+            return False
+
+        self.compact()
+        return True
+
+    def compact(self) -> None:
+        """移除所有空位並更新槽位索引（原地進行，不配置新列表）"""
+        slots = self._slots
+        write = 0
+        for obj in slots:
+            if obj is not None:
+                slots[write] = obj
+                self._slot_of[obj] = write
+                write += 1
+        del slots[write:]
+        self._dead = 0
+
+    def snapshot(self) -> tuple:
+        """
+        取得容器內容的快照（保留物件順序與固定編號）
+
+        Returns:
+            tuple: ((物件, 編號), ...) 與下一個編號
+        """
+        handle_of = self._handle_of
+        entries = tuple((obj, handle_of[obj]) for obj in self)
+        return entries, self._next_handle
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的容器內容（還原後沒有空位）
+
+        Args:
+            snapshot (tuple): 容器快照
+        """
+        entries, self._next_handle = snapshot
+        self._slots = [obj for obj, _ in entries]
+        self._slot_of = {obj: slot for slot, (obj, _) in enumerate(entries)}
+        self._handle_of = dict(entries)
+        self._handles = {handle: obj for obj, handle in entries}
+        self._dead = 0
+
+    def clear(self) -> None:
+        """清空容器"""
+        self._slots.clear()
+        self._slot_of.clear()
+        self._handles.clear()
+        self._handle_of.clear()
+        self._dead = 0
+
+    def __iter__(self) -> Iterator[GameObject]:
+        # 迭代中新增的物件也會被走訪；被移除的槽位會跳過
+        for obj in self._slots:
+            if obj is not None:
+                yield obj
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, obj: GameObject) -> bool:
+        return obj in self._slot_of
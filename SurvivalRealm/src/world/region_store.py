@@ -0,0 +1,625 @@
+"""
+Survival Realm - 區域檔區塊儲存
+把卸載的地表區塊變化寫到磁碟上的區域檔，長時間遊玩時記憶體不會無限成長
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+區域檔的核心概念：
+1. 每個區域檔包含 region_size × region_size 個區塊，檔頭後接一張固定大小的偏移表
+2. 偏移表每個區塊一筆 (偏移, 長度)，長度為 0 表示區塊沒有記錄
+3. 記錄一律附加在檔案尾端，舊記錄變成空洞；空洞太多時整個檔案重寫壓縮
+4. 讀取透過 mmap，不需要把整個檔案讀進記憶體
+5. 寫入先放進待寫表（同一區塊只保留最新一筆），背景執行緒批次寫入，
+   每個區域檔一批只開啟一次
+6. 存檔時建立匯出視圖，記錄在背景執行緒讀取；讀完前被改寫的區塊先保留舊記錄，
+   讀到的內容仍是建立視圖當下的狀態
+"""
+
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Set, Tuple
+
+from .world_chunk import ChunkKey
+from ..core.config import WORLD_CONFIG
+from ..systems.save_manager import load_builtins
+
+REGION_MAGIC = b"SRRG"
+REGION_VERSION = 1
+
+# 檔頭: 識別碼、格式版本、區域邊長（區塊數）
+_HEADER = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<II")  # 偏移表的一筆: (偏移, 長度)
+
+# 每個世界的暫存資料夾記錄建立它的行程，讓之後啟動的遊戲能清掉當機留下的資料夾
+_OWNER_FILE = "owner.pid"
+_WORLD_PREFIX = "world-"
+# 無法檢查行程是否存在的平台上，超過這個時間沒更新的資料夾視為遺留
+_STALE_AGE = 24 * 60 * 60
+
+ChunkChanges = Tuple[List[int], Dict[int, Dict], List[Tuple[str, float, float]]]
+
+
+def encode_changes(changes: ChunkChanges) -> bytes:
+    """
+    把區塊變化編碼成一筆記錄
+
+    Args:
+        changes (ChunkChanges): (已移除編號, 狀態變化, 放置物件)
+
+    Returns:
+        bytes: 記錄內容
+    """
+    return pickle.dumps(changes, protocol=4)
+
+
+def decode_changes(record: bytes) -> ChunkChanges:
+    """
+    解碼 encode_changes 的記錄（只允許內建型別）
+
+    Args:
+        record (bytes): 記錄內容
+
+    Returns:
+        ChunkChanges: (已移除編號, 狀態變化, 放置物件)
+    """
+    return load_builtins(record)
+
+
+def _process_alive(pid: int) -> bool:
+    """檢查行程是否還在執行（只在 POSIX 平台使用）"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 行程存在但屬於其他使用者
+    except OSError:
+        return False
+    return True
+
+
+def _is_stale_world(path: str) -> bool:
+    """判斷世界暫存資料夾的擁有者是否已經結束"""
+    try:
+        with open(os.path.join(path, _OWNER_FILE)) as file:
+            pid = int(file.read().strip())
+    except (OSError, ValueError):
+        pid = None
+
+    if pid is not None and os.name == "posix":
+        return pid != os.getpid() and not _process_alive(pid)
+    # 沒有擁有者記錄（剛建立或寫入失敗）或無法檢查行程時，以修改時間判斷
+    try:
+        return time.time() - os.path.getmtime(path) > _STALE_AGE
+    except OSError:
+        return False
+
+
+def sweep_stale_worlds(root: str) -> int:
+    """
+    刪除當機或被強制結束的遊戲留下的世界暫存資料夾
+
+    Args:
+        root (str): 區域檔根資料夾
+
+    Returns:
+        int: 刪除的資料夾數量
+    """
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return 0
+
+    removed = 0
+    for name in names:
+        path = os.path.join(root, name)
+        if name.startswith(_WORLD_PREFIX) and os.path.isdir(path):
+            if _is_stale_world(path):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+    if removed:
+        print(f"🧹 清除 {removed} 個遺留的世界暫存資料夾")
+    return removed
+
+
+class _RegionFile:
+    """單一區域檔 - 偏移表、記錄讀寫與壓縮"""
+
+    def __init__(self, path: str, region_size: int) -> None:
+        """
+        開啟或建立區域檔
+
+        Args:
+            path (str): 檔案路徑
+            region_size (int): 區域邊長（區塊數）
+        """
+        self.path = path
+        self.region_size = region_size
+        self.table_offset = _HEADER.size
+        self.data_offset = _HEADER.size + region_size * region_size * _ENTRY.size
+        self.lock = threading.Lock()  # 讀取與寫入互斥（不同區域檔互不影響）
+        self._mmap: Optional[mmap.mmap] = None
+
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.write(_HEADER.pack(REGION_MAGIC, REGION_VERSION, region_size))
+                file.write(bytes(self.data_offset - _HEADER.size))
+
+        # 偏移表常駐記憶體，寫入時同步寫回檔案
+        with open(path, "rb") as file:
+            header = file.read(self.data_offset)
+        magic, version, size = _HEADER.unpack_from(header)
+        if magic != REGION_MAGIC or version != REGION_VERSION or size != region_size:
+            raise ValueError(f"區域檔格式不符: {path}")
+        self.table: List[Tuple[int, int]] = [
+            _ENTRY.unpack_from(header, self.table_offset + i * _ENTRY.size)
+            for i in range(region_size * region_size)
+        ]
+        self.file_size = os.path.getsize(path)
+        self.live_bytes = sum(length for _, length in self.table)
+
+    def _slot(self, key: ChunkKey) -> int:
+        """區塊在偏移表中的位置"""
+        size = self.region_size
+        return (key[1] % size) * size + (key[0] % size)
+
+    def _close_mmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def read(self, key: ChunkKey) -> Optional[bytes]:
+        """
+        讀取區塊記錄（呼叫端需持有 lock）
+
+        Returns:
+            Optional[bytes]: 記錄內容，沒有記錄時為 None
+        """
+        offset, length = self.table[self._slot(key)]
+        if length == 0:
+            return None
+        if self._mmap is None:
+            with open(self.path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[offset : offset + length]
+
+    def write_batch(self, records: Dict[ChunkKey, Optional[bytes]]) -> None:
+        """
+        一次寫入多筆記錄（呼叫端需持有 lock）
+
+        Args:
+            records (Dict[ChunkKey, Optional[bytes]]): 區塊 -> 記錄，None 表示刪除
+        """
+        # 映射的長度固定，附加資料前先關閉，下次讀取時重新映射
+        self._close_mmap()
+        entries: Dict[int, Tuple[int, int]] = {}
+        position = self.file_size
+        with open(self.path, "r+b") as file:
+            file.seek(position)
+            for key, record in records.items():
+                if record:
+                    file.write(record)
+                    entries[self._slot(key)] = (position, len(record))
+                    position += len(record)
+                else:
+                    entries[self._slot(key)] = (0, 0)
+
+            # 只寫回有變動的偏移表項目
+            for slot, entry in entries.items():
+                file.seek(self.table_offset + slot * _ENTRY.size)
+                file.write(_ENTRY.pack(*entry))
+
+        # 全部寫入成功才更新記憶體中的偏移表，寫到一半失敗時可以整批重寫
+        for slot, entry in entries.items():
+            self.live_bytes += entry[1] - self.table[slot][1]
+            self.table[slot] = entry
+        self.file_size = position
+
+        dead_bytes = self.file_size - self.data_offset - self.live_bytes
+        if (
+            dead_bytes > WORLD_CONFIG["region_compaction_bytes"]
+            and dead_bytes > self.live_bytes
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """重寫區域檔，移除被覆蓋的舊記錄（呼叫端需持有 lock）"""
+        self._close_mmap()
+        with open(self.path, "rb") as file:
+            data = file.read()
+
+        table = []
+        chunks = []
+        position = self.data_offset
+        for offset, length in self.table:
+            if length:
+                chunks.append(data[offset : offset + length])
+                table.append((position, length))
+                position += length
+            else:
+                table.append((0, 0))
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(REGION_MAGIC, REGION_VERSION, self.region_size))
+            file.write(b"".join(_ENTRY.pack(*entry) for entry in table))
+            file.write(b"".join(chunks))
+        os.replace(temp_path, self.path)
+
+        self.table = table
+        self.file_size = position
+        self.live_bytes = position - self.data_offset
+
+    def close(self) -> None:
+        """關閉映射"""
+        with self.lock:
+            self._close_mmap()
+
+
+class RegionExport:
+    """區塊記錄的匯出視圖 - 內容固定在建立當下，可以在其他執行緒讀取"""
+
+    def __init__(self, store: "RegionStore", keys: List[ChunkKey]) -> None:
+        """
+        建立匯出視圖（由 RegionStore.begin_export 呼叫）
+
+        Args:
+            store (RegionStore): 來源儲存
+            keys (List[ChunkKey]): 要匯出的區塊
+        """
+        self._store = store
+        self._lock = threading.Lock()
+        self._remaining: Set[ChunkKey] = set(keys)  # 還沒讀取的區塊
+        self._records: Dict[ChunkKey, Optional[bytes]] = {}  # 已讀取或保留的記錄
+
+    def preserve(self, key: ChunkKey) -> None:
+        """區塊即將被改寫時，先保留建立視圖當下的記錄"""
+        with self._lock:
+            if key in self._remaining:
+                self._remaining.discard(key)
+                self._records[key] = self._store.get(key)
+
+    def preserve_all(self) -> None:
+        """讀取所有剩餘的記錄（來源儲存關閉前呼叫）"""
+        for key in list(self._remaining):
+            self.preserve(key)
+
+    def read(self) -> List[Tuple[int, int, bytes]]:
+        """
+        讀取所有匯出的記錄（可在背景執行緒呼叫，每次只鎖定一個區塊）
+
+        Returns:
+            List[Tuple[int, int, bytes]]: (區塊X, 區塊Y, 記錄) 列表
+        """
+        self.preserve_all()
+        self._store._end_export(self)
+        return [
+            (key[0], key[1], record) for key, record in self._records.items() if record
+        ]
+
+
+class RegionStore:
+    """區域檔區塊儲存 - mmap 讀取，背景批次寫入"""
+
+    def __init__(
+        self, directory: Optional[str] = None, region_size: Optional[int] = None
+    ) -> None:
+        """
+        初始化區域檔儲存
+
+        Args:
+            directory (str): 區域檔資料夾，預設在 WORLD_CONFIG["region_dir"]
+                下建立這個世界專用的暫存資料夾，關閉時刪除
+            region_size (int): 區域邊長（區塊數）
+        """
+        self.region_size = region_size or WORLD_CONFIG["region_size"]
+        self._owns_directory = directory is None
+        if directory is None:
+            root = WORLD_CONFIG["region_dir"]
+            os.makedirs(root, exist_ok=True)
+            sweep_stale_worlds(root)
+            directory = tempfile.mkdtemp(prefix=_WORLD_PREFIX, dir=root)
+            with open(os.path.join(directory, _OWNER_FILE), "w") as file:
+                file.write(str(os.getpid()))
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+        self._regions: Dict[Tuple[int, int], _RegionFile] = {}
+        self._regions_lock = threading.Lock()
+        self._keys: Set[ChunkKey] = set()  # 磁碟上或待寫中有記錄的區塊
+        # 還沒讀完的匯出視圖；被丟棄的視圖自動移除
+        self._exports: "weakref.WeakSet[RegionExport]" = weakref.WeakSet()
+        self.version = 0  # 每次寫入或刪除記錄就遞增
+        self._snapshot: Optional[Tuple[int, Dict[ChunkKey, bytes]]] = None
+
+        # 待寫表 - 背景執行緒定期整批取走；寫入中的記錄在寫完前仍可讀取
+        self._condition = threading.Condition()
+        self._pending: Dict[ChunkKey, Optional[bytes]] = {}
+        self._in_flight: Dict[ChunkKey, Optional[bytes]] = {}
+        self._flush_requested = False
+        self._closed = False
+        self.write_error: Optional[OSError] = None  # 最近一次寫入失敗的原因，成功後清除
+        self._load_existing()
+        self._writer = threading.Thread(
+            target=self._writer_worker, name="region-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _load_existing(self) -> None:
+        """登記資料夾中既有區域檔內的區塊"""
+        size = self.region_size
+        for name in os.listdir(self.directory):
+            parts = name.split(".")
+            if len(parts) != 4 or parts[0] != "r" or parts[3] != "srr":
+                continue
+            region_x, region_y = int(parts[1]), int(parts[2])
+            region = self._region_for((region_x * size, region_y * size))
+            for slot, (_, length) in enumerate(region.table):
+                if length:
+                    self._keys.add(
+                        (region_x * size + slot % size, region_y * size + slot // size)
+                    )
+
+    def _region_for(self, key: ChunkKey) -> _RegionFile:
+        """取得區塊所在的區域檔（第一次使用時開啟）"""
+        region_key = (key[0] // self.region_size, key[1] // self.region_size)
+        with self._regions_lock:
+            region = self._regions.get(region_key)
+            if region is None:
+                path = os.path.join(
+                    self.directory, f"r.{region_key[0]}.{region_key[1]}.srr"
+                )
+                region = _RegionFile(path, self.region_size)
+                self._regions[region_key] = region
+            return region
+
+    def __contains__(self, key: ChunkKey) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def put(self, key: ChunkKey, record: bytes) -> None:
+        """
+        寫入區塊記錄（只放進待寫表，實際寫入在背景進行）
+
+        Args:
+            key (ChunkKey): 區塊座標
+            record (bytes): encode_changes 編碼的記錄
+        """
+        self._preserve_for_exports(key)
+        with self._condition:
+            self._pending[key] = record
+            self._keys.add(key)
+            self.version += 1
+            if len(self._pending) >= WORLD_CONFIG["region_batch_size"]:
+                self._condition.notify_all()
+
+    def discard(self, key: ChunkKey) -> None:
+        """
+        刪除區塊記錄
+
+        Args:
+            key (ChunkKey): 區塊座標
+        """
+        self._preserve_for_exports(key)
+        with self._condition:
+            if key in self._keys:
+                self._keys.discard(key)
+                self._pending[key] = None
+                self.version += 1
+
+    def get(self, key: ChunkKey) -> Optional[bytes]:
+        """
+        讀取區塊記錄（待寫中的記錄優先）
+
+        Args:
+            key (ChunkKey): 區塊座標
+
+        Returns:
+            Optional[bytes]: 記錄內容，沒有記錄時為 None
+        """
+        with self._condition:
+            if key not in self._keys:
+                return None
+            if key in self._pending:
+                return self._pending[key]
+            if key in self._in_flight:
+                return self._in_flight[key]
+
+        region = self._region_for(key)
+        with region.lock:
+            return region.read(key)
+
+    def begin_export(self, exclude=()) -> RegionExport:
+        """
+        建立目前所有區塊記錄的匯出視圖（只複製區塊座標，不讀取記錄）
+
+        Args:
+            exclude: 不需要匯出的區塊（例如已載入記憶體的區塊）
+
+        Returns:
+            RegionExport: 匯出視圖，呼叫 read() 取得記錄
+        """
+        with self._condition:
+            export = RegionExport(
+                self, [key for key in self._keys if key not in exclude]
+            )
+            self._exports.add(export)
+        return export
+
+    def _end_export(self, export: RegionExport) -> None:
+        """匯出視圖讀完後不再需要保留記錄"""
+        with self._condition:
+            self._exports.discard(export)
+
+    def _preserve_for_exports(self, key: ChunkKey) -> None:
+        """區塊被改寫前，讓還沒讀完的匯出視圖保留舊記錄"""
+        with self._condition:
+            exports = list(self._exports)
+        for export in exports:
+            export.preserve(key)
+
+    def export_records(self, exclude=()) -> List[Tuple[int, int, bytes]]:
+        """
+        匯出所有區塊記錄（存檔用，只複製位元組不解碼）
+
+        Args:
+            exclude: 不需要匯出的區塊（例如已載入記憶體的區塊）
+
+        Returns:
+            List[Tuple[int, int, bytes]]: (區塊X, 區塊Y, 記錄) 列表
+        """
+        return self.begin_export(exclude).read()
+
+    def snapshot(self) -> Dict[ChunkKey, bytes]:
+        """
+        取得所有區塊記錄的快照（記錄沒有變化時重用上一次的快照）
+
+        Returns:
+            Dict[ChunkKey, bytes]: 區塊 -> 記錄，呼叫端不可修改
+        """
+        with self._condition:
+            if self._snapshot is not None and self._snapshot[0] == self.version:
+                return self._snapshot[1]
+            version = self.version
+            keys = list(self._keys)
+
+        # 只有主執行緒會寫入或刪除記錄，讀取期間內容不會改變
+        records = {}
+        for key in keys:
+            record = self.get(key)
+            if record:
+                records[key] = record
+        self._snapshot = (version, records)
+        return records
+
+    def restore(self, records: Dict[ChunkKey, bytes]) -> None:
+        """
+        還原 snapshot 取得的區塊記錄，只改寫內容不同的區塊
+
+        Args:
+            records (Dict[ChunkKey, bytes]): 區塊記錄快照
+        """
+        if (
+            self._snapshot is not None
+            and self._snapshot[1] is records
+            and self._snapshot[0] == self.version
+        ):
+            return
+
+        for key in list(self._keys):
+            if key not in records:
+                self.discard(key)
+        for key, record in records.items():
+            if self.get(key) != record:
+                self.put(key, record)
+        self._snapshot = (self.version, records)
+
+    def _writer_worker(self) -> None:
+        """背景執行緒 - 定期把待寫表依區域檔分組批次寫入"""
+        interval = WORLD_CONFIG["region_flush_interval"]
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._closed:
+                    # 等待一小段時間，讓同一批卸載的區塊一起寫入
+                    self._condition.wait_for(
+                        lambda: self._closed
+                        or self._flush_requested
+                        or len(self._pending) >= WORLD_CONFIG["region_batch_size"],
+                        timeout=interval,
+                    )
+                if not self._pending:
+                    break  # 已關閉且沒有待寫資料
+                batch = self._pending
+                self._pending = {}
+                self._in_flight = batch
+
+            groups: Dict[_RegionFile, Dict[ChunkKey, Optional[bytes]]] = {}
+            failed: Dict[ChunkKey, Optional[bytes]] = {}
+            error: Optional[OSError] = None
+            for key, record in batch.items():
+                try:
+                    region = self._region_for(key)
+                except OSError as e:
+                    print(f"⚠️ 區域檔開啟失敗: {e}")
+                    failed[key] = record
+                    error = e
+                    continue
+                groups.setdefault(region, {})[key] = record
+            for region, records in groups.items():
+                try:
+                    with region.lock:
+                        region.write_batch(records)
+                except OSError as e:
+                    print(f"⚠️ 區域檔寫入失敗 {region.path}: {e}")
+                    failed.update(records)
+                    error = e
+
+            with self._condition:
+                # 寫入失敗的記錄放回待寫表（期間已有更新的記錄時以新的為準），
+                # 在寫入成功前一直留在記憶體中，讀取不會拿到舊記錄
+                for key, record in failed.items():
+                    self._pending.setdefault(key, record)
+                self._in_flight = {}
+                self.write_error = error
+                self._condition.notify_all()
+                if error is not None:
+                    if self._closed:
+                        break  # 關閉時不再重試，記錄仍保留在待寫表
+                    # 稍等一下再重試，避免磁碟持續出錯時空轉
+                    self._condition.wait_for(lambda: self._closed, timeout=interval)
+
+    def flush(self) -> bool:
+        """
+        等待所有待寫記錄寫入磁碟
+
+        Returns:
+            bool: 是否全部寫入；寫入失敗時記錄留在記憶體中，原因記錄在 write_error
+        """
+        with self._condition:
+            self._flush_requested = True
+            self.write_error = None
+            self._condition.notify_all()
+            while (self._pending or self._in_flight) and self.write_error is None:
+                self._condition.wait()
+            self._flush_requested = False
+            return self.write_error is None
+
+    def close(self) -> None:
+        """寫完待寫記錄並關閉所有區域檔；自動建立的資料夾會被刪除"""
+        with self._condition:
+            if self._closed:
+                return
+            exports = list(self._exports)
+        # 背景存檔還沒讀完的記錄先讀進記憶體，之後就不需要區域檔
+        for export in exports:
+            export.preserve_all()
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+        if self._pending:
+            print(
+                f"⚠️ 關閉區域檔時仍有 {len(self._pending)} 筆記錄無法寫入: {self.write_error}"
+            )
+
+        with self._regions_lock:
+            for region in self._regions.values():
+                region.close()
+            self._regions.clear()
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,181 @@
+"""
+Survival Realm - 空間雜湊索引
+以固定大小的格子分桶管理世界物件，讓範圍查詢只需檢查附近的格子
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+
+空間雜湊的核心概念：
+1. 世界被切成 cell_size × cell_size 的格子
+2. 每個物件依照左上角座標放入對應格子
+3. 範圍查詢只掃描與查詢範圍重疊的格子
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+from .game_object import GameObject
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """均勻格子空間雜湊 - 世界物件的範圍查詢索引"""
+
+    def __init__(self, cell_size: int = 128) -> None:
+        """
+        初始化空間雜湊
+
+        Args:
+            cell_size (int): 格子邊長（像素）
+        """
+        self.cell_size = cell_size
+        # 每個格子用 dict 當作有序集合，保持插入順序
+        self._cells: Dict[Cell, Dict[GameObject, None]] = {}
+        self._object_cells: Dict[GameObject, Cell] = {}
+        # 出現過的最大物件尺寸，用於以中心點查詢時擴大搜尋範圍
+        self.max_object_size = 0
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        """計算座標所在的格子"""
+        return (
+            int(math.floor(x / self.cell_size)),
+            int(math.floor(y / self.cell_size)),
+        )
+
+    def insert(self, obj: GameObject) -> None:
+        """
+        將物件加入索引
+
+        Args:
+            obj (GameObject): 要加入的物件
+        """
+        if obj in self._object_cells:
+            self.update(obj)
+            return
+
+        cell = self._cell_of(obj.x, obj.y)
+        self._cells.setdefault(cell, {})[obj] = None
+        self._object_cells[obj] = cell
+        self.max_object_size = max(self.max_object_size, obj.width, obj.height)
+
+    def remove(self, obj: GameObject) -> bool:
+        """
+        從索引移除物件
+
+        Args:
+            obj (GameObject): 要移除的物件
+
+        Returns:
+            bool: 物件原本是否在索引中
+        """
+        cell = self._object_cells.pop(obj, None)
+        if cell is None:
+            return False
+
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(obj, None)
+            if not bucket:
+                del self._cells[cell]
+        return True
+
+    def update(self, obj: GameObject) -> None:
+        """
+        物件移動後更新所在格子（格子沒變時幾乎沒有成本）
+
+        Args:
+            obj (GameObject): 已移動的物件
+        """
+        old_cell = self._object_cells.get(obj)
+        new_cell = self._cell_of(obj.x, obj.y)
+        if old_cell == new_cell:
+            return
+
+        if old_cell is not None:
+            self.remove(obj)
+        self._cells.setdefault(new_cell, {})[obj] = None
+        self._object_cells[obj] = new_cell
+
+    def query(self, x: float, y: float, radius: float) -> List[GameObject]:
+        """
+        取得左上角可能落在圓形範圍內的候選物件
+
+        只依格子篩選，呼叫端需要自行做精確的距離判斷
+
+        Args:
+            x, y (float): 查詢中心
+            radius (float): 查詢半徑
+
+        Returns:
+            List[GameObject]: 候選物件列表
+        """
+        min_cx, min_cy = self._cell_of(x - radius, y - radius)
+        max_cx, max_cy = self._cell_of(x + radius, y + radius)
+
+        candidates = []
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
+
+    def query_rect(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> List[GameObject]:
+        """
+        取得左上角可能落在矩形範圍內的候選物件
+
+        Args:
+            left, top, right, bottom (float): 查詢矩形的世界座標
+
+        Returns:
+            List[GameObject]: 候選物件列表
+        """
+        min_cx, min_cy = self._cell_of(left, top)
+        max_cx, max_cy = self._cell_of(right, bottom)
+
+        candidates = []
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
+
+    def snapshot(self) -> tuple:
+        """
+        取得索引內容的快照（保留每個格子內的物件順序）
+
+        Returns:
+            tuple: ((格子, 物件...), ...) 與最大物件尺寸
+        """
+        cells = tuple((cell, tuple(bucket)) for cell, bucket in self._cells.items())
+        return cells, self.max_object_size
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的索引內容
+
+        Args:
+            snapshot (tuple): 索引快照
+        """
+        cells, self.max_object_size = snapshot
+        self._cells = {cell: dict.fromkeys(objects) for cell, objects in cells}
+        self._object_cells = {obj: cell for cell, objects in cells for obj in objects}
+
+    def clear(self) -> None:
+        """清空索引"""
+        self._cells.clear()
+        self._object_cells.clear()
+        self.max_object_size = 0
+
+    def __contains__(self, obj: GameObject) -> bool:
+        return obj in self._object_cells
+
+    def __len__(self) -> int:
+        return len(self._object_cells)
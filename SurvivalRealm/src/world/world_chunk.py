@@ -0,0 +1,90 @@
+"""
+Survival Realm - 世界區塊
+把無限的地表世界切成固定大小的區塊，依玩家位置生成、啟用與卸載
+
+作者: 硬漢貓咪開發團隊 🐱
+日期: 2026-10-17
+版本: 3.2.0
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+
+from .game_object import GameObject
+
+ChunkKey = Tuple[int, int]
+
+
+def chunk_key_at(x: float, y: float, chunk_size: int) -> ChunkKey:
+    """
+    計算世界座標所在的區塊座標
+
+    Args:
+        x, y (float): 世界座標
+        chunk_size (int): 區塊邊長（像素）
+
+    Returns:
+        ChunkKey: (chunk_x, chunk_y)
+    """
+    return (int(math.floor(x / chunk_size)), int(math.floor(y / chunk_size)))
+
+
+def chunk_rng(seed: int, chunk_x: int, chunk_y: int) -> random.Random:
+    """
+    建立區塊專用的亂數產生器
+
+    由 (世界種子, chunk_x, chunk_y) 決定，同一個區塊每次都會得到相同的亂數序列
+
+    Args:
+        seed (int): 世界種子
+        chunk_x, chunk_y (int): 區塊座標
+
+    Returns:
+        random.Random: 區塊亂數產生器
+    """
+    return random.Random(f"{seed}:{chunk_x}:{chunk_y}")
+
+
+@dataclass
+class WorldChunk:
+    """世界區塊數據類 - 保存區塊內的物件與載入狀態"""
+
+    chunk_x: int  # 區塊X座標
+    chunk_y: int  # 區塊Y座標
+    size: int  # 區塊邊長（像素）
+    objects: List[GameObject] = field(default_factory=list)  # 已載入的物件
+    is_active: bool = False  # 物件是否已載入到世界中
+
+    # 玩家造成的變化 - 區塊卸載後只保留這些，重新載入時套用到重新生成的物件上
+    removed: Set[int] = field(default_factory=set)  # 已被摧毀的生成物件編號
+    modified: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # 狀態變化
+    # 玩家放置的物件 (類型, x, y)
+    placed: List[Tuple[str, float, float]] = field(default_factory=list)
+
+    @property
+    def key(self) -> ChunkKey:
+        """區塊座標"""
+        return (self.chunk_x, self.chunk_y)
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        """區塊左上角的世界座標"""
+        return (self.chunk_x * self.size, self.chunk_y * self.size)
+
+    def has_changes(self) -> bool:
+        """檢查區塊是否有需要保留的玩家變化"""
+        return bool(self.removed or self.modified or self.placed)
+
+    def distance_to(self, key: ChunkKey) -> int:
+        """
+        計算與另一個區塊的切比雪夫距離（以區塊為單位）
+
+        Args:
+            key (ChunkKey): 另一個區塊座標
+
+        Returns:
+            int: 區塊距離
+        """
+        return max(abs(self.chunk_x - key[0]), abs(self.chunk_y - key[1]))
@@ -10,9 +10,24 @@ Survival Realm - 世界管理系統
 import pygame
 import random
 import math
-from typing import List, TYPE_CHECKING
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 from .game_object import GameObject
+from .object_store import ObjectStore
+from .poisson_disk import PoissonDiskSampler
+from .region_store import RegionStore, decode_changes, encode_changes
+from .spatial_hash import SpatialHash
+from .world_chunk import ChunkKey, WorldChunk, chunk_key_at, chunk_rng
 from .world_objects import (
     Tree,
     Rock,
@@ -24,7 +39,7 @@ from .world_objects import (
     Workbench,
     Furnace,
 )
-from ..core.config import WORLD_CONFIG
+from ..core.config import WORLD_CONFIG, WORLD_OBJECTS
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -34,106 +49,380 @@ if TYPE_CHECKING:
 class WorldManager:
     """世界物件管理系統"""
 
-    def __init__(self) -> None:
-        """初始化世界管理器"""
-        self.objects: List[GameObject] = []
+    # 物件類型名稱對應的類別
+    OBJECT_TYPES = {
+        "tree": Tree,
+        "rock": Rock,
+        "food": Food,
+        "river": River,
+        "chest": Chest,
+        "cave": Cave,
+        "monster": Monster,
+        "workbench": Workbench,
+        "furnace": Furnace,
+    }
+    OBJECT_TYPE_NAMES = {cls: name for name, cls in OBJECT_TYPES.items()}
+
+    # 建構時會用到亂數、需要傳入區塊亂數產生器的物件類型
+    RNG_OBJECT_TYPES = ("food", "chest", "cave")
+
+    def __init__(
+        self, seed: Optional[int] = None, use_region_store: Optional[bool] = None
+    ) -> None:
+        """
+        初始化世界管理器
+
+        Args:
+            seed (Optional[int]): 世界種子，未指定時使用設定檔或隨機產生
+            use_region_store (Optional[bool]): 卸載的區塊變化是否寫到區域檔，
+                預設使用設定檔
+        """
+        self.objects = ObjectStore(WORLD_CONFIG["compaction_threshold"])
+        self._destroyed: List[GameObject] = []  # 本幀被摧毀、等待移除的物件
+        # 依類別分組的物件，怪物與建築查詢只需走訪同類物件
+        self._type_registry: Dict[type, Dict[GameObject, None]] = {}
+        self.spatial_index = SpatialHash(WORLD_CONFIG["spatial_cell_size"])
+        self._render_order: List[GameObject] = []  # 上一幀畫面內物件的繪製順序
         self.spawn_timer = 0
         self.spawn_interval = WORLD_CONFIG["spawn_interval"]
-        self.river_count = 0  # 追蹤河流數量
-        self.permanent_objects_generated = False  # 是否已生成永久物件
 
-        print("世界: 世界管理器初始化完成")
+        # 世界種子 - 同一個種子永遠生成同一個世界
+        if seed is None:
+            seed = WORLD_CONFIG["world_seed"]
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+
+        # 區塊串流系統
+        self.chunk_size = WORLD_CONFIG["chunk_size"]
+        self.active_chunk_radius = WORLD_CONFIG["active_chunk_radius"]
+        self.chunk_eviction_budget = WORLD_CONFIG["chunk_eviction_budget"]
+        self.chunks: Dict[ChunkKey, WorldChunk] = {}  # 已載入或被玩家改變過的區塊
+        self.active_chunks: Dict[ChunkKey, WorldChunk] = {}  # 已載入的區塊
+        self.center_chunk: Optional[ChunkKey] = None  # 玩家所在區塊
+        self._object_chunks: Dict[GameObject, ChunkKey] = {}  # 物件所屬區塊
+        self._generated_ids: Dict[GameObject, int] = {}  # 生成物件在區塊中的編號
+        self._pending_evictions: List[ChunkKey] = []  # 等待卸載的區塊
+        # 讀檔載入、還沒用到的區塊變化，區塊第一次被用到時才建立記錄
+        self._saved_changes: Dict[ChunkKey, tuple] = {}
+
+        # 區域檔 - 卸載的區塊變化寫到磁碟，記憶體只保留已載入的區塊
+        if use_region_store is None:
+            use_region_store = WORLD_CONFIG["region_store"]
+        self.region_store: Optional[RegionStore] = (
+            RegionStore() if use_region_store else None
+        )
+
+        print(f"世界: 世界管理器初始化完成（世界種子: {self.seed}）")
+
+    def generate_world(self, player_x: float = 0, player_y: float = 0) -> None:
+        """
+        生成初始世界物件（載入玩家周圍的區塊）
 
-    def generate_world(self) -> None:
-        """生成初始世界物件"""
+        Args:
+            player_x, player_y (float): 玩家起始位置
+        """
         print("開始: 開始生成世界物件...")
 
-        num_objects = WORLD_CONFIG["initial_objects"]
-        safe_zone_radius = WORLD_CONFIG["safe_zone_radius"]
+        self.update_chunks(player_x, player_y)
 
-        # 在相機系統中，玩家從世界中心開始
-        player_start_x = 0  # 世界中心
-        player_start_y = 0  # 世界中心
+        river_count = len(self.get_objects_by_type(River))
+        print(
+            f"成功: 生成了 {len(self.objects)} 個世界物件"
+            f"（{len(self.active_chunks)} 個區塊，包含 {river_count} 條河流）"
+        )
 
-        objects_created = 0
-        attempts = 0
-        max_attempts = num_objects * 3  # 防止無限循環
+    def update_chunks(self, player_x: float, player_y: float) -> None:
+        """
+        🔥 無限世界區塊串流 - 依玩家位置生成、啟用與卸載區塊
 
-        # 世界生成範圍（相機系統下需要更大的範圍）
-        world_range = 2000  # 在玩家周圍 2000 像素範圍內生成物件
+        Args:
+            player_x, player_y (float): 玩家當前位置
+        """
+        center = chunk_key_at(player_x, player_y, self.chunk_size)
+        keep_radius = self.active_chunk_radius + 1  # 多保留一圈，避免在邊界來回載入
+
+        if center != self.center_chunk:
+            self.center_chunk = center
+
+            # 啟用玩家周圍的所有區塊
+            radius = self.active_chunk_radius
+            for chunk_x in range(center[0] - radius, center[0] + radius + 1):
+                for chunk_y in range(center[1] - radius, center[1] + radius + 1):
+                    chunk = self._get_chunk((chunk_x, chunk_y))
+                    if not chunk.is_active:
+                        self._activate_chunk(chunk)
+
+            # 超出保留範圍的區塊排入卸載佇列
+            self._pending_evictions = [
+                key
+                for key, chunk in self.active_chunks.items()
+                if chunk.distance_to(center) > keep_radius
+            ]
+
+        # 每幀最多卸載固定數量的區塊，攤平卸載成本
+        budget = self.chunk_eviction_budget
+        while self._pending_evictions and budget > 0:
+            chunk = self.active_chunks.get(self._pending_evictions.pop())
+            if chunk and chunk.distance_to(self.center_chunk) > keep_radius:
+                self._evict_chunk(chunk)
+                budget -= 1
+
+    def _get_chunk(self, key: ChunkKey) -> WorldChunk:
+        """取得區塊記錄，不存在時建立新的空記錄"""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = WorldChunk(key[0], key[1], self.chunk_size)
+            saved = self._saved_changes.pop(key, None)
+            if saved is None and self.region_store is not None:
+                record = self.region_store.get(key)
+                saved = record and decode_changes(record)
+            if saved is not None:
+                removed, modified, placed = saved
+                chunk.removed = set(removed)
+                chunk.modified = dict(modified)
+                chunk.placed = [tuple(entry) for entry in placed]
+            self.chunks[key] = chunk
+        return chunk
+
+    def generate_chunk_objects(self, chunk_x: int, chunk_y: int) -> List[GameObject]:
+        """
+        依世界種子生成區塊內的原始物件（不含玩家造成的變化）
 
-        # 首先生成永久物件（河流）
-        if not self.permanent_objects_generated:
-            self._generate_permanent_objects(
-                player_start_x, player_start_y, safe_zone_radius, world_range
-            )
-            self.permanent_objects_generated = True
+        同一個種子和區塊座標永遠得到相同的結果，所以區塊卸載後不需要保存物件
 
-        while objects_created < num_objects and attempts < max_attempts:
-            x = random.randint(-world_range, world_range)
-            y = random.randint(-world_range, world_range)
+        Args:
+            chunk_x, chunk_y (int): 區塊座標
 
-            # 檢查是否在玩家安全區域內
-            distance_to_player = math.sqrt(
-                (x - player_start_x) ** 2 + (y - player_start_y) ** 2
-            )
+        Returns:
+            List[GameObject]: 依生成順序排列的物件列表
+        """
+        rng = chunk_rng(self.seed, chunk_x, chunk_y)
+        origin_x = chunk_x * self.chunk_size
+        origin_y = chunk_y * self.chunk_size
+        safe_zone_radius = WORLD_CONFIG["safe_zone_radius"]
+        generated: List[GameObject] = []
 
-            if distance_to_player < safe_zone_radius:
-                attempts += 1
-                continue
+        # 首先生成永久物件（河流）
+        self._generate_permanent_objects(generated, origin_x, origin_y, rng)
+
+        # 以泊松圓盤取樣保證物件間距；與區塊邊緣保持半個間距，相鄰區塊的物件也不會重疊
+        spacing = WORLD_CONFIG["object_spacing"]
+        margin = spacing / 2
+        sampler = PoissonDiskSampler(
+            origin_x + margin,
+            origin_y + margin,
+            self.chunk_size - spacing,
+            self.chunk_size - spacing,
+            spacing,
+            rng,
+            attempts=15,  # 每個區塊只需要少量物件，不必填到最密
+        )
 
-            # 檢查是否與現有物件重疊
-            if self._check_position_clear(x, y, 40):
-                # 根據機率生成不同物件（排除永久物件）
-                obj_type = self._choose_object_type(exclude_permanent=True)
-                if obj_type:
-                    self._spawn_object(obj_type, x, y)
-                    objects_created += 1
+        def is_valid_position(x: float, y: float) -> bool:
+            # 避開出生點（世界中心）安全區域與已生成的河流
+            if math.sqrt(x**2 + y**2) < safe_zone_radius:
+                return False
+            return self._is_clear_of(generated, x, y, spacing)
 
-            attempts += 1
+        positions = sampler.take(WORLD_CONFIG["objects_per_chunk"], is_valid_position)
+        for x, y in positions:
+            # 根據機率生成不同物件（排除永久物件）
+            obj_type = self._choose_object_type(exclude_permanent=True, rng=rng)
+            generated.append(self._create_object(obj_type, x, y, rng))
 
-        print(
-            f"成功: 生成了 {objects_created} 個世界物件（包含 {self.river_count} 條河流）"
-        )
+        return generated
 
     def _generate_permanent_objects(
         self,
-        player_x: float,
-        player_y: float,
-        safe_zone_radius: float,
-        world_range: int,
+        generated: List[GameObject],
+        origin_x: int,
+        origin_y: int,
+        rng: random.Random,
     ) -> None:
-        """生成永久物件（如河流）"""
-        max_rivers = WORLD_CONFIG["river_spawn_limit"]
-
-        for _ in range(max_rivers):
-            attempts = 0
-            while attempts < 20:  # 限制嘗試次數
-                x = random.randint(-world_range + 150, world_range - 150)
-                y = random.randint(-world_range + 100, world_range - 100)
-
-                # 確保不在玩家安全區域
-                distance_to_player = math.sqrt(
-                    (x - player_x) ** 2 + (y - player_y) ** 2
+        """在區塊中生成永久物件（如河流）"""
+        if rng.random() >= WORLD_CONFIG["river_chunk_chance"]:
+            return
+
+        river_width, river_height = WORLD_OBJECTS["river"]["size"]
+        safe_zone_radius = WORLD_CONFIG["safe_zone_radius"]
+        margin = 60  # 河流需要更大空間
+
+        attempts = 0
+        while attempts < 20:  # 限制嘗試次數
+            x = rng.randint(
+                origin_x + margin, origin_x + self.chunk_size - river_width - margin
+            )
+            y = rng.randint(
+                origin_y + margin, origin_y + self.chunk_size - river_height - margin
+            )
+
+            # 確保不在出生點安全區域
+            if math.sqrt(x**2 + y**2) > safe_zone_radius * 1.5:
+                if self._is_clear_of(generated, x, y, 120):
+                    generated.append(River(x, y))
+                    break
+            attempts += 1
+
+    def _is_clear_of(
+        self, objects: List[GameObject], x: float, y: float, min_distance: float
+    ) -> bool:
+        """檢查位置與指定物件列表是否有足夠空間"""
+        min_distance_sq = min_distance * min_distance
+        for obj in objects:
+            if (obj.x - x) ** 2 + (obj.y - y) ** 2 < min_distance_sq:
+                return False
+        return True
+
+    def _activate_chunk(self, chunk: WorldChunk) -> None:
+        """重新生成區塊並套用玩家造成的變化，載入到世界中"""
+        chunk.is_active = True
+        self.active_chunks[chunk.key] = chunk
+
+        generated = self.generate_chunk_objects(chunk.chunk_x, chunk.chunk_y)
+        for index, obj in enumerate(generated):
+            if index in chunk.removed:
+                continue  # 玩家已經砍掉/採集的物件
+            for attr, value in chunk.modified.get(index, {}).items():
+                setattr(obj, attr, value)
+            self._generated_ids[obj] = index
+            self._add_to_chunk(chunk, obj)
+
+        # 玩家放置的建築物
+        for obj_type, x, y in chunk.placed:
+            self._add_to_chunk(chunk, self._create_object(obj_type, x, y))
+
+        # 變化已套用到物件上，卸載時會重新記錄
+        chunk.modified.clear()
+        chunk.placed.clear()
+
+    def _evict_chunk(self, chunk: WorldChunk) -> None:
+        """卸載區塊，只保留玩家造成的變化"""
+        chunk.removed, chunk.modified, chunk.placed = self._collect_chunk_changes(chunk)
+        for obj in chunk.objects:
+            self.objects.remove(obj)
+            self._unregister_type(obj)
+            obj.on_destroy = None
+            self.spatial_index.remove(obj)
+            self._object_chunks.pop(obj, None)
+            self._generated_ids.pop(obj, None)
+
+        chunk.objects = []
+        chunk.is_active = False
+        del self.active_chunks[chunk.key]
+
+        if self.region_store is not None:
+            # 變化交給區域檔在背景寫入，記憶體不保留卸載的區塊
+            if chunk.has_changes():
+                record = encode_changes(
+                    (sorted(chunk.removed), chunk.modified, chunk.placed)
                 )
-                if distance_to_player > safe_zone_radius * 1.5:
-                    if self._check_position_clear(x, y, 120):  # 河流需要更大空間
-                        self._spawn_object("river", x, y)
-                        self.river_count += 1
-                        break
-                attempts += 1
+                self.region_store.put(chunk.key, record)
+            else:
+                self.region_store.discard(chunk.key)
+            del self.chunks[chunk.key]
+        elif not chunk.has_changes():
+            # 沒有任何變化的區塊可以隨時重新生成，不需要保留
+            del self.chunks[chunk.key]
+
+    def _collect_chunk_changes(
+        self, chunk: WorldChunk
+    ) -> Tuple[Set[int], Dict[int, Dict[str, Any]], List[Tuple[str, float, float]]]:
+        """
+        整理區塊內玩家造成的變化（已載入的區塊會從目前的物件狀態計算）
+
+        Args:
+            chunk (WorldChunk): 區塊
+
+        Returns:
+            Tuple: (已移除的編號, 狀態變化, 玩家放置的物件)，都是新的容器
+        """
+        removed = set(chunk.removed)
+        modified = dict(chunk.modified)
+        placed = list(chunk.placed)
+
+        generated_ids = self._generated_ids
+        for obj in chunk.objects:
+            index = generated_ids.get(obj)
+            if not obj.active:
+                if index is not None:
+                    removed.add(index)
+            elif index is not None:
+                state = self._capture_object_state(obj)
+                if state:
+                    modified[index] = state
+            elif not isinstance(obj, Monster):
+                # 怪物是暫時性的，離開載入範圍就消失；其他物件是玩家放置的
+                obj_type = self.OBJECT_TYPE_NAMES.get(type(obj))
+                if obj_type:
+                    placed.append((obj_type, obj.x, obj.y))
+        return removed, modified, placed
+
+    def _capture_object_state(self, game_object: GameObject) -> Dict[str, Any]:
+        """記錄生成物件被玩家改變的狀態（受損、已開啟、已探索）"""
+        state: Dict[str, Any] = {}
+        max_health = getattr(game_object, "max_health", None)
+        if max_health is not None and game_object.health < max_health:
+            state["health"] = game_object.health
+        if getattr(game_object, "opened", False):
+            state["opened"] = True
+        if getattr(game_object, "discovered", False):
+            state["discovered"] = True
+        return state
+
+    def _add_to_chunk(self, chunk: WorldChunk, game_object: GameObject) -> None:
+        """把物件登記到已載入的區塊並加入世界"""
+        chunk.objects.append(game_object)
+        self._object_chunks[game_object] = chunk.key
+        self.objects.add(game_object)
+        self._type_registry.setdefault(type(game_object), {})[game_object] = None
+        self.spatial_index.insert(game_object)
+        game_object.on_destroy = self._destroyed.append
+
+    def _remove_from_chunk(self, game_object: GameObject) -> None:
+        """把物件從所屬區塊移除，生成物件會被記錄為已移除"""
+        chunk = self.chunks.get(self._object_chunks.pop(game_object, None))
+        index = self._generated_ids.pop(game_object, None)
+        if chunk is None:
+            return
+
+        if game_object in chunk.objects:
+            chunk.objects.remove(game_object)
+        if index is not None:
+            chunk.removed.add(index)
+
+    def _update_object_chunk(self, game_object: GameObject) -> None:
+        """移動中的物件跨越區塊邊界時，改登記到新的區塊"""
+        new_key = chunk_key_at(game_object.x, game_object.y, self.chunk_size)
+        old_key = self._object_chunks.get(game_object)
+        if old_key == new_key:
+            return
+
+        new_chunk = self.active_chunks.get(new_key)
+        if new_chunk is None:
+            return  # 目標區塊未載入，暫時留在原區塊
+
+        old_chunk = self.chunks.get(old_key)
+        if old_chunk and game_object in old_chunk.objects:
+            old_chunk.objects.remove(game_object)
+        new_chunk.objects.append(game_object)
+        self._object_chunks[game_object] = new_key
 
     def _check_position_clear(self, x: float, y: float, min_distance: float) -> bool:
         """檢查位置是否有足夠空間"""
-        for obj in self.objects:
+        min_distance_sq = min_distance * min_distance
+        for obj in self.spatial_index.query(x, y, min_distance):
             if obj.active:
-                distance = math.sqrt((obj.x - x) ** 2 + (obj.y - y) ** 2)
-                if distance < min_distance:
+                if (obj.x - x) ** 2 + (obj.y - y) ** 2 < min_distance_sq:
                     return False
         return True
 
-    def _choose_object_type(self, exclude_permanent: bool = False) -> str:
+    def _choose_object_type(
+        self, exclude_permanent: bool = False, rng: Optional[random.Random] = None
+    ) -> str:
         """根據生成機率選擇物件類型"""
+        rng = rng or random
+
         # 基礎物件列表
         if exclude_permanent:
             # 排除永久物件（如河流）
@@ -142,32 +431,29 @@ class WorldManager:
             base_objects = ["tree", "rock", "food", "river"]
 
         # 偶爾生成特殊物件
-        if random.random() < 0.15:  # 15% 機率生成特殊物件
+        if rng.random() < 0.15:  # 15% 機率生成特殊物件
             special_objects = ["chest", "cave"]
             base_objects.extend(special_objects)
 
-        return random.choice(base_objects)
+        return rng.choice(base_objects)
+
+    def _create_object(
+        self,
+        obj_type: str,
+        x: float,
+        y: float,
+        rng: Optional[random.Random] = None,
+    ) -> GameObject:
+        """根據物件類型建立物件，需要亂數的物件使用指定的亂數產生器"""
+        object_class = self.OBJECT_TYPES[obj_type]
+        if rng is not None and obj_type in self.RNG_OBJECT_TYPES:
+            return object_class(x, y, rng=rng)
+        return object_class(x, y)
 
     def _spawn_object(self, obj_type: str, x: float, y: float) -> None:
         """在指定位置生成物件"""
-        if obj_type == "tree":
-            self.objects.append(Tree(x, y))
-        elif obj_type == "rock":
-            self.objects.append(Rock(x, y))
-        elif obj_type == "food":
-            self.objects.append(Food(x, y))
-        elif obj_type == "river":
-            self.objects.append(River(x, y))
-        elif obj_type == "chest":
-            self.objects.append(Chest(x, y))
-        elif obj_type == "cave":
-            self.objects.append(Cave(x, y))
-        elif obj_type == "monster":
-            self.objects.append(Monster(x, y))
-        elif obj_type == "workbench":
-            self.objects.append(Workbench(x, y))
-        elif obj_type == "furnace":
-            self.objects.append(Furnace(x, y))
+        if obj_type in self.OBJECT_TYPES:
+            self.add_object(self._create_object(obj_type, x, y))
 
     def update(
         self,
@@ -192,6 +478,9 @@ class WorldManager:
         messages = []
         self.spawn_timer += delta_time
 
+        # 🔥 無限世界 - 依玩家位置串流區塊
+        self.update_chunks(player_x, player_y)
+
         # 獲取時間狀態
         is_night_time = False
         is_day_time = True
@@ -199,24 +488,23 @@ class WorldManager:
             is_night_time = time_manager.is_night_time()
             is_day_time = time_manager.is_day_time()
 
-        # 🔥 無限世界生成 - 更頻繁地檢查和生成物件
+        # 夜晚定時生成怪物
         if self.spawn_timer >= self.spawn_interval:
             self.spawn_timer = 0
 
             if is_night_time:
-                # 夜晚優先生成怪物
                 if self._try_spawn_monster(player_x, player_y):
                     messages.append("夜晚: 黑暗中出現了危險的怪物...")
 
-            # 🔥 無論白天夜晚都要檢查並生成其他物件
-            self._spawn_random_object(player_x, player_y)
-
         # 更新怪物行為 - 主動攻擊系統
-        for obj in self.objects:
-            if isinstance(obj, Monster) and obj.active:
+        for obj in self.get_objects_by_type(Monster):
+            if obj.active:
                 attack_result = obj.update_aggressive_behavior(
                     delta_time, player_x, player_y, is_day_time
                 )
+                # 怪物移動後同步空間索引與所屬區塊
+                self.spatial_index.update(obj)
+                self._update_object_chunk(obj)
 
                 # 處理怪物主動攻擊
                 if attack_result and attack_result.get("monster_attack"):
@@ -227,17 +515,19 @@ class WorldManager:
                         # 這裡應該由遊戲主邏輯處理玩家受傷
                         messages.append(f"怪物主動攻擊！小心！")
 
-        # 移除已摧毀的物件
-        self.objects = [obj for obj in self.objects if obj.active]
+        # 移除本幀被摧毀的物件，空位累積到一定比例才壓縮
+        if self._destroyed:
+            for obj in self._destroyed:
+                self._discard_object(obj)
+            self._destroyed.clear()
+        self.objects.compact_if_needed()
 
         return messages
 
     def _try_spawn_monster(self, player_x: float = 0, player_y: float = 0) -> bool:
         """嘗試在夜晚生成怪物"""
         max_monsters = 4  # 最多同時存在4個怪物
-        current_monsters = len(
-            [obj for obj in self.objects if isinstance(obj, Monster) and obj.active]
-        )
+        current_monsters = len(self.get_objects_by_type(Monster))
 
         if current_monsters >= max_monsters:
             return False
@@ -265,83 +555,6 @@ class WorldManager:
 
         return False
 
-    def _spawn_random_object(self, player_x: float = 0, player_y: float = 0) -> None:
-        """🔥 無限世界生成系統 - 隨機生成世界物件"""
-        # 🔥 實現無限世界：動態調整最大物件數
-        active_objects = len([obj for obj in self.objects if obj.active])
-
-        # 🔥 基於玩家周圍的物件密度動態生成
-        nearby_objects = self.get_nearby_objects(player_x, player_y, 600)
-        nearby_count = len(nearby_objects)
-
-        # 如果玩家周圍物件不足，增加生成
-        if nearby_count < 30:  # 玩家周圍保持至少30個物件
-            # 🔥 擴大生成範圍，支持無限探索
-            spawn_range = 1200  # 在玩家1200像素範圍內生成
-            min_distance = 300  # 距離玩家至少300像素
-
-            # 🔥 批量生成多個物件
-            spawn_count = min(5, 30 - nearby_count)  # 一次最多生成5個
-
-            for _ in range(spawn_count):
-                attempts = 0
-                while attempts < 15:  # 增加嘗試次數
-                    # 隨機生成位置
-                    angle = random.uniform(0, 2 * math.pi)
-                    distance = random.uniform(min_distance, spawn_range)
-
-                    x = player_x + distance * math.cos(angle)
-                    y = player_y + distance * math.sin(angle)
-
-                    if self._check_position_clear(x, y, 40):
-                        # 選擇物件類型（排除永久物件）
-                        obj_type = self._choose_object_type(exclude_permanent=True)
-
-                        # 進一步排除河流
-                        if obj_type != "river":
-                            self._spawn_object(obj_type, x, y)
-                            break
-                    attempts += 1
-
-        # 🔥 清理遠離玩家的物件，防止記憶體溢出
-        self._cleanup_distant_objects(player_x, player_y)
-
-    def _cleanup_distant_objects(self, player_x: float, player_y: float) -> None:
-        """
-        🔥 清理距離玩家太遠的物件，實現無限世界
-
-        Args:
-            player_x, player_y (float): 玩家當前位置
-        """
-        cleanup_distance = 2000  # 超過2000像素的物件將被清理
-        objects_to_remove = []
-
-        for obj in self.objects:
-            if not obj.active:
-                continue
-
-            # 計算物件與玩家的距離
-            distance = math.sqrt((obj.x - player_x) ** 2 + (obj.y - player_y) ** 2)
-
-            # 🔥 保護重要物件：工作台、熔爐等玩家建造的建築
-            if isinstance(obj, (Workbench, Furnace)):
-                continue  # 永遠不清理玩家建造的建築
-
-            # 🔥 保護河流等永久資源
-            if isinstance(obj, River):
-                continue  # 河流是珍貴資源，不輕易清理
-
-            # 清理距離太遠的物件
-            if distance > cleanup_distance:
-                objects_to_remove.append(obj)
-
-        # 執行清理
-        for obj in objects_to_remove:
-            obj.active = False
-
-        if objects_to_remove:
-            print(f"🧹 清理了 {len(objects_to_remove)} 個遠離的世界物件")
-
     def get_nearby_objects(self, x: float, y: float, radius: float) -> List[GameObject]:
         """
         獲取指定範圍內的物件
@@ -353,8 +566,10 @@ class WorldManager:
         Returns:
             List[GameObject]: 範圍內的物件列表
         """
+        # 索引以左上角分桶，判斷中心距離時需擴大搜尋範圍
+        search_radius = radius + self.spatial_index.max_object_size
         nearby = []
-        for obj in self.objects:
+        for obj in self.spatial_index.query(x, y, search_radius):
             if obj.active and obj.is_near(x, y, radius):
                 nearby.append(obj)
         return nearby
@@ -369,7 +584,11 @@ class WorldManager:
         Returns:
             List[GameObject]: 指定類型的物件列表
         """
-        return [obj for obj in self.objects if isinstance(obj, obj_type) and obj.active]
+        objects = []
+        for cls, bucket in self._type_registry.items():
+            if issubclass(cls, obj_type):
+                objects.extend(obj for obj in bucket if obj.active)
+        return objects
 
     def clear_area(self, x: float, y: float, radius: float) -> int:
         """
@@ -383,10 +602,9 @@ class WorldManager:
             int: 清除的物件數量
         """
         cleared_count = 0
-        for obj in self.objects:
-            if obj.active and obj.is_near(x, y, radius):
-                obj.destroy()
-                cleared_count += 1
+        for obj in self.get_nearby_objects(x, y, radius):
+            obj.destroy()
+            cleared_count += 1
         return cleared_count
 
     def add_object(self, game_object: GameObject) -> None:
@@ -396,7 +614,16 @@ class WorldManager:
         Args:
             game_object (GameObject): 要添加的物件
         """
-        self.objects.append(game_object)
+        key = chunk_key_at(game_object.x, game_object.y, self.chunk_size)
+        chunk = self.active_chunks.get(key)
+        if chunk is not None:
+            self._add_to_chunk(chunk, game_object)
+            return
+
+        # 區塊未載入時只記錄為玩家放置的物件，載入區塊時再建立
+        obj_type = self.OBJECT_TYPE_NAMES.get(type(game_object))
+        if obj_type and not isinstance(game_object, Monster):
+            self._get_chunk(key).placed.append((obj_type, game_object.x, game_object.y))
 
     def remove_object(self, game_object: GameObject) -> bool:
         """
@@ -408,10 +635,23 @@ class WorldManager:
         Returns:
             bool: 是否成功移除
         """
-        if game_object in self.objects:
-            self.objects.remove(game_object)
-            return True
-        return False
+        return self._discard_object(game_object)
+
+    def _discard_object(self, game_object: GameObject) -> bool:
+        """把物件從容器、空間索引與所屬區塊移除"""
+        if not self.objects.remove(game_object):
+            return False
+        game_object.on_destroy = None
+        self._unregister_type(game_object)
+        self.spatial_index.remove(game_object)
+        self._remove_from_chunk(game_object)
+        return True
+
+    def _unregister_type(self, game_object: GameObject) -> None:
+        """把物件從類別分組移除"""
+        bucket = self._type_registry.get(type(game_object))
+        if bucket is not None:
+            bucket.pop(game_object, None)
 
     def get_object_count(self) -> int:
         """獲取活躍物件總數"""
@@ -421,10 +661,10 @@ class WorldManager:
         """獲取物件統計信息"""
         stats = {}
 
-        for obj in self.objects:
-            if obj.active:
-                obj_type = type(obj).__name__
-                stats[obj_type] = stats.get(obj_type, 0) + 1
+        for cls, bucket in self._type_registry.items():
+            count = sum(1 for obj in bucket if obj.active)
+            if count:
+                stats[cls.__name__] = count
 
         return stats
 
@@ -436,24 +676,250 @@ class WorldManager:
             screen: pygame螢幕物件
             camera: 相機物件，如果提供則使用相機系統
         """
-        # 按照深度排序繪製（遠的先畫，近的後畫）
-        active_objects = [obj for obj in self.objects if obj.active]
-        active_objects.sort(key=lambda obj: obj.y)  # 按Y座標排序
-
-        for obj in active_objects:
-            if camera:
-                # 使用相機系統繪製
-                # 只繪製可見的物件以提升效能
-                if camera.is_visible(
-                    obj.x, obj.y, getattr(obj, "width", 0), getattr(obj, "height", 0)
-                ):
-                    screen_x, screen_y = camera.world_to_screen(obj.x, obj.y)
-                    obj.draw_with_camera(screen, screen_x, screen_y)
-            else:
-                # 傳統繪製方式（向後兼容）
+        if not camera:
+            # 傳統繪製方式（向後兼容）
+            active_objects = [obj for obj in self.objects if obj.active]
+            active_objects.sort(key=lambda obj: obj.y)
+            for obj in active_objects:
                 obj.draw(screen)
+            return
+
+        for obj in self._update_render_order(camera):
+            screen_x, screen_y = camera.world_to_screen(obj.x, obj.y)
+            obj.draw_with_camera(screen, screen_x, screen_y)
+
+    def _update_render_order(self, camera) -> List[GameObject]:
+        """
+        更新畫面內物件的繪製順序（遠的先畫，近的後畫）
+
+        只從空間索引取出畫面附近的物件，並沿用上一幀的順序再排序；
+        物件大多靜止，輸入幾乎已排好，排序成本接近畫面內的物件數量
+
+        Args:
+            camera: 相機物件
+
+        Returns:
+            List[GameObject]: 依Y座標排序的可見物件
+        """
+        left, top, right, bottom = camera.get_visible_area()
+        # 物件以左上角登記，往左上多查一個物件尺寸才不會漏掉跨進畫面的物件
+        margin = self.spatial_index.max_object_size
+        visible = {}
+        for obj in self.spatial_index.query_rect(
+            left - margin, top - margin, right, bottom
+        ):
+            if (
+                obj.active
+                and obj.x + obj.width >= left
+                and obj.x <= right
+                and obj.y + obj.height >= top
+                and obj.y <= bottom
+            ):
+                visible[obj] = None
+
+        # 上一幀的物件維持原本順序，新進入畫面的接在後面
+        render_order = [obj for obj in self._render_order if obj in visible]
+        if len(render_order) < len(visible):
+            known = set(render_order)
+            render_order.extend(obj for obj in visible if obj not in known)
+
+        render_order.sort(key=lambda obj: obj.y)  # 穩定排序，同高度不會閃爍
+        self._render_order = render_order
+        return render_order
+
+    def export_changes(self) -> List[tuple]:
+        """
+        匯出所有區塊中玩家造成的變化（存檔用）
+
+        世界本身可以由種子重新生成，只需保存變化；已載入的區塊會從物件狀態計算，
+        不會卸載任何區塊。回傳的資料只包含內建型別，可以交給其他執行緒編碼
+
+        Returns:
+            List[tuple]: (區塊X, 區塊Y, 已移除編號, 狀態變化, 放置物件) 列表
+        """
+        changes = [
+            (key[0], key[1], *saved) for key, saved in self._saved_changes.items()
+        ]
+        for chunk in self.chunks.values():
+            removed, modified, placed = self._collect_chunk_changes(chunk)
+            if removed or modified or placed:
+                changes.append(
+                    (chunk.chunk_x, chunk.chunk_y, sorted(removed), modified, placed)
+                )
+        return changes
+
+    def begin_region_export(self) -> Callable[[], List[Tuple[int, int, bytes]]]:
+        """
+        建立區域檔記錄的匯出視圖（背景存檔用，記錄留給背景執行緒讀取）
+
+        Returns:
+            Callable: 回傳 export_region_records 格式記錄的函式，內容是呼叫當下的狀態
+        """
+        if self.region_store is None:
+            return list
+        return self.region_store.begin_export(exclude=self.chunks).read
+
+    def export_region_records(self) -> List[Tuple[int, int, bytes]]:
+        """
+        匯出區域檔中的區塊記錄（存檔用，只複製位元組，不在主執行緒解碼）
+
+        Returns:
+            List[Tuple[int, int, bytes]]: (區塊X, 區塊Y, 記錄) 列表
+        """
+        if self.region_store is None:
+            return []
+        # 已載入記憶體的區塊以記憶體中的狀態為準，由 export_changes 匯出
+        return self.region_store.export_records(exclude=self.chunks)
+
+    def import_changes(
+        self, changes: List[tuple], records: Sequence[Tuple[int, int, bytes]] = ()
+    ) -> None:
+        """
+        匯入 export_changes 的區塊變化（需在 generate_world 之前呼叫）
+
+        大型世界有上萬個被改變過的區塊，匯入時只建立索引，
+        區塊第一次被載入時才建立區塊記錄
+
+        Args:
+            changes (List[tuple]): 區塊變化列表
+            records (Sequence): export_region_records 匯出的區塊記錄
+        """
+        self._saved_changes.update(
+            ((chunk_x, chunk_y), (removed, modified, placed))
+            for chunk_x, chunk_y, removed, modified, placed in changes
+        )
+        for chunk_x, chunk_y, record in records:
+            if self.region_store is not None:
+                self.region_store.put((chunk_x, chunk_y), record)
+            else:
+                self._saved_changes[(chunk_x, chunk_y)] = decode_changes(record)
+
+    def snapshot(self) -> tuple:
+        """
+        取得世界狀態的快照
+
+        只記錄物件參考與可變欄位，不複製物件本身與圖像；
+        卸載區塊在區域檔中的記錄以位元組一併保存（記錄沒變時共用上一份）；
+        快照只能還原到建立它的同一個世界管理器
+
+        Returns:
+            tuple: 不透明的世界快照
+        """
+        chunks = tuple(
+            (
+                chunk.chunk_x,
+                chunk.chunk_y,
+                chunk.is_active,
+                tuple(chunk.objects),
+                frozenset(chunk.removed),
+                dict(chunk.modified),
+                tuple(chunk.placed),
+            )
+            for chunk in self.chunks.values()
+        )
+        states = tuple(obj.snapshot_state() for obj in self.objects)
+        registry = tuple(
+            (cls, tuple(bucket)) for cls, bucket in self._type_registry.items()
+        )
+        return (
+            self.spawn_timer,
+            self.center_chunk,
+            tuple(self._pending_evictions),
+            chunks,
+            self.objects.snapshot(),
+            states,
+            registry,
+            self.spatial_index.snapshot(),
+            dict(self._object_chunks),
+            dict(self._generated_ids),
+            tuple(self._destroyed),
+            tuple(self._render_order),
+            dict(self._saved_changes),
+            self.region_store.snapshot() if self.region_store is not None else None,
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        還原 snapshot 取得的世界狀態
+
+        Args:
+            snapshot (tuple): 世界快照
+        """
+        (
+            self.spawn_timer,
+            self.center_chunk,
+            pending_evictions,
+            chunks,
+            store,
+            states,
+            registry,
+            spatial_index,
+            object_chunks,
+            generated_ids,
+            destroyed,
+            render_order,
+            saved_changes,
+            region_records,
+        ) = snapshot
+
+        # 同一個快照可以還原很多次，容器一律複製後再交給遊戲修改
+        self._object_chunks = dict(object_chunks)
+        self._generated_ids = dict(generated_ids)
+        self._pending_evictions = list(pending_evictions)
+        self._saved_changes = dict(saved_changes)
+
+        self.chunks = {}
+        self.active_chunks = {}
+        for chunk_x, chunk_y, is_active, objects, removed, modified, placed in chunks:
+            chunk = WorldChunk(
+                chunk_x,
+                chunk_y,
+                self.chunk_size,
+                list(objects),
+                is_active,
+                set(removed),
+                dict(modified),
+                list(placed),
+            )
+            self.chunks[chunk.key] = chunk
+            if is_active:
+                self.active_chunks[chunk.key] = chunk
+
+        self.objects.restore(store)
+        on_destroy = self._destroyed.append
+        for obj, state in zip(self.objects, states):
+            obj.restore_state(state)
+            obj.on_destroy = on_destroy
+        self._type_registry = {cls: dict.fromkeys(bucket) for cls, bucket in registry}
+        self.spatial_index.restore(spatial_index)
+        self._destroyed[:] = destroyed
+        self._render_order = list(render_order)
+
+        # 卸載區塊的變化在區域檔裡，一併回到快照時的內容
+        if region_records is not None:
+            if self.region_store is None:
+                # 世界已經關閉（例如 reset 之後還原舊快照），重新建立區域檔
+                self.region_store = RegionStore()
+            self.region_store.restore(region_records)
 
     def cleanup(self) -> None:
         """清理資源"""
         self.objects.clear()
+        self._destroyed.clear()
+        self._type_registry.clear()
+        self.spatial_index.clear()
+        self._render_order.clear()
+        self.chunks.clear()
+        self.active_chunks.clear()
+        self._object_chunks.clear()
+        self._pending_evictions.clear()
+        self._saved_changes.clear()
+        self.center_chunk = None
+        self.close()
         print("🧹 世界管理器已清理")
+
+    def close(self) -> None:
+        """關閉區域檔（等待背景寫入完成並刪除這個世界的暫存區域檔）"""
+        if self.region_store is not None:
+            self.region_store.close()
+            self.region_store = None
@@ -9,12 +9,13 @@ Survival Realm - 世界物件實作
 
 import pygame
 import random
-import time
 import math
 from typing import Optional, Dict, List, Tuple, TYPE_CHECKING
 
 from .game_object import GameObject
-from ..core.config import WORLD_OBJECTS, MINING_CHANCES, COLORS, WINDOW_CONFIG
+from ..core.config import WORLD_OBJECTS, COLORS, WINDOW_CONFIG
+from ..systems.game_clock import game_clock
+from ..systems.loot_table import roll_loot
 
 # 避免循環引用
 if TYPE_CHECKING:
@@ -24,6 +25,8 @@ if TYPE_CHECKING:
 class Tree(GameObject):
     """樹木物件 - 可砍伐獲得木材"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("health",)
+
     # 類級別的圖像快取，避免重複載入
     _tree_image = None
     _image_loaded = False
@@ -123,6 +126,8 @@ class Tree(GameObject):
 class Rock(GameObject):
     """石頭物件 - 可挖掘獲得石頭和礦物"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("health",)
+
     # 類級別的圖像快取，避免重複載入
     _rock_image = None
     _image_loaded = False
@@ -210,9 +215,7 @@ class Rock(GameObject):
 
             # 使用稿子有機率獲得礦物
             if efficiency > 1:
-                for ore_type, chance in MINING_CHANCES.items():
-                    if random.random() < chance:
-                        items.append((ore_type, 1))
+                items.extend(roll_loot("mining"))
 
             tool_name = "稿子" if efficiency > 1 else "徒手"
             message = f"用{tool_name}挖掘了石頭！"
@@ -228,10 +231,11 @@ class Rock(GameObject):
 class Food(GameObject):
     """食物物件 - 可收集的食物"""
 
-    def __init__(self, x: float, y: float):
+    def __init__(self, x: float, y: float, rng: Optional[random.Random] = None):
         size = WORLD_OBJECTS["food"]["size"]
         super().__init__(x, y, size[0], size[1])
-        self.food_type = random.choice(["berry", "mushroom", "fruit"])
+        rng = rng or random
+        self.food_type = rng.choice(["berry", "mushroom", "fruit"])
 
     def draw(self, screen: pygame.Surface) -> None:
         """繪製食物"""
@@ -346,39 +350,23 @@ class River(GameObject):
 class Chest(GameObject):
     """寶箱物件 - 包含隨機戰利品"""
 
-    def __init__(self, x: float, y: float):
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("opened",)
+
+    def __init__(self, x: float, y: float, rng: Optional[random.Random] = None):
         size = WORLD_OBJECTS["chest"]["size"]
         super().__init__(x, y, size[0], size[1])
         self.opened = False
-        self.loot = self._generate_loot()
-
-    def _generate_loot(self) -> List[Tuple[str, int]]:
-        """生成寶箱戰利品"""
-        loot = []
-
-        # 食物 (高機率)
-        if random.random() < 0.7:
-            food_types = ["food", "berry", "mushroom"]
-            food_type = random.choice(food_types)
-            loot.append((food_type, random.randint(2, 5)))
+        # 只記錄戰利品種子，打開時才生成內容
+        self.loot_seed = (rng or random).getrandbits(32)
 
-        # 工具 (中等機率)
-        if random.random() < 0.3:
-            tool_type = random.choice(["axe", "pickaxe", "bucket"])
-            loot.append((tool_type, 1))
+    @property
+    def loot(self) -> List[Tuple[str, int]]:
+        """寶箱內容（由戰利品種子決定，每次結果相同）"""
+        return self._generate_loot(random.Random(self.loot_seed))
 
-        # 稀有物品 (低機率)
-        if random.random() < 0.15:
-            rare_items = ["iron_sword", "iron_armor", "treasure"]
-            rare_item = random.choice(rare_items)
-            loot.append((rare_item, 1))
-
-        # 礦物資源 (中等機率)
-        if random.random() < 0.4:
-            mineral_type = random.choice(["iron_ore", "coal"])
-            loot.append((mineral_type, random.randint(1, 3)))
-
-        return loot
+    def _generate_loot(self, rng=random) -> List[Tuple[str, int]]:
+        """生成寶箱戰利品"""
+        return roll_loot("chest", rng)
 
     def draw(self, screen: pygame.Surface) -> None:
         """繪製寶箱"""
@@ -403,8 +391,9 @@ class Chest(GameObject):
             return {"message": "寶箱已經空了"}
 
         self.opened = True
-        if self.loot:
-            return {"message": "打開了寶箱！發現了寶物", "items": self.loot}
+        loot = self.loot
+        if loot:
+            return {"message": "打開了寶箱！發現了寶物", "items": loot}
         else:
             return {"message": "打開了寶箱，但裡面是空的..."}
 
@@ -412,10 +401,13 @@ class Chest(GameObject):
 class Cave(GameObject):
     """洞窟物件 - 可進入探索的洞穴入口"""
 
-    def __init__(self, x: float, y: float):
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("discovered",)
+
+    def __init__(self, x: float, y: float, rng: Optional[random.Random] = None):
         size = WORLD_OBJECTS["cave"]["size"]
         super().__init__(x, y, size[0], size[1])
-        self.depth_levels = random.randint(3, 7)  # 隨機深度
+        rng = rng or random
+        self.depth_levels = rng.randint(3, 7)  # 隨機深度
         self.discovered = False
 
     def draw(self, screen: pygame.Surface) -> None:
@@ -509,6 +501,8 @@ class Workbench(GameObject):
 class Furnace(GameObject):
     """熔爐物件 - 用於燒製物品"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + ("is_lit",)
+
     def __init__(self, x: float, y: float):
         super().__init__(x, y, 50, 60)
         self.smelting_enabled = True
@@ -555,6 +549,17 @@ class Furnace(GameObject):
 class Monster(GameObject):
     """怪物物件 - 主動攻擊的敵對生物"""
 
+    SNAPSHOT_FIELDS = GameObject.SNAPSHOT_FIELDS + (
+        "health",
+        "last_attack",
+        "move_speed",
+        "state",
+        "aggro_timer",
+        "spawn_time",
+        "is_dying",
+        "death_timer",
+    )
+
     def __init__(self, x: float, y: float):
         size = WORLD_OBJECTS["monster"]["size"]
         super().__init__(x, y, size[0], size[1])
@@ -574,7 +579,7 @@ class Monster(GameObject):
         self.aggro_timer = 0  # 脫戰計時器
 
         # 生存相關（保持日夜循環邏輯）
-        self.spawn_time = time.time()
+        self.spawn_time = game_clock.now()
         self.is_dying = False
         self.death_timer = 0.0
 
@@ -665,12 +670,12 @@ class Monster(GameObject):
 
     def _can_attack(self) -> bool:
         """檢查是否可以攻擊"""
-        current_time = time.time()
+        current_time = game_clock.now()
         return current_time - self.last_attack >= self.attack_cooldown
 
     def _perform_attack(self) -> Dict:
         """執行攻擊"""
-        self.last_attack = time.time()
+        self.last_attack = game_clock.now()
         return {"monster_attack": True, "damage": self.damage, "attacker": self}
 
     def update_slow_movement(
@@ -767,14 +772,7 @@ class Monster(GameObject):
             self.destroy()
 
             # 隨機掉落物品（地表怪物掉落）
-            drops = []
-            if random.random() < 0.6:
-                drops.append(("food", random.randint(1, 3)))
-            if random.random() < 0.3:
-                drops.append(("treasure", 1))
-            if random.random() < 0.2:
-                mineral = random.choice(["iron_ore", "coal"])
-                drops.append((mineral, 1))
+            drops = roll_loot("monster")
 
             return {
                 "message": f"擊敗了怪物！造成{damage_to_monster}點傷害",
@@ -0,0 +1,12 @@
+"""
+Survival Realm - 測試共用設定
+讓測試可以直接 import src，並以無視窗模式初始化 pygame
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,113 @@
+"""
+物品欄交易測試 - 交易失敗時內容、版本與索引都要回到交易前
+"""
+
+from src.systems.crafting import recipe_registry
+from src.systems.inventory import Inventory, item_database
+
+
+def _item(item_id: str):
+    return item_database.get_item(item_id)
+
+
+def _assert_index_consistent(inventory: Inventory) -> None:
+    """數量索引、槽位索引與空槽位堆積要和槽位內容一致"""
+    counts = {}
+    item_slots = {}
+    free_slots = []
+    for i, slot in enumerate(inventory.slots):
+        if slot is None:
+            free_slots.append(i)
+        else:
+            counts[slot.item.id] = counts.get(slot.item.id, 0) + slot.quantity
+            item_slots.setdefault(slot.item.id, []).append(i)
+
+    assert inventory._counts == counts
+    assert inventory._item_slots == item_slots
+    assert sorted(inventory._free_slots) == free_slots
+    # 空槽位要維持最小堆積，add_item 才會放進最前面的空格
+    heap = inventory._free_slots
+    assert all(heap[(i - 1) // 2] <= heap[i] for i in range(1, len(heap)))
+
+
+def test_transaction_success():
+    """材料足夠且產物放得下時一次完成"""
+    inventory = Inventory(size=4)
+    inventory.add_item(_item("wood"), 3)
+    inventory.add_item(_item("coal"), 2)
+    version = inventory.version
+
+    assert inventory.transaction([("wood", 1), ("coal", 1)], [(_item("torch"), 4)])
+    assert inventory.get_item_count("wood") == 2
+    assert inventory.get_item_count("coal") == 1
+    assert inventory.get_item_count("torch") == 4
+    assert inventory.version > version
+    _assert_index_consistent(inventory)
+
+
+def test_transaction_missing_materials_changes_nothing():
+    """材料不足時直接失敗，版本不變"""
+    inventory = Inventory(size=4)
+    inventory.add_item(_item("wood"), 1)
+    snapshot, version = inventory.snapshot(), inventory.version
+
+    # 同一種材料出現兩次時合計數量
+    assert not inventory.transaction([("wood", 1), ("wood", 1)], [(_item("torch"), 1)])
+    assert inventory.snapshot() == snapshot
+    assert inventory.version == version
+    _assert_index_consistent(inventory)
+
+
+def test_transaction_rolls_back_when_output_does_not_fit():
+    """物品欄已滿、消耗後也沒有空出槽位時，產物放不下要完整回復"""
+    inventory = Inventory(size=3)
+    inventory.add_item(_item("wood"), 5)
+    inventory.add_item(_item("stone"), 64)
+    inventory.add_item(_item("coal"), 32)
+    snapshot, version = inventory.snapshot(), inventory.version
+
+    assert not inventory.transaction([("wood", 1)], [(_item("iron_sword"), 1)])
+    assert inventory.snapshot() == snapshot
+    assert inventory.version == version
+    assert inventory.get_item_count("wood") == 5
+    assert not inventory.has_item("iron_sword")
+    assert inventory.is_full()
+    _assert_index_consistent(inventory)
+
+
+def test_transaction_rolls_back_partial_output():
+    """產物只放進一部分時，被消耗的材料、已放入的產物與空槽位都要回復"""
+    inventory = Inventory(size=5)
+    inventory.add_item(_item("wood"), 1)  # 槽位 0，會被整堆消耗而空出
+    inventory.add_item(_item("stone"), 10)  # 槽位 1
+    inventory.add_item(_item("coal"), 4)  # 槽位 2
+    inventory.clear_slot(1)  # 槽位 1 空出，空槽位為 1、3、4
+    snapshot, version = inventory.snapshot(), inventory.version
+
+    # 消耗後有 4 個空槽位（0、1、3、4），5 把劍放不下
+    assert not inventory.transaction(
+        [("wood", 1), ("coal", 2)], [(_item("iron_sword"), 5)]
+    )
+    assert inventory.snapshot() == snapshot
+    assert inventory.version == version
+    assert sorted(inventory._free_slots) == [1, 3, 4]
+    _assert_index_consistent(inventory)
+
+    # 回復後仍然從最前面的空格開始放
+    inventory.add_item(_item("iron_sword"), 1)
+    assert inventory.get_item_by_slot(1).item.id == "iron_sword"
+    _assert_index_consistent(inventory)
+
+
+def test_failed_transaction_keeps_craftability_table_valid():
+    """交易失敗後版本回到原值，可製作表的快取仍然正確"""
+    inventory = Inventory(size=2)
+    inventory.add_item(_item("wood"), 4)
+    inventory.add_item(_item("stone"), 64)
+    recipe = recipe_registry.get_recipe("workbench")
+    table = recipe_registry.get_table(inventory)
+    craftable = table.can_craft(recipe)
+
+    assert not inventory.transaction([("wood", 1)], [(_item("iron_sword"), 1)])
+    assert table.can_craft(recipe) == craftable
+    assert table.get_count("wood") == 4
@@ -0,0 +1,150 @@
+"""
+掉落表測試 - 別名表、二項分佈與批次抽取的機率要符合 LOOT_TABLES 的設定
+"""
+
+import math
+import random
+
+import pytest
+
+from src.core.config import LOOT_TABLES
+from src.systems.loot_table import AliasTable, LootGroup, binomial, get_loot_table
+
+
+def _expected_totals(name: str) -> dict:
+    """由設定直接算出每次抽取各物品的期望數量（只適用於沒有深度與倍數的掉落表）"""
+    expected = {}
+    for entry in LOOT_TABLES[name]:
+        items = entry["items"]
+        low, high = entry.get("count", (1, 1))
+        mean_count = (low + high) / 2
+        for item_id in items:
+            share = 1.0 if entry.get("each", False) else 1.0 / len(items)
+            expected[item_id] = (
+                expected.get(item_id, 0.0)
+                + entry.get("chance", 1.0) * share * mean_count
+            )
+    return expected
+
+
+def test_alias_table_matches_weights():
+    """別名表挑選的頻率符合權重"""
+    weights = {"stone": 1, "iron_ore": 2, "coal": 3, "diamond": 14}
+    table = AliasTable(list(weights), list(weights.values()))
+    rng = random.Random(1)
+    picks = 200_000
+    counts = dict.fromkeys(weights, 0)
+    for _ in range(picks):
+        counts[table.pick(rng)] += 1
+
+    total_weight = sum(weights.values())
+    for item_id, weight in weights.items():
+        assert counts[item_id] / picks == pytest.approx(
+            weight / total_weight, abs=0.005
+        )
+
+
+def test_alias_table_rejects_mismatched_weights():
+    """項目與權重數量不同時拒絕建立"""
+    with pytest.raises(ValueError):
+        AliasTable(["stone", "coal"], [1])
+    with pytest.raises(ValueError):
+        AliasTable([], [])
+
+
+def test_group_outcomes_cover_every_combination():
+    """平衡模擬用的 (物品, 數量) 機率加總為 1，且每種物品的份量符合權重"""
+    group = LootGroup(0.5, AliasTable(["food", "berry", "coal"], [1, 1, 2]), (2, 5))
+    outcomes = group.outcomes
+    assert sum(chance for _, _, chance in outcomes) == pytest.approx(1.0)
+    assert {amount for _, amount, _ in outcomes} == {2, 3, 4, 5}
+
+    by_item = {}
+    for item_id, _, chance in outcomes:
+        by_item[item_id] = by_item.get(item_id, 0.0) + chance
+    assert by_item == pytest.approx({"food": 0.25, "berry": 0.25, "coal": 0.5})
+
+
+@pytest.mark.parametrize(
+    "trials, chance",
+    [(0, 0.5), (10, 0.0), (10, 1.0)],
+)
+def test_binomial_edge_cases(trials, chance):
+    """沒有試驗、必定失敗與必定成功"""
+    assert binomial(trials, chance) == round(trials * chance)
+
+
+@pytest.mark.parametrize(
+    "trials, chance",
+    [
+        (40, 0.05),  # 幾何分佈跳躍
+        (5_000, 0.3),  # BTRS 拒絕取樣
+        (2_000, 0.9),  # 以 1 - chance 反算
+    ],
+)
+def test_binomial_mean_and_variance(trials, chance):
+    """二項分佈抽樣的平均與變異數符合 B(n, p)"""
+    rng = random.Random(trials)
+    samples = [binomial(trials, chance, rng) for _ in range(20_000)]
+    assert all(0 <= k <= trials for k in samples)
+
+    mean = sum(samples) / len(samples)
+    variance = sum((k - mean) ** 2 for k in samples) / (len(samples) - 1)
+    expected_variance = trials * chance * (1 - chance)
+    # 平均值容許 5 個標準誤
+    assert abs(mean - trials * chance) < 5 * math.sqrt(expected_variance / len(samples))
+    assert variance == pytest.approx(expected_variance, rel=0.05)
+
+
+@pytest.mark.parametrize("name", ["chest", "monster", "cave_monster", "cave_spider"])
+def test_roll_totals_match_configured_odds(name):
+    """批次加總的平均掉落量符合設定的機率與數量範圍"""
+    rolls = 200_000
+    totals = get_loot_table(name).roll_totals(rolls, random.Random(7))
+    expected = _expected_totals(name)
+    assert set(totals) <= set(expected)
+    for item_id, per_roll in expected.items():
+        assert totals.get(item_id, 0) / rolls == pytest.approx(per_roll, rel=0.03)
+
+
+@pytest.mark.parametrize("name", ["chest", "cave_monster"])
+def test_roll_and_roll_batch_agree_with_config(name):
+    """逐次抽取與批次抽取的平均掉落量都符合設定"""
+    rolls = 60_000
+    table = get_loot_table(name)
+    expected = _expected_totals(name)
+
+    rng = random.Random(11)
+    for results in (
+        [table.roll(rng) for _ in range(rolls)],
+        table.roll_batch(rolls, rng),
+    ):
+        assert len(results) == rolls
+        totals = {}
+        for drops in results:
+            for item_id, amount in drops:
+                totals[item_id] = totals.get(item_id, 0) + amount
+        for item_id, per_roll in expected.items():
+            assert totals.get(item_id, 0) / rolls == pytest.approx(per_roll, rel=0.05)
+
+
+def test_roll_batch_group_hit_rate():
+    """批次抽取中每個掉落組的成功率符合 chance"""
+    rolls = 100_000
+    for group in get_loot_table("cave_monster").groups:
+        hits = sum(1 for _ in group.successes(rolls, random.Random(3)))
+        sigma = math.sqrt(rolls * group.chance * (1 - group.chance))
+        assert abs(hits - rolls * group.chance) < 5 * sigma
+
+
+def test_cave_monster_drops_come_from_loot_table():
+    """洞穴怪物的掉落只包含自己掉落表中的物品"""
+    from src.world.cave_system import CaveMonster
+
+    for monster_type in ("cave_monster", "cave_spider"):
+        monster = CaveMonster(0, 0, monster_type)
+        allowed = {
+            item_id for entry in LOOT_TABLES[monster_type] for item_id in entry["items"]
+        }
+        for _ in range(200):
+            assert {item_id for item_id, _ in monster.roll_drops()} <= allowed
@@ -0,0 +1,243 @@
+"""
+區域檔測試 - 批次寫入與壓縮後每筆有效記錄都要讀得回來
+"""
+
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from src.core.config import WORLD_CONFIG
+from src.world.region_store import (
+    _OWNER_FILE,
+    RegionStore,
+    _RegionFile,
+    decode_changes,
+    encode_changes,
+    sweep_stale_worlds,
+)
+
+REGION_SIZE = 4
+
+
+@pytest.fixture
+def eager_compaction(monkeypatch):
+    """只要空洞多於有效資料就壓縮，讓小測試也會觸發壓縮"""
+    monkeypatch.setitem(WORLD_CONFIG, "region_compaction_bytes", 0)
+
+
+def _record(rng: random.Random, key, generation: int) -> bytes:
+    """產生長度不固定、內容可辨識的記錄"""
+    return encode_changes(
+        (
+            [generation],
+            {key[0]: {"health": rng.randint(1, 99)}},
+            [("tree", float(key[0]), float(key[1]))] * rng.randint(0, 20),
+        )
+    )
+
+
+def _assert_region_matches(region: _RegionFile, expected: dict) -> None:
+    """每個區塊的記錄、偏移表與有效資料大小都要和預期一致"""
+    for x in range(REGION_SIZE):
+        for y in range(REGION_SIZE):
+            assert region.read((x, y)) == expected.get((x, y))
+    assert region.live_bytes == sum(len(record) for record in expected.values())
+    assert region.file_size == os.path.getsize(region.path)
+    assert region.file_size >= region.data_offset + region.live_bytes
+
+
+def test_write_batch_compaction_keeps_live_records(tmp_path, eager_compaction):
+    """反覆覆寫與刪除觸發多次壓縮後，所有有效記錄都還在，重新開啟也一樣"""
+    path = str(tmp_path / "r.0.0.srr")
+    region = _RegionFile(path, REGION_SIZE)
+    rng = random.Random(5)
+    keys = [(x, y) for x in range(REGION_SIZE) for y in range(REGION_SIZE)]
+    expected = {}
+    compactions = 0
+
+    for generation in range(60):
+        batch = {}
+        for key in rng.sample(keys, rng.randint(1, len(keys))):
+            if rng.random() < 0.2:
+                batch[key] = None
+                expected.pop(key, None)
+            else:
+                batch[key] = _record(rng, key, generation)
+                expected[key] = batch[key]
+
+        size_before = region.file_size
+        with region.lock:
+            region.write_batch(batch)
+            _assert_region_matches(region, expected)
+        if region.file_size < size_before:
+            compactions += 1
+            # 壓縮後檔案只剩檔頭、偏移表與有效資料
+            assert region.file_size == region.data_offset + region.live_bytes
+
+    assert compactions > 0
+    region.close()
+    assert not os.path.exists(path + ".tmp")
+
+    reopened = _RegionFile(path, REGION_SIZE)
+    with reopened.lock:
+        _assert_region_matches(reopened, expected)
+    for key, record in expected.items():
+        assert decode_changes(reopened.read(key)) == decode_changes(record)
+    reopened.close()
+
+
+def test_compaction_drops_deleted_records(tmp_path, eager_compaction):
+    """刪除的區塊在壓縮後不會復活"""
+    region = _RegionFile(str(tmp_path / "r.0.0.srr"), REGION_SIZE)
+    with region.lock:
+        region.write_batch({(0, 0): b"a" * 100, (1, 0): b"b" * 100})
+        region.write_batch({(0, 0): None, (1, 0): b"c" * 10})
+        assert region.file_size == region.data_offset + 10
+        _assert_region_matches(region, {(1, 0): b"c" * 10})
+    region.close()
+
+
+def test_region_store_round_trip(tmp_path, eager_compaction):
+    """區域檔儲存跨多個區域檔寫入、壓縮後重新開啟，記錄都讀得回來"""
+    directory = str(tmp_path / "world")
+    rng = random.Random(9)
+    expected = {}
+    store = RegionStore(directory, region_size=REGION_SIZE)
+    for generation in range(5):
+        for x in range(-6, 6):
+            for y in range(-3, 3):
+                record = _record(rng, (x, y), generation)
+                store.put((x, y), record)
+                expected[(x, y)] = record
+        store.discard((generation, 0))
+        expected.pop((generation, 0))
+        store.flush()
+
+    assert {key: store.get(key) for key in expected} == expected
+    assert len(store) == len(expected)
+    store.close()
+    assert os.path.isdir(directory)  # 指定的資料夾不會被刪除
+
+    reopened = RegionStore(directory, region_size=REGION_SIZE)
+    assert len(reopened) == len(expected)
+    assert {key: reopened.get(key) for key in expected} == expected
+    reopened.close()
+
+
+def test_region_store_snapshot_restore(tmp_path):
+    """還原快照後多出來的記錄被刪除，改過的記錄回到快照內容"""
+    store = RegionStore(str(tmp_path / "world"), region_size=REGION_SIZE)
+    store.put((0, 0), b"first")
+    store.put((5, 5), b"second")
+    snapshot = store.snapshot()
+    assert store.snapshot() is snapshot  # 沒有變化時重用
+
+    store.put((0, 0), b"changed")
+    store.put((9, 9), b"extra")
+    store.discard((5, 5))
+    store.flush()
+    store.restore(snapshot)
+
+    assert store.get((0, 0)) == b"first"
+    assert store.get((5, 5)) == b"second"
+    assert (9, 9) not in store and store.get((9, 9)) is None
+    store.close()
+
+
+def test_export_view_is_fixed_at_creation(tmp_path):
+    """匯出視圖建立後被改寫、刪除的區塊仍讀到建立當下的記錄，新區塊不會出現"""
+    store = RegionStore(str(tmp_path / "world"), region_size=REGION_SIZE)
+    for x in range(8):
+        store.put((x, 0), b"v1-%d" % x)
+    store.flush()
+
+    export = store.begin_export(exclude={(7, 0): None})
+    store.put((0, 0), b"v2")
+    store.discard((1, 0))
+    store.put((9, 9), b"new")
+    store.flush()
+    store.discard((2, 0))
+
+    records = sorted(export.read())
+    assert records == [(x, 0, b"v1-%d" % x) for x in range(7)]
+    assert not store._exports
+    assert store.get((0, 0)) == b"v2"
+    store.close()
+
+
+def test_export_view_survives_close(tmp_path, monkeypatch):
+    """儲存關閉（暫存資料夾被刪除）後，還沒讀完的匯出視圖仍然讀得到記錄"""
+    monkeypatch.setitem(WORLD_CONFIG, "region_dir", str(tmp_path))
+    store = RegionStore(region_size=REGION_SIZE)
+    store.put((3, 3), b"record")
+    store.flush()
+    export = store.begin_export()
+    store.close()
+    assert not os.path.exists(store.directory)
+    assert export.read() == [(3, 3, b"record")]
+
+
+def test_failed_write_keeps_records(tmp_path, monkeypatch):
+    """寫入失敗的記錄留在記憶體中重試，讀取不會拿到舊記錄，新記錄不會被舊的覆蓋"""
+    monkeypatch.setitem(WORLD_CONFIG, "region_flush_interval", 0.01)
+    directory = str(tmp_path / "world")
+    store = RegionStore(directory, region_size=REGION_SIZE)
+    store.put((0, 0), b"old")
+    store.put((1, 0), b"kept")
+    assert store.flush()
+
+    write_batch = _RegionFile.write_batch
+    disk_full = [True]
+
+    def failing_write_batch(region, records):
+        if disk_full[0]:
+            raise OSError(28, "No space left on device")
+        return write_batch(region, records)
+
+    monkeypatch.setattr(_RegionFile, "write_batch", failing_write_batch)
+    store.put((0, 0), b"new")
+    store.discard((1, 0))
+    store.put((2, 0), b"placed")
+    assert not store.flush()
+    assert isinstance(store.write_error, OSError)
+    assert store.get((0, 0)) == b"new"
+    assert store.get((1, 0)) is None
+    assert store.get((2, 0)) == b"placed"
+
+    # 重試期間寫入的更新記錄優先於失敗的舊批次
+    store.put((2, 0), b"placed again")
+    disk_full[0] = False
+    assert store.flush()
+    assert store.write_error is None
+    store.close()
+
+    reopened = RegionStore(directory, region_size=REGION_SIZE)
+    assert reopened.get((0, 0)) == b"new"
+    assert (1, 0) not in reopened
+    assert reopened.get((2, 0)) == b"placed again"
+    reopened.close()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="只有 POSIX 以行程編號判斷")
+def test_sweep_stale_worlds(tmp_path):
+    """擁有者行程已結束的世界資料夾被刪除，執行中的保留"""
+    # 已經結束的子行程編號
+    dead_pid = int(
+        subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    )
+
+    for name, pid in (("world-dead", dead_pid), ("world-alive", os.getpid())):
+        os.makedirs(tmp_path / name)
+        (tmp_path / name / _OWNER_FILE).write_text(str(pid))
+    os.makedirs(tmp_path / "not-a-world")
+
+    assert sweep_stale_worlds(str(tmp_path)) == 1
+    assert sorted(os.listdir(tmp_path)) == ["not-a-world", "world-alive"]
@@ -0,0 +1,157 @@
+"""
+存檔系統測試 - 存檔可以完整讀回，損壞或惡意的存檔一律以 SaveError 拒絕
+"""
+
+import os
+import pickle
+import threading
+import zlib
+
+import pytest
+
+from src.systems.save_manager import (
+    SAVE_MAGIC,
+    SAVE_VERSION,
+    SaveError,
+    SaveManager,
+    _HEADER,
+    decode_save,
+    encode_save,
+    load_builtins,
+)
+
+SAMPLE_DATA = {
+    "player": {"x": 12.5, "y": -3.0, "inventory": [("wood", 5), None, ("coal", 2)]},
+    "world": {"seed": 42, "chunks": {(0, 1): {"removed": {3, 7}}}},
+    "cave": {"player_keys": ["room_key_1_1"], "depth_keys": {2: 1}},
+    "blob": b"\x00\x01region",
+}
+
+# 反序列化時被呼叫就代表存檔可以執行程式碼
+_executed = []
+
+
+def _payload(*args):
+    _executed.append(args)
+    return "pwned"
+
+
+class _Exploit:
+    """反序列化時會呼叫 _payload 的物件"""
+
+    def __reduce__(self):
+        return (_payload, ("rm -rf /",))
+
+
+def _wrap(raw: bytes, version: int = SAVE_VERSION) -> bytes:
+    """把任意 pickle 資料包成檔頭正確的存檔"""
+    header = _HEADER.pack(SAVE_MAGIC, version, zlib.crc32(raw), len(raw))
+    return header + zlib.compress(raw)
+
+
+def test_round_trip():
+    """內建型別的資料編碼後可以完整讀回"""
+    assert decode_save(encode_save(SAMPLE_DATA)) == SAMPLE_DATA
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [
+        b"",
+        b"SRSV",  # 比檔頭短
+        b"NOPE" + encode_save(SAMPLE_DATA)[4:],  # 識別碼錯誤
+        _wrap(pickle.dumps(SAMPLE_DATA), version=SAVE_VERSION + 1),  # 未來的版本
+        encode_save(SAMPLE_DATA)[:-8],  # 壓縮資料被截斷
+        _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, 0, 0) + b"not zlib",
+        _wrap(pickle.dumps([1, 2, 3])),  # 不是字典
+        _wrap(b"\x80\x04garbage"),  # 不是 pickle
+    ],
+)
+def test_corrupt_saves_are_rejected(blob):
+    """各種損壞的存檔都回報 SaveError，不會拋出其他例外"""
+    with pytest.raises(SaveError):
+        decode_save(blob)
+
+
+def test_flipped_byte_fails_checksum():
+    """壓縮資料中任何位元組被改動都會被校驗碼或解壓縮擋下"""
+    blob = bytearray(encode_save(SAMPLE_DATA))
+    for offset in range(_HEADER.size, len(blob), 7):
+        corrupted = bytearray(blob)
+        corrupted[offset] ^= 0x40
+        with pytest.raises(SaveError):
+            decode_save(bytes(corrupted))
+
+
+def test_checksum_mismatch_is_rejected():
+    """檔頭的 CRC32 或長度和資料不符時拒絕"""
+    raw = pickle.dumps(SAMPLE_DATA, protocol=4)
+    bad_crc = _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(raw) ^ 1, len(raw))
+    bad_length = _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(raw), len(raw) + 1)
+    for header in (bad_crc, bad_length):
+        with pytest.raises(SaveError):
+            decode_save(header + zlib.compress(raw))
+
+
+def test_malicious_save_does_not_execute_code():
+    """存檔中藏有可執行的 reduce 時拒絕，且函式沒有被呼叫"""
+    _executed.clear()
+    blob = _wrap(pickle.dumps({"player": _Exploit()}, protocol=4))
+    with pytest.raises(SaveError, match="不允許的型別"):
+        decode_save(blob)
+    assert _executed == []
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        _Exploit(),
+        os.system,
+        ValueError("class instance"),
+    ],
+)
+def test_load_builtins_rejects_globals(value):
+    """任何需要載入全域名稱的資料（函式、類別、實例）都會被拒絕"""
+    _executed.clear()
+    with pytest.raises(SaveError):
+        load_builtins(pickle.dumps(value, protocol=4))
+    assert _executed == []
+
+
+def test_save_manager_round_trip(tmp_path):
+    """存檔管理器寫入後讀回相同資料，且不留下暫存檔"""
+    manager = SaveManager(str(tmp_path))
+    path = manager.save(SAMPLE_DATA, "slot1")
+    assert manager.has_save("slot1")
+    assert manager.load("slot1") == SAMPLE_DATA
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+    manager.save_async({**SAMPLE_DATA, "autosave": True}, "slot1")
+    manager.wait()
+    assert manager.load("slot1")["autosave"] is True
+
+
+def test_save_async_collects_in_writer_thread(tmp_path):
+    """背景存檔傳入函式時，在存檔執行緒呼叫以取得資料"""
+    threads = []
+
+    def collect():
+        threads.append(threading.current_thread())
+        return SAMPLE_DATA
+
+    manager = SaveManager(str(tmp_path))
+    manager.save_async(collect, "slot1")
+    manager.wait()
+    assert threads and threads[0] is not threading.main_thread()
+    assert manager.load("slot1") == SAMPLE_DATA
+
+
+def test_save_manager_rejects_corrupt_file(tmp_path):
+    """磁碟上的存檔損壞時讀檔回報 SaveError"""
+    manager = SaveManager(str(tmp_path))
+    path = manager.save(SAMPLE_DATA, "slot1")
+    with open(path, "r+b") as file:
+        file.seek(_HEADER.size + 4)
+        file.write(b"\xff\xff\xff\xff")
+    with pytest.raises(SaveError):
+        manager.load("slot1")